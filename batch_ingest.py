@@ -5,16 +5,22 @@ Processa múltiplos PDFs em um diretório e ingere na base de conhecimento.
 """
 
 import argparse
+import asyncio
+import fnmatch
 import glob
 import json
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from pathlib import Path
-from typing import Any, Optional
+from functools import lru_cache, partial
+from typing import Any, Callable, Optional
 
 # Importar funções do ingest_pdf.py
-from ingest_pdf import ingest_pdf
+import ingest_pdf as ingest_module
+from ingest_pdf import calculate_file_hash, configure_supabase_pool, ingest_pdf
 
 # Para barra de progresso
 try:
@@ -24,19 +30,92 @@ except ImportError:
     HAS_TQDM = False
     print("⚠️  Instale 'tqdm' para barra de progresso: pip install tqdm")
 
+# Serialização JSON nativa (opcional)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _json_bytes(value: Any) -> bytes:
+    """Serializa um valor para JSON compacto em UTF-8 (orjson quando disponível)."""
+    if HAS_ORJSON:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+# Máximo de IDs por chamada de contagem (limite de URL/parâmetros do PostgREST)
+CHUNK_COUNT_BATCH_SIZE = 500
+
+# Tarefas submetidas por worker no modo paralelo (limita a memória em lotes grandes)
+INFLIGHT_PER_WORKER = 4
+
+# Caminhos são bem maiores que UUIDs, então os lotes de external_id são menores
+EXISTING_DOCS_BATCH_SIZE = 100
+
+
+@dataclass(slots=True)
+class SuccessRecord:
+    """Arquivo ingerido com sucesso."""
+
+    file: str
+    document_id: str
+    chunks: int
+    status: str = "success"
+    name: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.name = os.path.basename(self.file)
+
+
+@dataclass(slots=True)
+class SkippedRecord:
+    """Arquivo pulado durante a ingestão."""
+
+    file: str
+    reason: str
+    status: str = "skipped"
+    name: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.name = os.path.basename(self.file)
+
+
+@dataclass(slots=True)
+class FailedRecord:
+    """Arquivo cuja ingestão falhou."""
+
+    file: str
+    error: str
+    status: str = "failed"
+    name: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.name = os.path.basename(self.file)
+
 
 class IngestionReport:
-    """Relatório de ingestão em lote."""
+    """Relatório de ingestão em lote.
 
-    def __init__(self):
+    Com ``keep_details=False`` o relatório só mantém contadores, sem criar
+    um registro por arquivo (útil em lotes grandes sem relatório JSON).
+    """
+
+    def __init__(self, keep_details: bool = True):
+        self.keep_details = keep_details
         self.total_files = 0
-        self.successful = []
-        self.skipped = []
-        self.failed = []
+        self.success_count = 0
+        self.skipped_count = 0
+        self.failed_count = 0
+        self.successful: list[SuccessRecord] = []
+        self.skipped: list[SkippedRecord] = []
+        self.failed: list[FailedRecord] = []
         self.start_time = datetime.now()
         self.end_time = None
+        self.duration_seconds: float | None = None
 
-    def add_success(self, file_path: str, document_id: str, chunks: int):
+    def add_success(self, *, file_path: str, document_id: str, chunks: int):
         """Adiciona arquivo processado com sucesso ao relatório.
 
         Args:
@@ -44,109 +123,271 @@ class IngestionReport:
             document_id: ID do documento criado no banco
             chunks: Número de chunks gerados
         """
-        self.successful.append({
-            "file": file_path,
-            "document_id": document_id,
-            "chunks": chunks,
-            "status": "success"
-        })
+        self.success_count += 1
+        if self.keep_details:
+            self.successful.append(SuccessRecord(file_path, document_id, chunks))
 
-    def add_skipped(self, file_path: str, reason: str):
+    def add_skipped(self, *, file_path: str, reason: str):
         """Adiciona arquivo pulado ao relatório.
 
         Args:
             file_path: Caminho do arquivo pulado
             reason: Motivo pelo qual foi pulado
         """
-        self.skipped.append({
-            "file": file_path,
-            "reason": reason,
-            "status": "skipped"
-        })
+        self.skipped_count += 1
+        if self.keep_details:
+            self.skipped.append(SkippedRecord(file_path, reason))
 
-    def add_failed(self, file_path: str, error: str):
+    def add_failed(self, *, file_path: str, error: str):
         """Adiciona arquivo com falha ao relatório.
 
         Args:
             file_path: Caminho do arquivo que falhou
             error: Mensagem de erro
         """
-        self.failed.append({
-            "file": file_path,
-            "error": str(error),
-            "status": "failed"
-        })
+        self.failed_count += 1
+        if self.keep_details:
+            self.failed.append(FailedRecord(file_path, str(error)))
 
     def finalize(self):
-        """Finaliza o relatório marcando timestamp de término."""
+        """Finaliza o relatório marcando timestamp de término e a duração."""
         self.end_time = datetime.now()
+        self.duration_seconds = (self.end_time - self.start_time).total_seconds()
+
+    def _summary_header(self) -> list[str]:
+        """Linhas de cabeçalho do resumo com os totais."""
+        return [
+            "\n" + "=" * 70,
+            "📊 RELATÓRIO DE INGESTÃO EM LOTE",
+            "=" * 70,
+            f"⏱️  Duração total: {self.duration_seconds:.2f}s",
+            f"📁 Total de arquivos processados: {self.total_files}",
+            f"✅ Sucessos: {self.success_count}",
+            f"⏭️  Pulados: {self.skipped_count}",
+            f"❌ Falhas: {self.failed_count}",
+            "=" * 70,
+            "",
+        ]
+
+    def print_counts_only(self):
+        """Imprime apenas os totais, sem percorrer os registros por arquivo."""
+        sys.stdout.write("\n".join(self._summary_header()))
+        sys.stdout.flush()
 
     def print_summary(self):
-        """Imprime resumo no terminal."""
-        duration = (self.end_time - self.start_time).total_seconds()
-
-        print("\n" + "=" * 70)
-        print("📊 RELATÓRIO DE INGESTÃO EM LOTE")
-        print("=" * 70)
-        print(f"⏱️  Duração total: {duration:.2f}s")
-        print(f"📁 Total de arquivos processados: {self.total_files}")
-        print(f"✅ Sucessos: {len(self.successful)}")
-        print(f"⏭️  Pulados: {len(self.skipped)}")
-        print(f"❌ Falhas: {len(self.failed)}")
-        print("=" * 70)
+        """Imprime resumo no terminal.
+
+        O resumo é montado em memória e emitido com uma única escrita no
+        stdout, em vez de um ``print`` por arquivo.
+        """
+        lines = self._summary_header()[:-1]
+        append = lines.append
 
         if self.successful:
-            print("\n✅ Arquivos processados com sucesso:")
+            append("\n✅ Arquivos processados com sucesso:")
             for item in self.successful:
-                print(f"   • {Path(item['file']).name} → {item['chunks']} chunks (ID: {item['document_id'][:8]}...)")
+                append(f"   • {item.name} → {item.chunks} chunks (ID: {item.document_id[:8]}...)")
 
         if self.skipped:
-            print("\n⏭️  Arquivos pulados:")
+            append("\n⏭️  Arquivos pulados:")
             for item in self.skipped:
-                print(f"   • {Path(item['file']).name} → {item['reason']}")
+                append(f"   • {item.name} → {item.reason}")
 
         if self.failed:
-            print("\n❌ Arquivos com falha:")
+            append("\n❌ Arquivos com falha:")
             for item in self.failed:
-                print(f"   • {Path(item['file']).name}")
-                print(f"     Erro: {item['error'][:100]}...")
+                append(f"   • {item.name}")
+                append(f"     Erro: {item.error[:100]}...")
 
-        print("\n" + "=" * 70)
+        append("\n" + "=" * 70)
+        append("")
+
+        sys.stdout.write("\n".join(lines))
+        sys.stdout.flush()
 
     def save_json(self, output_path: str):
-        """Salva relatório em JSON."""
-        report_data = {
+        """Salva relatório em JSON.
+
+        Os registros de ``details`` são escritos um a um (um por linha), sem
+        montar o documento inteiro em memória antes de gravar.
+        """
+        header = {
             "start_time": self.start_time.isoformat(),
             "end_time": self.end_time.isoformat() if self.end_time else None,
-            "duration_seconds": (self.end_time - self.start_time).total_seconds() if self.end_time else None,
+            "duration_seconds": self.duration_seconds,
             "total_files": self.total_files,
             "summary": {
-                "successful": len(self.successful),
-                "skipped": len(self.skipped),
-                "failed": len(self.failed),
+                "successful": self.success_count,
+                "skipped": self.skipped_count,
+                "failed": self.failed_count,
             },
-            "details": {
-                "successful": self.successful,
-                "skipped": self.skipped,
-                "failed": self.failed,
-            }
+        }
+        details = {
+            "successful": self.successful,
+            "skipped": self.skipped,
+            "failed": self.failed,
         }
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+        with open(output_path, "wb") as f:
+            f.write(b"{\n")
+            for key, value in header.items():
+                f.write(b'  "%s": %s,\n' % (key.encode(), _json_bytes(value)))
+
+            f.write(b'  "details": {')
+            for section_index, (section, items) in enumerate(details.items()):
+                f.write(b",\n" if section_index else b"\n")
+                f.write(b'    "%s": [' % section.encode())
+                for item_index, item in enumerate(items):
+                    f.write(b",\n      " if item_index else b"\n      ")
+                    f.write(_json_bytes(asdict(item)))
+                f.write(b"\n    ]" if items else b"]")
+            f.write(b"\n  }\n}\n")
 
         print(f"💾 Relatório salvo em: {output_path}")
 
 
-def find_pdf_files(directory: str, recursive: bool = True, pattern: str = "*.pdf") -> List[str]:
-    """Encontra todos os arquivos PDF em um diretório."""
-    if recursive:
-        pdf_files = glob.glob(os.path.join(directory, "**", pattern), recursive=True)
+@lru_cache(maxsize=16)
+def _compile_pattern(pattern: str) -> Callable[[str], Any]:
+    """Compila o padrão glob uma única vez (sensível a maiúsculas, como fnmatchcase)."""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+def find_pdf_files(directory: str, recursive: bool = True, pattern: str = "*.pdf") -> list[str]:
+    """Encontra todos os arquivos PDF em um diretório.
+
+    Percorre a árvore com ``os.scandir``, que reaproveita o tipo de cada
+    entrada já retornado pelo sistema de arquivos em vez de chamar ``stat``
+    novamente. Assim como ``glob``, ignora arquivos e diretórios ocultos e
+    segue links simbólicos para diretórios; cada diretório (identificado por
+    dispositivo e inode) é visitado uma única vez, o que evita ciclos.
+
+    Padrões com separador de caminho (ex.: ``"2024/*.pdf"``) são comparados
+    com os últimos componentes do caminho relativo, como em
+    ``glob("**/2024/*.pdf")``.
+    """
+    root = os.path.abspath(directory)
+
+    if "/" in pattern or os.sep in pattern:
+        if not recursive:
+            found = glob.glob(os.path.join(root, pattern))
+            return sorted(f for f in found if os.path.isfile(f))
+
+        tail_pattern = pattern.replace(os.sep, "/")
+        depth = tail_pattern.count("/") + 1
+        match_tail = _compile_pattern(tail_pattern)
+
+        def matches(entry: os.DirEntry[str]) -> bool:
+            parts = os.path.relpath(entry.path, root).split(os.sep)
+            return len(parts) >= depth and bool(match_tail("/".join(parts[-depth:])))
+    elif pattern == "*.pdf":
+        def matches(entry: os.DirEntry[str]) -> bool:
+            return entry.name.endswith(".pdf")
     else:
-        pdf_files = glob.glob(os.path.join(directory, pattern))
+        match_name = _compile_pattern(pattern)
+
+        def matches(entry: os.DirEntry[str]) -> bool:
+            return bool(match_name(entry.name))
+
+    root_st = os.stat(root)
+    visited = {(root_st.st_dev, root_st.st_ino)}
+    pdf_files: list[str] = []
+    pending = [root]
+
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir():
+                    if recursive:
+                        st = entry.stat()
+                        key = (st.st_dev, st.st_ino)
+                        if key not in visited:
+                            visited.add(key)
+                            pending.append(entry.path)
+                elif entry.is_file() and matches(entry):
+                    pdf_files.append(entry.path)
+
+    pdf_files.sort()
+    return pdf_files
+
+
+def fetch_chunk_counts(document_ids: list[str]) -> dict[str, int]:
+    """Conta os chunks de vários documentos com poucas chamadas ao Supabase.
+
+    Usa a função RPC ``count_kb_chunks_per_document`` (migração 005) em lotes
+    de ``CHUNK_COUNT_BATCH_SIZE`` IDs. Se a função não existir no banco,
+    recorre à contagem individual por documento; outros erros da RPC são
+    propagados.
+
+    Args:
+        document_ids: IDs dos documentos a contar
+
+    Returns:
+        Mapeamento document_id → número de chunks
+    """
+    unique_ids = list(dict.fromkeys(document_ids))
+    counts: dict[str, int] = dict.fromkeys(unique_ids, 0)
+    has_rpc = True
+
+    for i in range(0, len(unique_ids), CHUNK_COUNT_BATCH_SIZE):
+        batch = unique_ids[i:i + CHUNK_COUNT_BATCH_SIZE]
+        if has_rpc:
+            try:
+                res = ingest_module.supabase.rpc("count_kb_chunks_per_document", {"p_document_ids": batch}).execute()
+                for row in res.data or []:
+                    counts[row["document_id"]] = row["chunk_count"]
+                continue
+            except Exception as e:
+                if not ingest_module.is_missing_function_error(e):
+                    raise
+                has_rpc = False
+
+        for doc_id in batch:
+            res = ingest_module.supabase.table("kb_chunks").select("id", count="exact").eq("document_id", doc_id).execute()
+            counts[doc_id] = res.count or 0
+
+    return counts
+
+
+def find_unchanged_pdfs(pdf_files: list[str], collection_name: str) -> set[str]:
+    """Identifica PDFs já indexados e sem alterações na coleção.
+
+    Busca em lote os documentos indexados da coleção cujo ``external_id``
+    corresponde aos arquivos encontrados e compara o ``content_hash`` salvo
+    com o hash local, sem abrir o PDF nem consultar o banco por arquivo.
+
+    Args:
+        pdf_files: Caminhos absolutos dos PDFs
+        collection_name: Nome da coleção de destino
+
+    Returns:
+        Conjunto de caminhos que podem ser pulados
+    """
+    coll_res = ingest_module.supabase.table("kb_collections").select("id").eq("name", collection_name).limit(1).execute()
+    if not coll_res.data:
+        return set()
+    collection_id = coll_res.data[0]["id"]
+
+    stored_hashes: dict[str, str] = {}
+    for i in range(0, len(pdf_files), EXISTING_DOCS_BATCH_SIZE):
+        batch = pdf_files[i:i + EXISTING_DOCS_BATCH_SIZE]
+        res = (
+            ingest_module.supabase.table("kb_documents")
+            .select("external_id, content_hash")
+            .eq("collection_id", collection_id)
+            .eq("is_indexed", True)
+            .in_("external_id", batch)
+            .execute()
+        )
+        for row in res.data or []:
+            if row.get("content_hash"):
+                stored_hashes[row["external_id"]] = row["content_hash"]
 
-    pdf_files = [os.path.abspath(f) for f in pdf_files]
-    return sorted(pdf_files)
+    return {
+        pdf_path for pdf_path in pdf_files
+        if pdf_path in stored_hashes and calculate_file_hash(pdf_path) == stored_hashes[pdf_path]
+    }
 
 
 def process_single_pdf(
@@ -158,19 +399,33 @@ def process_single_pdf(
     chunk_max_tokens: int,
     chunk_overlap_tokens: int,
     force_reindex: bool,
-    extract_metadata_from_path: bool
-) -> Dict[str, Any]:
-    """Processa um único PDF e retorna resultado."""
+    extract_metadata_from_path: bool,
+    page_workers: int | None = None
+) -> dict[str, Any]:
+    """Processa um único PDF e retorna resultado.
+
+    ``page_workers`` controla a extração paralela de páginas; o caminho
+    paralelo usa 1, pois já há um PDF por worker.
+    """
     try:
-        doc_metadata = metadata_template.copy() if metadata_template else {}
+        # O template é compartilhado (ingest_pdf não o altera); só há
+        # alocação quando existem campos específicos do arquivo.
+        doc_metadata = metadata_template or {}
+        parent, file_name = os.path.split(pdf_path)
 
         if extract_metadata_from_path:
-            path_parts = Path(pdf_path).parts[:-1]
+            path_parts = parent.rstrip(os.sep).split(os.sep)
             if len(path_parts) > 1:
-                doc_metadata["directory"] = path_parts[-1]
-                doc_metadata["path_parts"] = list(path_parts)
+                # Mesmo formato de Path.parts: a raiz aparece como "/"
+                if not path_parts[0]:
+                    path_parts[0] = os.sep
+                doc_metadata = {
+                    **doc_metadata,
+                    "directory": path_parts[-1],
+                    "path_parts": path_parts,
+                }
 
-        document_title = Path(pdf_path).stem
+        document_title = os.path.splitext(file_name)[0]
 
         document_id = ingest_pdf(
             pdf_path=pdf_path,
@@ -181,17 +436,13 @@ def process_single_pdf(
             document_metadata=doc_metadata,
             chunk_max_tokens=chunk_max_tokens,
             chunk_overlap_tokens=chunk_overlap_tokens,
-            force_reindex=force_reindex
+            force_reindex=force_reindex,
+            page_workers=page_workers
         )
 
-        from ingest_pdf import supabase
-        chunks_res = supabase.table("kb_chunks").select("id", count="exact").eq("document_id", document_id).execute()
-        chunks_count = chunks_res.count or 0
-
         return {
             "status": "success",
             "document_id": document_id,
-            "chunks": chunks_count,
             "file": pdf_path
         }
 
@@ -203,6 +454,107 @@ def process_single_pdf(
         }
 
 
+def _progress_options(total: int) -> dict[str, Any]:
+    """Opções do tqdm que agrupam redesenhos da barra em lotes grandes."""
+    return {
+        "desc": "Processando PDFs",
+        "mininterval": 0.5,
+        "miniters": max(1, total // 1000),
+        "smoothing": 0.1,
+    }
+
+
+def _init_process_worker() -> None:
+    """Recria os clientes de rede do ingest_pdf dentro de um processo worker.
+
+    Conexões HTTP herdadas do processo pai não podem ser compartilhadas com
+    segurança entre processos; cada worker cria as suas uma única vez.
+    """
+    from openai import OpenAI
+
+    ingest_module.openai_client = OpenAI(api_key=ingest_module.OPENAI_API_KEY)
+    ingest_module.supabase = ingest_module.create_supabase_client()
+
+
+def _process_pdf_in_worker(**kwargs: Any) -> dict[str, Any]:
+    """``process_single_pdf`` para workers de processo.
+
+    O ``atexit`` não roda nesses workers; as entradas novas do cache de
+    hashes voltam junto com o resultado e são gravadas pelo processo pai.
+    """
+    result = process_single_pdf(**kwargs)
+    result["hash_cache"] = ingest_module.take_hash_cache_updates()
+    return result
+
+
+async def process_pdfs_concurrently(
+    pdf_files: list[str],
+    max_workers: int,
+    executor_type: str = "thread",
+    **process_kwargs: Any
+) -> list[dict[str, Any]]:
+    """Processa PDFs concorrentemente em um único event loop.
+
+    Como ``ingest_pdf`` usa os clientes síncronos do Supabase e da OpenAI,
+    cada PDF é despachado para um executor com ``max_workers`` workers:
+    threads (padrão, adequado quando a ingestão é dominada por rede) ou
+    processos (extração de texto e tokenização em paralelo real, sem o GIL).
+
+    Os PDFs são submetidos numa janela deslizante de no máximo
+    ``max_workers * INFLIGHT_PER_WORKER`` tarefas: uma nova só entra quando
+    outra termina, de modo que a memória não cresce com o tamanho do lote.
+
+    Args:
+        pdf_files: Caminhos dos PDFs a processar
+        max_workers: Número máximo de PDFs processados ao mesmo tempo
+        executor_type: ``"thread"`` ou ``"process"``
+        **process_kwargs: Argumentos repassados a ``process_single_pdf``
+
+    Returns:
+        Resultados na ordem em que os PDFs terminaram
+    """
+    if executor_type == "process":
+        executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_process_worker)
+        task = _process_pdf_in_worker
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        task = process_single_pdf
+
+    loop = asyncio.get_running_loop()
+    window = max_workers * INFLIGHT_PER_WORKER
+    progress = tqdm(total=len(pdf_files), **_progress_options(len(pdf_files))) if HAS_TQDM else None
+    results: list[dict[str, Any]] = []
+    inflight: set[asyncio.Future] = set()
+
+    def collect(done: set[asyncio.Future]) -> None:
+        for future in done:
+            result = future.result()
+            ingest_module.merge_hash_cache_updates(result.pop("hash_cache", None))
+            results.append(result)
+        if progress is not None:
+            progress.update(len(done))
+
+    with executor:
+        for pdf_path in pdf_files:
+            if len(inflight) >= window:
+                done, inflight = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+                collect(done)
+
+            inflight.add(loop.run_in_executor(
+                executor,
+                partial(task, pdf_path=pdf_path, **process_kwargs)
+            ))
+
+        if inflight:
+            done, _ = await asyncio.wait(inflight)
+            collect(done)
+
+    if progress is not None:
+        progress.close()
+
+    return results
+
+
 def batch_ingest(
     directory: str,
     collection_name: str,
@@ -216,10 +568,16 @@ def batch_ingest(
     pattern: str = "*.pdf",
     extract_metadata_from_path: bool = True,
     max_workers: int = 1,
-    report_output: str | None = None
+    report_output: str | None = None,
+    executor_type: str = "thread",
+    keep_details: bool = True
 ) -> IngestionReport:
-    """Processa múltiplos PDFs em lote."""
-    report = IngestionReport()
+    """Processa múltiplos PDFs em lote.
+
+    Com ``keep_details=False`` (e sem ``report_output``) o relatório guarda
+    apenas contadores.
+    """
+    report = IngestionReport(keep_details=keep_details or report_output is not None)
 
     print(f"🔍 Procurando PDFs em: {directory}")
     print(f"   Padrão: {pattern}")
@@ -235,14 +593,31 @@ def batch_ingest(
 
     print(f"📁 {len(pdf_files)} PDFs encontrados\n")
 
-    if max_workers == 1:
-        iterator = tqdm(pdf_files, desc="Processando PDFs") if HAS_TQDM else pdf_files
+    results: list[dict[str, Any]] = []
+
+    if not force_reindex:
+        try:
+            unchanged = find_unchanged_pdfs(pdf_files, collection_name)
+        except Exception as e:
+            print(f"⚠️  Não foi possível consultar documentos já indexados: {e}")
+            unchanged = set()
+
+        if unchanged:
+            print(f"⏭️  {len(unchanged)} PDFs já indexados e sem alterações serão pulados\n")
+            results.extend(
+                {"status": "skipped", "reason": "Já indexado e sem alterações", "file": pdf_path}
+                for pdf_path in pdf_files if pdf_path in unchanged
+            )
+            pdf_files = [pdf_path for pdf_path in pdf_files if pdf_path not in unchanged]
+
+    if pdf_files and max_workers == 1:
+        iterator = tqdm(pdf_files, **_progress_options(len(pdf_files))) if HAS_TQDM else pdf_files
 
         for pdf_path in iterator:
             if not HAS_TQDM:
-                print(f"\n📄 Processando: {Path(pdf_path).name}")
+                print(f"\n📄 Processando: {os.path.basename(pdf_path)}")
 
-            result = process_single_pdf(
+            results.append(process_single_pdf(
                 pdf_path=pdf_path,
                 collection_name=collection_name,
                 collection_description=collection_description,
@@ -252,45 +627,54 @@ def batch_ingest(
                 chunk_overlap_tokens=chunk_overlap_tokens,
                 force_reindex=force_reindex,
                 extract_metadata_from_path=extract_metadata_from_path
+            ))
+    elif pdf_files:
+        print(f"⚡ Processamento paralelo com {max_workers} workers ({executor_type})")
+
+        if executor_type == "thread":
+            try:
+                configure_supabase_pool(max_workers)
+            except Exception as e:
+                print(f"⚠️  Não foi possível ajustar o pool de conexões do Supabase: {e}")
+
+        results.extend(asyncio.run(process_pdfs_concurrently(
+            pdf_files,
+            max_workers=max_workers,
+            executor_type=executor_type,
+            collection_name=collection_name,
+            collection_description=collection_description,
+            document_type=document_type,
+            metadata_template=metadata_template,
+            chunk_max_tokens=chunk_max_tokens,
+            chunk_overlap_tokens=chunk_overlap_tokens,
+            force_reindex=force_reindex,
+            extract_metadata_from_path=extract_metadata_from_path,
+            page_workers=1
+        )))
+
+    # Uma única gravação do cache de hashes para todo o lote
+    ingest_module.flush_hash_cache()
+
+    # Uma única rodada de contagens para todos os documentos ingeridos
+    success_ids = [r["document_id"] for r in results if r["status"] == "success"]
+    chunk_counts: dict[str, int] = {}
+    if success_ids:
+        try:
+            chunk_counts = fetch_chunk_counts(success_ids)
+        except Exception as e:
+            print(f"⚠️  Não foi possível contar os chunks: {e}")
+
+    for result in results:
+        if result["status"] == "success":
+            report.add_success(
+                file_path=result["file"],
+                document_id=result["document_id"],
+                chunks=chunk_counts.get(result["document_id"], 0)
             )
-
-            if result["status"] == "success":
-                report.add_success(result["file"], result["document_id"], result["chunks"])
-            elif result["status"] == "skipped":
-                report.add_skipped(result["file"], result.get("reason", "Unknown"))
-            else:
-                report.add_failed(result["file"], result.get("error", "Unknown error"))
-    else:
-        print(f"⚡ Processamento paralelo com {max_workers} workers")
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(
-                    process_single_pdf,
-                    pdf_path=pdf_path,
-                    collection_name=collection_name,
-                    collection_description=collection_description,
-                    document_type=document_type,
-                    metadata_template=metadata_template,
-                    chunk_max_tokens=chunk_max_tokens,
-                    chunk_overlap_tokens=chunk_overlap_tokens,
-                    force_reindex=force_reindex,
-                    extract_metadata_from_path=extract_metadata_from_path
-                ): pdf_path
-                for pdf_path in pdf_files
-            }
-
-            iterator = tqdm(as_completed(futures), total=len(futures), desc="Processando PDFs") if HAS_TQDM else as_completed(futures)
-
-            for future in iterator:
-                result = future.result()
-
-                if result["status"] == "success":
-                    report.add_success(result["file"], result["document_id"], result["chunks"])
-                elif result["status"] == "skipped":
-                    report.add_skipped(result["file"], result.get("reason", "Unknown"))
-                else:
-                    report.add_failed(result["file"], result.get("error", "Unknown error"))
+        elif result["status"] == "skipped":
+            report.add_skipped(file_path=result["file"], reason=result.get("reason", "Unknown"))
+        else:
+            report.add_failed(file_path=result["file"], error=result.get("error", "Unknown error"))
 
     report.finalize()
 
@@ -316,6 +700,9 @@ Exemplos de uso:
   # Processamento paralelo (3 workers)
   python batch_ingest.py --dir ./materiais --collection "INSS 2024" --workers 3
 
+  # Paralelismo com processos (extração de PDFs pesados em CPU)
+  python batch_ingest.py --dir ./materiais --collection "INSS 2024" --workers 4 --executor process
+
   # Salvar relatório JSON
   python batch_ingest.py --dir ./materiais --collection "INSS 2024" --report report.json
         """
@@ -334,9 +721,24 @@ Exemplos de uso:
     parser.add_argument("--chunk-overlap-tokens", type=int, default=50)
     parser.add_argument("--force", action="store_true")
     parser.add_argument("--no-recursive", action="store_true")
-    parser.add_argument("--pattern", default="*.pdf")
+    parser.add_argument(
+        "--pattern",
+        default="*.pdf",
+        help="Padrão glob dos arquivos (padrão: *.pdf); com '/', compara o final do caminho (ex.: '2024/*.pdf')"
+    )
     parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--executor",
+        choices=["thread", "process"],
+        default="thread",
+        help="Tipo de worker no modo paralelo (process para PDFs pesados em CPU)"
+    )
     parser.add_argument("--report", default=None)
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Mostrar apenas os totais no resumo final (útil em CI)"
+    )
 
     args = parser.parse_args()
 
@@ -366,12 +768,17 @@ Exemplos de uso:
             pattern=args.pattern,
             extract_metadata_from_path=True,
             max_workers=args.workers,
-            report_output=args.report
+            report_output=args.report,
+            executor_type=args.executor,
+            keep_details=not args.quiet
         )
 
-        report.print_summary()
+        if args.quiet:
+            report.print_counts_only()
+        else:
+            report.print_summary()
 
-        if report.failed:
+        if report.failed_count:
             return 1
         return 0
 
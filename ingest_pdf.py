@@ -5,19 +5,52 @@ Ingere PDFs na base de conhecimento com controle de duplicatas.
 """
 
 import argparse
+import atexit
 import hashlib
+import io
 import json
+import mmap
+import multiprocessing
 import os
+import random
+import sqlite3
+import threading
 import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
+import httpx
 from dotenv import load_dotenv
 from pypdf import PdfReader
 import tiktoken
 from tiktoken.core import Encoding
-from openai import OpenAI
-from supabase import create_client, Client
+from openai import OpenAI, RateLimitError
+from postgrest import CountMethod, ReturnMethod
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_TIMEOUT
+from postgrest.exceptions import APIError
+from supabase import Client, ClientOptions, create_client
+
+try:
+    import pymupdf
+    HAS_PYMUPDF = True
+except ImportError:
+    HAS_PYMUPDF = False
+
+try:
+    import pypdfium2
+    HAS_PYPDFIUM2 = True
+except ImportError:
+    HAS_PYPDFIUM2 = False
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
 
 # ============================================================
 # Configuração básica
@@ -30,6 +63,75 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_API_KEY")
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
 
+# Dimensões reduzidas (Matryoshka, só modelos text-embedding-3); precisa
+# bater com a coluna vector(N) de kb_chunks. Vazio = padrão do modelo
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS") or 0) or None
+
+# Identifica os vetores gerados (modelo + dimensões) no cache local e em
+# kb_documents.metadata.embedding_model
+EMBEDDING_MODEL_ID = (
+    f"{EMBEDDING_MODEL}@{EMBEDDING_DIMENSIONS}" if EMBEDDING_DIMENSIONS else EMBEDDING_MODEL
+)
+
+# Largura (em tokens) de cada faixa de tamanho usada para agrupar chunks
+# antes de pedir embeddings
+EMBEDDING_BUCKET_TOKENS = 64
+
+# Teto de tokens somados por chamada de embeddings (a API recusa requests
+# acima de 300k tokens)
+EMBEDDING_MAX_BATCH_TOKENS = int(os.getenv("EMBEDDING_MAX_BATCH_TOKENS", "250000"))
+
+# Máximo de requests de embeddings simultâneos por documento
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "8"))
+
+# Modo --bulk: Batch API da OpenAI (metade do custo, sem limite por request,
+# mas assíncrona). Abaixo de BULK_EMBED_MIN_CHUNKS chunks usa o modo direto
+BULK_EMBED_MIN_CHUNKS = 500
+BULK_EMBED_POLL_SECONDS = float(os.getenv("BULK_EMBED_POLL_SECONDS", "30"))
+
+# Processos usados para extrair texto das páginas de um PDF; PDFs com menos
+# de PARALLEL_EXTRACT_MIN_PAGES páginas são lidos sem pool
+PDF_PAGE_WORKERS = int(os.getenv("PDF_PAGE_WORKERS", str(os.cpu_count() or 1)))
+PARALLEL_EXTRACT_MIN_PAGES = 4
+
+# PyMuPDF (AGPL) só é usado quando pedido explicitamente com USE_PYMUPDF=1
+USE_PYMUPDF = os.getenv("USE_PYMUPDF", "").lower() in ("1", "true", "yes")
+
+# Embeddings ficam em memória como float32 (array "f"): ~6 KB por vetor de
+# 1536 dimensões, contra ~45 KB de uma lista de floats Python
+Embedding = array
+
+# Cache local (SQLite) de embeddings por conteúdo; desativado se vazio
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "")
+
+# Guarda o cache em int8 com escala por vetor (~4x menor que float32); os
+# vetores reaproveitados a partir dele ficam levemente quantizados
+EMBEDDING_CACHE_INT8 = os.getenv("EMBEDDING_CACHE_INT8", "").lower() in ("1", "true", "yes")
+_EMBEDDING_CACHE_TABLE = "embedding_cache_int8" if EMBEDDING_CACHE_INT8 else "embedding_cache"
+
+# Cache local de hashes: caminho absoluto -> {mtime_ns, size, sha256}. Fica
+# no diretório de cache do usuário, que é gravável mesmo quando o projeto
+# está instalado num diretório somente leitura
+HASH_CACHE_PATH = os.getenv("INGEST_HASH_CACHE") or os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "discord-rag-bot",
+    "ingest_hashes.json",
+)
+
+# Entradas novas acumuladas antes de mesclar o cache de hashes no disco
+HASH_CACHE_FLUSH_EVERY = 256
+
+# Arquivos a partir desse tamanho são hasheados via mmap
+MMAP_HASH_MIN_BYTES = 16 * 1024 * 1024
+
+# Linhas por chamada ao inserir chunks (RPC bulk_insert_kb_chunks ou REST)
+CHUNK_INSERT_BATCH_SIZE = 500
+
+# Documentos com até esse número de chunks são gravados em uma única RPC
+# (ingest_kb_document); acima disso o JSON dos embeddings passa de alguns MB
+# e a chamada fica sujeita a timeouts
+SINGLE_CALL_MAX_CHUNKS = 300
+
 if not OPENAI_API_KEY:
     raise RuntimeError("❌ OPENAI_API_KEY não definido.")
 if not SUPABASE_URL or not SUPABASE_KEY:
@@ -42,22 +144,214 @@ openai_client = OpenAI(api_key=OPENAI_API_KEY)
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 
+def create_supabase_client(max_workers: Optional[int] = None) -> Client:
+    """Cria o cliente Supabase, opcionalmente com pool HTTP para ``max_workers``.
+
+    O pool padrão do httpx mantém só 20 conexões keep-alive, então lotes com
+    mais threads reabririam conexões TLS a cada chamada. O cliente httpx é
+    passado por ``ClientOptions``, para o supabase-py usá-lo sempre que
+    (re)criar o cliente PostgREST, com as mesmas opções que ele usaria
+    (HTTP/2, redirects e o timeout padrão do PostgREST).
+
+    Args:
+        max_workers: Threads que usarão o cliente simultaneamente (padrão:
+            pool padrão do supabase-py)
+    """
+    if not max_workers:
+        return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+    http_client = httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        timeout=DEFAULT_POSTGREST_CLIENT_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=max_workers * 2,
+            max_keepalive_connections=max_workers,
+        ),
+    )
+    return create_client(
+        SUPABASE_URL, SUPABASE_KEY, options=ClientOptions(httpx_client=http_client)
+    )
+
+
+def configure_supabase_pool(max_workers: int) -> None:
+    """Troca o cliente Supabase do módulo por um com pool para ``max_workers`` threads.
+
+    Todas as threads compartilham o mesmo cliente; quem usa o cliente fora
+    deste módulo deve acessá-lo como ``ingest_pdf.supabase``.
+
+    Args:
+        max_workers: Número de threads que usarão o cliente simultaneamente
+    """
+    global supabase
+    supabase = create_supabase_client(max_workers)
+
+
 # ============================================================
 # Utilitários
 # ============================================================
 
+_hash_cache: Optional[Dict[str, Dict[str, Any]]] = None
+# Entradas alteradas desde a última gravação (só elas são mescladas no disco)
+_hash_cache_updates: Dict[str, Dict[str, Any]] = {}
+_hash_cache_lock = threading.Lock()
+
+
+def _read_hash_cache_file() -> Dict[str, Dict[str, Any]]:
+    """Lê o cache de hashes do disco (vazio se ausente ou inválido)."""
+    try:
+        with open(HASH_CACHE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _load_hash_cache() -> Dict[str, Dict[str, Any]]:
+    """Carrega (uma vez) o cache de hashes e agenda a gravação na saída."""
+    global _hash_cache
+    if _hash_cache is None:
+        _hash_cache = _read_hash_cache_file()
+        atexit.register(flush_hash_cache)
+    return _hash_cache
+
+
+@contextmanager
+def _hash_cache_file_lock() -> Iterator[None]:
+    """Trava exclusiva (``fcntl.flock``) entre processos durante a mescla.
+
+    Sem ``fcntl`` (Windows) a mescla segue sem trava; o ``os.replace``
+    continua garantindo que o arquivo nunca fique pela metade.
+    """
+    if not HAS_FCNTL:
+        yield
+        return
+    with open(f"{HASH_CACHE_PATH}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def flush_hash_cache() -> None:
+    """Grava no disco as entradas novas do cache de hashes.
+
+    As entradas são mescladas, sob uma trava de arquivo, ao conteúdo atual
+    do arquivo (que pode ter sido gravado por outros processos) e o
+    resultado o substitui de uma vez (``os.replace``). Roda a cada
+    ``HASH_CACHE_FLUSH_EVERY`` entradas novas, ao fim do ``batch_ingest`` e
+    na saída do processo. O cache é só uma otimização: se a gravação falhar,
+    as entradas pendentes são descartadas com um único aviso.
+    """
+    with _hash_cache_lock:
+        if not _hash_cache_updates:
+            return
+        tmp_path = f"{HASH_CACHE_PATH}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(HASH_CACHE_PATH) or ".", exist_ok=True)
+            with _hash_cache_file_lock():
+                data = _read_hash_cache_file()
+                data.update(_hash_cache_updates)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, HASH_CACHE_PATH)
+        except OSError as e:
+            print(f"⚠️  Não foi possível gravar o cache de hashes: {e}")
+        finally:
+            _hash_cache_updates.clear()
+
+
+def take_hash_cache_updates() -> Dict[str, Dict[str, Any]]:
+    """Retira as entradas ainda não gravadas do cache de hashes.
+
+    Usada pelos workers de processo do ``batch_ingest`` (onde o ``atexit``
+    não roda) para devolver as entradas ao processo pai.
+    """
+    with _hash_cache_lock:
+        updates = dict(_hash_cache_updates)
+        _hash_cache_updates.clear()
+    return updates
+
+
+def get_cached_file_hash(file_path: str, st: Optional[os.stat_result] = None) -> Optional[str]:
+    """Retorna o SHA256 em cache se mtime e tamanho do arquivo não mudaram.
+
+    Entradas malformadas contam como ausentes.
+    """
+    st = st or os.stat(file_path)
+    with _hash_cache_lock:
+        entry = _load_hash_cache().get(os.path.abspath(file_path))
+    if not isinstance(entry, dict):
+        return None
+    sha256 = entry.get("sha256")
+    if (
+        isinstance(sha256, str)
+        and entry.get("mtime_ns") == st.st_mtime_ns
+        and entry.get("size") == st.st_size
+    ):
+        return sha256
+    return None
+
+
+def remember_file_hash(file_path: str, st: os.stat_result, sha256: str) -> None:
+    """Guarda o SHA256 do arquivo no cache (gravado por flush_hash_cache)."""
+    entry = {
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "sha256": sha256,
+    }
+    with _hash_cache_lock:
+        key = os.path.abspath(file_path)
+        _load_hash_cache()[key] = entry
+        _hash_cache_updates[key] = entry
+        pending = len(_hash_cache_updates)
+    if pending >= HASH_CACHE_FLUSH_EVERY:
+        flush_hash_cache()
+
+
+def merge_hash_cache_updates(updates: Optional[Dict[str, Dict[str, Any]]]) -> None:
+    """Incorpora entradas vindas de outro processo (ver take_hash_cache_updates)."""
+    if not updates:
+        return
+    with _hash_cache_lock:
+        _load_hash_cache().update(updates)
+        _hash_cache_updates.update(updates)
+        pending = len(_hash_cache_updates)
+    if pending >= HASH_CACHE_FLUSH_EVERY:
+        flush_hash_cache()
+
+
 def calculate_file_hash(file_path: str) -> str:
-    """Calcula SHA256 hash do arquivo para detectar mudanças."""
-    sha256_hash = hashlib.sha256()
+    """Calcula SHA256 hash do arquivo para detectar mudanças.
+
+    Arquivos com mtime e tamanho iguais aos do cache local não são relidos;
+    nos demais, ``hashlib.file_digest`` faz o loop de leitura em C. A partir
+    de ``MMAP_HASH_MIN_BYTES`` o arquivo é mapeado em memória e passado
+    inteiro ao SHA256 (sem cópias para um buffer e sem segurar o GIL).
+    """
+    st = os.stat(file_path)
+    cached = get_cached_file_hash(file_path, st)
+    if cached:
+        return cached
+
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+        if st.st_size >= MMAP_HASH_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                file_hash = hashlib.sha256(mm).hexdigest()
+        else:
+            file_hash = hashlib.file_digest(f, "sha256").hexdigest()
+    remember_file_hash(file_path, st, file_hash)
+    return file_hash
 
 
+@lru_cache(maxsize=None)
 def get_tokenizer(model: str = EMBEDDING_MODEL) -> Encoding:
     """Retorna um tokenizer compatível com o modelo de embedding.
 
+    O resultado é memoizado por modelo: a resolução do encoding acontece uma
+    vez por processo, não a cada documento.
+
     Args:
         model: Nome do modelo de embedding
 
@@ -81,7 +375,7 @@ def count_tokens(text: str, tokenizer: Encoding) -> int:
     Returns:
         Número de tokens
     """
-    return len(tokenizer.encode(text))
+    return len(tokenizer.encode_ordinary(text))
 
 
 def chunk_text(
@@ -116,40 +410,190 @@ def chunk_text(
             f"Recommended: overlap_tokens <= max_tokens * 0.2"
         )
 
-    tokens = tokenizer.encode(text)
-    chunks = []
-    start = 0
-    idx = 0
-
-    while start < len(tokens):
-        end = start + max_tokens
-        chunk_tokens = tokens[start:end]
-        chunk_text_str = tokenizer.decode(chunk_tokens)
-        chunks.append({
+    # O documento é tokenizado uma única vez; as janelas são fatias da lista
+    # de ids. encode_ordinary pula a varredura por tokens especiais (e não
+    # falha se o PDF contiver algo como "<|endoftext|>")
+    tokens = tokenizer.encode_ordinary(text)
+    step = max_tokens - overlap_tokens
+    # Para na janela que alcança o fim do texto (como o TokenTextSplitter):
+    # uma janela depois dela conteria só tokens já incluídos no overlap
+    stop = len(tokens) - overlap_tokens if len(tokens) > max_tokens else min(len(tokens), 1)
+    token_windows = [
+        tokens[start:start + max_tokens]
+        for start in range(0, stop, step)
+    ]
+    decoded = tokenizer.decode_batch(token_windows)
+
+    return [
+        {
             "index": idx,
-            "content": chunk_text_str,
-            "token_count": len(chunk_tokens)
-        })
-        idx += 1
-        start = end - overlap_tokens
-        if start >= len(tokens):
-            break
+            "content": content,
+            "token_count": len(window),
+        }
+        for idx, (window, content) in enumerate(zip(token_windows, decoded))
+    ]
+
 
-    return chunks
+def chunk_text_streaming(
+    pages: Iterable[str],
+    max_tokens: int = 500,
+    overlap_tokens: int = 50,
+    tokenizer: Optional[Encoding] = None
+) -> Iterator[Dict[str, Any]]:
+    """Versão incremental de :func:`chunk_text` para texto que chega por página.
+
+    Páginas vazias são ignoradas e as demais são unidas por linha em branco,
+    como em :func:`extract_text_from_pdf`; cada chunk sai assim que a janela
+    de ``max_tokens`` enche, e só os tokens ainda não emitidos ficam em
+    memória (nunca o documento inteiro).
+
+    Raises:
+        ValueError: Se overlap_tokens >= max_tokens
+    """
+    if tokenizer is None:
+        tokenizer = get_tokenizer()
+
+    if overlap_tokens >= max_tokens:
+        raise ValueError(
+            f"overlap_tokens ({overlap_tokens}) must be less than max_tokens ({max_tokens}). "
+            f"Recommended: overlap_tokens <= max_tokens * 0.2"
+        )
+
+    step = max_tokens - overlap_tokens
+    tokens: List[int] = []
+    idx = 0
+    separator = ""
+
+    for page in pages:
+        if not page.strip():
+            continue
+        tokens.extend(tokenizer.encode_ordinary(separator + page))
+        separator = "\n\n"
+
+        # Janelas completas já disponíveis: um único del e um único
+        # decode_batch por página, em vez de um de cada por chunk
+        windows = [
+            tokens[start:start + max_tokens]
+            for start in range(0, len(tokens) - max_tokens + 1, step)
+        ]
+        if windows:
+            del tokens[:len(windows) * step]
+            for window, content in zip(windows, tokenizer.decode_batch(windows)):
+                yield {"index": idx, "content": content, "token_count": len(window)}
+                idx += 1
+
+    # Cauda: mesmas janelas que chunk_text geraria. Depois de uma janela
+    # cheia, os primeiros overlap_tokens restantes já foram emitidos; sem
+    # tokens além deles, não há cauda
+    stop = len(tokens) - overlap_tokens if idx else min(len(tokens), 1)
+    windows = [tokens[start:start + max_tokens] for start in range(0, stop, step)]
+    for window, content in zip(windows, tokenizer.decode_batch(windows)):
+        yield {"index": idx, "content": content, "token_count": len(window)}
+        idx += 1
 
 
 # ============================================================
 # Leitura de PDF
 # ============================================================
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extrai texto de todas as páginas do PDF."""
+def _extract_pages_text(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Extrai o texto das páginas [start, stop) abrindo o PDF no próprio processo.
+
+    Objetos de página do pypdf não são picklable, então cada worker reabre
+    o arquivo e lê só o seu intervalo.
+    """
     reader = PdfReader(pdf_path)
-    pages_text = []
-    for page_num, page in enumerate(reader.pages, start=1):
-        text = page.extract_text() or ""
-        if text.strip():
-            pages_text.append(text)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def iter_pdf_pages_text(
+    pdf_path: str,
+    page_workers: Optional[int] = None,
+    data: Optional[bytes] = None,
+) -> Iterator[str]:
+    """Gera o texto de cada página do PDF, na ordem, sem montar o documento inteiro.
+
+    Usa o pypdfium2 quando instalado (parser em C, sem pool) ou, só com
+    ``USE_PYMUPDF=1`` (por ser AGPL), o PyMuPDF. Caso contrário, com
+    ``page_workers > 1`` as páginas são divididas em intervalos contíguos
+    e extraídas em um ``ProcessPoolExecutor`` (``extract_text`` do pypdf é
+    Python puro e não libera o GIL). PDFs pequenos e chamadas feitas de dentro
+    de um worker de processo são lidos de forma sequencial.
+
+    Args:
+        pdf_path: Caminho do PDF
+        page_workers: Processos para a extração (padrão: ``PDF_PAGE_WORKERS``)
+        data: Conteúdo do arquivo já lido (evita uma segunda leitura do disco)
+    """
+    if page_workers is None:
+        page_workers = PDF_PAGE_WORKERS
+
+    if USE_PYMUPDF and HAS_PYMUPDF:
+        if data is not None:
+            pdf = pymupdf.open(stream=data, filetype="pdf")
+        else:
+            pdf = pymupdf.open(pdf_path)
+        with pdf:
+            for page in pdf:
+                yield page.get_text("text")
+        return
+
+    if HAS_PYPDFIUM2:
+        pdf = pypdfium2.PdfDocument(data if data is not None else pdf_path)
+        try:
+            for page_number in range(len(pdf)):
+                page = pdf[page_number]
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+        return
+
+    reader = PdfReader(io.BytesIO(data) if data is not None else pdf_path)
+    num_pages = len(reader.pages)
+
+    if (
+        page_workers <= 1
+        or num_pages < PARALLEL_EXTRACT_MIN_PAGES
+        or multiprocessing.current_process().daemon
+    ):
+        for page in reader.pages:
+            yield page.extract_text() or ""
+        return
+
+    workers = min(page_workers, num_pages)
+    # Alguns intervalos por worker equilibram páginas de custo desigual
+    step = max(1, -(-num_pages // (workers * 4)))
+    starts = range(0, num_pages, step)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parts = executor.map(
+            _extract_pages_text,
+            [pdf_path] * len(starts),
+            starts,
+            [min(start + step, num_pages) for start in starts],
+        )
+        for part in parts:
+            yield from part
+
+
+def extract_text_from_pdf(
+    pdf_path: str,
+    page_workers: Optional[int] = None,
+    data: Optional[bytes] = None,
+) -> str:
+    """Extrai texto de todas as páginas do PDF (ver :func:`iter_pdf_pages_text`)."""
+    return _join_pages_text(
+        pdf_path, iter_pdf_pages_text(pdf_path, page_workers=page_workers, data=data)
+    )
+
+
+def _join_pages_text(pdf_path: str, texts: Iterable[str]) -> str:
+    """Junta o texto das páginas não vazias, separadas por linha em branco."""
+    pages_text = [text for text in texts if text.strip()]
 
     if not pages_text:
         raise RuntimeError(f"❌ Nenhum texto extraído do PDF: {pdf_path}")
@@ -162,94 +606,386 @@ def extract_text_from_pdf(pdf_path: str) -> str:
 # OpenAI Embeddings (com retry)
 # ============================================================
 
-def get_embedding(text: str, model: str = EMBEDDING_MODEL, max_retries: int = 3) -> List[float]:
-    """Gera embedding com retry em caso de falha transiente.
+def _retry_wait_seconds(error: Exception, attempt: int, max_wait: float = 30.0) -> float:
+    """Tempo de espera antes de uma nova tentativa.
+
+    Em 429 respeita o ``Retry-After`` enviado pela OpenAI; nos demais erros
+    usa backoff exponencial com jitter completo, para que workers paralelos
+    não tentem de novo ao mesmo tempo.
+    """
+    if isinstance(error, RateLimitError):
+        retry_after = error.response.headers.get("retry-after")
+        try:
+            return min(float(retry_after), max_wait)
+        except (TypeError, ValueError):
+            pass
+    return random.uniform(0, min(2 ** attempt, max_wait))
+
+
+def get_embeddings(
+    texts: List[str], model: str = EMBEDDING_MODEL, max_retries: int = 3
+) -> List[Embedding]:
+    """Gera embeddings de vários textos em uma única chamada à API, com retry.
+
+    A API de embeddings aceita uma lista em ``input``; enviar o lote inteiro
+    troca N round-trips HTTP por um só.
 
     Args:
-        text: Texto para gerar embedding
+        texts: Textos para gerar embedding
         model: Modelo de embedding a usar
-        max_retries: Número máximo de tentativas
+        max_retries: Número máximo de tentativas (por lote)
 
     Returns:
-        Lista de floats representando o embedding (nunca None)
+        Embeddings float32 na mesma ordem de ``texts`` (nunca None)
 
     Raises:
-        RuntimeError: Se todas as tentativas falharem ou embedding for inválido
+        RuntimeError: Se todas as tentativas falharem ou algum embedding for inválido
     """
-    text = text.replace("\n", " ").strip()
+    texts = [text.replace("\n", " ").strip() for text in texts]
 
-    if not text:
+    if not texts or not all(texts):
         raise ValueError("❌ Texto vazio fornecido para geração de embedding")
 
     for attempt in range(max_retries):
         try:
             response = openai_client.embeddings.create(
-                input=[text],
-                model=model
+                input=texts,
+                model=model,
+                **({"dimensions": EMBEDDING_DIMENSIONS} if EMBEDDING_DIMENSIONS else {})
             )
 
             # CRITICAL: Validar resposta antes de retornar
-            if not response or not response.data or len(response.data) == 0:
+            if not response or not response.data or len(response.data) != len(texts):
                 raise ValueError("❌ Resposta da API OpenAI vazia ou inválida")
 
-            embedding = response.data[0].embedding
+            embeddings = [
+                d.embedding for d in sorted(response.data, key=lambda d: d.index)
+            ]
 
-            if embedding is None:
-                raise ValueError("❌ API OpenAI retornou embedding=None")
+            for embedding in embeddings:
+                if embedding is None:
+                    raise ValueError("❌ API OpenAI retornou embedding=None")
 
-            if not isinstance(embedding, list) or len(embedding) == 0:
-                raise ValueError(
-                    f"❌ Embedding inválido: esperado lista não-vazia, "
-                    f"recebido {type(embedding).__name__}"
-                )
+                if not isinstance(embedding, list) or len(embedding) == 0:
+                    raise ValueError(
+                        f"❌ Embedding inválido: esperado lista não-vazia, "
+                        f"recebido {type(embedding).__name__}"
+                    )
 
-            return embedding
+            return [array("f", embedding) for embedding in embeddings]
 
         except Exception as e:
             if attempt < max_retries - 1:
-                wait_time = 2 ** attempt
-                print(f"⚠️  Erro ao gerar embedding (tentativa {attempt + 1}/{max_retries}): {e}")
-                print(f"   Aguardando {wait_time}s antes de tentar novamente...")
+                wait_time = _retry_wait_seconds(e, attempt)
+                print(f"⚠️  Erro ao gerar embeddings (tentativa {attempt + 1}/{max_retries}): {e}")
+                print(f"   Aguardando {wait_time:.1f}s antes de tentar novamente...")
                 time.sleep(wait_time)
             else:
                 raise RuntimeError(
-                    f"❌ Falha ao gerar embedding após {max_retries} tentativas: {e}\n"
-                    f"   Texto (primeiros 100 chars): {text[:100]}..."
+                    f"❌ Falha ao gerar embeddings após {max_retries} tentativas: {e}\n"
+                    f"   Lote de {len(texts)} textos; primeiro (100 chars): {texts[0][:100]}..."
                 )
 
 
+def get_embeddings_batched(
+    batches: List[List[str]],
+    model: str = EMBEDDING_MODEL,
+    max_concurrency: int = EMBEDDING_CONCURRENCY,
+) -> List[List[Embedding]]:
+    """Gera embeddings de vários lotes com até ``max_concurrency`` requests em voo.
+
+    As chamadas são de rede, então threads bastam para sobrepor a latência;
+    o resultado mantém a ordem de ``batches``. Se um lote falhar, os lotes
+    ainda na fila são cancelados e o erro é propagado (o documento inteiro
+    falha, como na versão sequencial).
+    """
+    if len(batches) <= 1 or max_concurrency <= 1:
+        return [get_embeddings(batch, model=model) for batch in batches]
+
+    pool = ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches)))
+    try:
+        return list(pool.map(partial(get_embeddings, model=model), batches))
+    finally:
+        # Após uma falha, os lotes ainda na fila não chegam a ser enviados
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def bulk_embed(
+    batches: List[List[str]],
+    model: str = EMBEDDING_MODEL,
+    poll_seconds: float = BULK_EMBED_POLL_SECONDS,
+) -> List[List[Embedding]]:
+    """Gera embeddings pela Batch API da OpenAI (um request por lote).
+
+    Envia um JSONL com um request ``/v1/embeddings`` por lote, espera o job
+    terminar (janela de 24h; o intervalo de consulta dobra até 5 min) e
+    devolve os embeddings na ordem de ``batches``.
+
+    Raises:
+        RuntimeError: Se o job não concluir ou algum request falhar
+    """
+    if sum(map(len, batches)) > 50_000:
+        raise ValueError("❌ A Batch API aceita no máximo 50.000 textos por job de embeddings")
+
+    lines = []
+    for i, batch in enumerate(batches):
+        texts = [text.replace("\n", " ").strip() for text in batch]
+        if not texts or not all(texts):
+            raise ValueError("❌ Texto vazio fornecido para geração de embedding")
+        lines.append(json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/embeddings",
+            "body": {
+                "model": model,
+                "input": texts,
+                **({"dimensions": EMBEDDING_DIMENSIONS} if EMBEDDING_DIMENSIONS else {}),
+            },
+        }))
+
+    input_file = openai_client.files.create(
+        file=("embeddings.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    job = openai_client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/embeddings",
+        completion_window="24h",
+    )
+    print(f"📦 Job de embeddings enviado à Batch API: {job.id} ({len(lines)} requests)")
+
+    wait = poll_seconds
+    while job.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(wait)
+        wait = min(wait * 2, 300.0)
+        job = openai_client.batches.retrieve(job.id)
+        print(f"   ⏳ Status do job {job.id}: {job.status}")
+
+    if job.status != "completed" or not job.output_file_id:
+        raise RuntimeError(f"❌ Job de embeddings {job.id} terminou com status '{job.status}'")
+
+    results: Dict[int, List[Embedding]] = {}
+    for line in openai_client.files.content(job.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        response = item.get("response") or {}
+        data = (response.get("body") or {}).get("data")
+        if item.get("error") or response.get("status_code") != 200 or not data:
+            raise RuntimeError(
+                f"❌ Request {item.get('custom_id')} do job {job.id} falhou: "
+                f"{item.get('error') or response.get('status_code')}"
+            )
+        results[int(item["custom_id"])] = [
+            array("f", d["embedding"]) for d in sorted(data, key=lambda d: d["index"])
+        ]
+
+    missing = [i for i in range(len(batches)) if len(results.get(i, ())) != len(batches[i])]
+    if missing:
+        raise RuntimeError(
+            f"❌ Job de embeddings {job.id} sem resultado para {len(missing)} lotes"
+        )
+    return [results[i] for i in range(len(batches))]
+
+
+def content_key(content: str) -> str:
+    """Chave curta (blake2b de 128 bits) do conteúdo de um chunk."""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def quantize_embedding(embedding: Embedding) -> bytes:
+    """Codifica o vetor como escala float32 + componentes int8 em [-127, 127]."""
+    scale = max(map(abs, embedding)) / 127 or 1.0
+    quantized = array("b", [round(value / scale) for value in embedding])
+    return array("f", [scale]).tobytes() + quantized.tobytes()
+
+
+def dequantize_embedding(blob: bytes) -> Embedding:
+    """Inverso de :func:`quantize_embedding`."""
+    scale = array("f", blob[:4])[0]
+    return array("f", [value * scale for value in array("b", blob[4:])])
+
+
+def _open_embedding_cache() -> sqlite3.Connection:
+    """Abre (criando se preciso) o cache SQLite de embeddings."""
+    conn = sqlite3.connect(EMBEDDING_CACHE_PATH, timeout=30)
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {_EMBEDDING_CACHE_TABLE} ("
+        " model TEXT NOT NULL,"
+        " content_key TEXT NOT NULL,"
+        " embedding BLOB NOT NULL,"
+        " PRIMARY KEY (model, content_key))"
+    )
+    return conn
+
+
+def load_cached_embeddings(
+    keys: List[str], model: str = EMBEDDING_MODEL_ID
+) -> Dict[str, Embedding]:
+    """Busca no cache local os embeddings já gerados para ``keys``."""
+    if not EMBEDDING_CACHE_PATH or not keys:
+        return {}
+
+    found: Dict[str, Embedding] = {}
+    decode = dequantize_embedding if EMBEDDING_CACHE_INT8 else partial(array, "f")
+    conn = _open_embedding_cache()
+    try:
+        for i in range(0, len(keys), 500):
+            batch = keys[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT content_key, embedding FROM {_EMBEDDING_CACHE_TABLE} "
+                f"WHERE model = ? AND content_key IN ({placeholders})",
+                [model, *batch],
+            )
+            for key, blob in rows:
+                found[key] = decode(blob)
+    finally:
+        conn.close()
+    return found
+
+
+def store_cached_embeddings(
+    embeddings: Dict[str, Embedding], model: str = EMBEDDING_MODEL_ID
+) -> None:
+    """Grava embeddings no cache local (float32, ou int8 com EMBEDDING_CACHE_INT8)."""
+    if not EMBEDDING_CACHE_PATH or not embeddings:
+        return
+
+    conn = _open_embedding_cache()
+    try:
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {_EMBEDDING_CACHE_TABLE} VALUES (?, ?, ?)",
+                [
+                    (
+                        model,
+                        key,
+                        quantize_embedding(embedding) if EMBEDDING_CACHE_INT8
+                        else embedding.tobytes(),
+                    )
+                    for key, embedding in embeddings.items()
+                ],
+            )
+    finally:
+        conn.close()
+
+
+def vector_literal(embedding: Embedding) -> str:
+    """Formata o embedding como literal pgvector (``[x,y,...]``).
+
+    Nove dígitos significativos bastam para reproduzir um float32, e o texto
+    fica menor que o JSON de floats de precisão dupla.
+    """
+    return "[" + ",".join(["%.9g" % value for value in embedding]) + "]"
+
+
+def chunk_content_hash(content: str) -> str:
+    """Hash do conteúdo no formato da coluna gerada ``kb_chunks.content_hash``."""
+    return hashlib.md5(content.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def parse_vector_literal(literal: str) -> Embedding:
+    """Inverso de :func:`vector_literal` (texto ``[x,y,...]`` do pgvector)."""
+    return array("f", map(float, literal.strip("[]").split(",")))
+
+
+def load_stored_embeddings(
+    contents: Dict[str, str], model: str = EMBEDDING_MODEL_ID
+) -> Dict[str, Embedding]:
+    """Busca em kb_chunks embeddings já gravados para o mesmo conteúdo.
+
+    Args:
+        contents: Mapa chave -> conteúdo do chunk
+        model: Modelo de embedding (só reaproveita vetores do mesmo modelo)
+
+    Returns:
+        Mapa chave -> embedding, só para os conteúdos encontrados
+    """
+    keys_by_hash: Dict[str, List[str]] = {}
+    for key, content in contents.items():
+        keys_by_hash.setdefault(chunk_content_hash(content), []).append(key)
+
+    found: Dict[str, Embedding] = {}
+    hashes = list(keys_by_hash)
+    for i in range(0, len(hashes), CHUNK_INSERT_BATCH_SIZE):
+        res = supabase.rpc(
+            "find_kb_chunk_embeddings",
+            {
+                "p_content_hashes": hashes[i:i + CHUNK_INSERT_BATCH_SIZE],
+                "p_embedding_model": model,
+            },
+        ).execute()
+        for row in res.data or []:
+            embedding = parse_vector_literal(row["embedding"])
+            for key in keys_by_hash[row["content_hash"]]:
+                found[key] = embedding
+    return found
+
+
+def get_embedding(text: str, model: str = EMBEDDING_MODEL, max_retries: int = 3) -> Embedding:
+    """Gera embedding de um único texto (atalho para :func:`get_embeddings`)."""
+    return get_embeddings([text], model=model, max_retries=max_retries)[0]
+
+
 # ============================================================
 # Supabase – inserção nas tabelas kb_*
 # ============================================================
 
+_collection_ids: Dict[str, str] = {}
+_collection_ids_lock = threading.Lock()
+
+
+def is_missing_function_error(error: Exception) -> bool:
+    """Indica se o erro do PostgREST é de função RPC inexistente no banco.
+
+    Só nesse caso (PGRST202) é seguro refazer a gravação por outro caminho:
+    em timeouts e demais erros a RPC pode já ter sido efetivada.
+    """
+    return isinstance(error, APIError) and (
+        error.code == "PGRST202"
+        or "Could not find the function" in (error.message or "")
+    )
+
+
 def get_or_create_collection(
     name: str, description: str = "", metadata: Optional[Dict[str, Any]] = None
 ) -> str:
-    """Retorna o id da collection. Se não existir, cria."""
-    metadata = metadata or {}
+    """Retorna o id da collection. Se não existir, cria.
 
-    res = supabase.table("kb_collections") \
-                  .select("*") \
-                  .eq("name", name) \
-                  .limit(1) \
-                  .execute()
+    O id é memoizado por nome no processo: em lotes, só o primeiro PDF de
+    cada coleção consulta o banco.
+    """
+    with _collection_ids_lock:
+        if name in _collection_ids:
+            return _collection_ids[name]
 
-    if res.data:
-        print(f"✅ Coleção '{name}' encontrada (id: {res.data[0]['id']})")
-        return res.data[0]["id"]
-
-    print(f"✨ Criando nova coleção '{name}'...")
-    insert_res = supabase.table("kb_collections").insert({
-        "name": name,
-        "description": description,
-        "metadata": metadata
-    }).execute()
+        metadata = metadata or {}
 
-    if not insert_res.data:
-        raise RuntimeError("❌ Falha ao criar kb_collections.")
+        res = supabase.table("kb_collections") \
+                      .select("id") \
+                      .eq("name", name) \
+                      .limit(1) \
+                      .execute()
 
-    print(f"✅ Coleção criada (id: {insert_res.data[0]['id']})")
-    return insert_res.data[0]["id"]
+        if res.data:
+            print(f"✅ Coleção '{name}' encontrada (id: {res.data[0]['id']})")
+            _collection_ids[name] = res.data[0]["id"]
+            return res.data[0]["id"]
+
+        print(f"✨ Criando nova coleção '{name}'...")
+        insert_res = supabase.table("kb_collections").insert({
+            "name": name,
+            "description": description,
+            "metadata": metadata
+        }).execute()
+
+        if not insert_res.data:
+            raise RuntimeError("❌ Falha ao criar kb_collections.")
+
+        print(f"✅ Coleção criada (id: {insert_res.data[0]['id']})")
+        _collection_ids[name] = insert_res.data[0]["id"]
+        return insert_res.data[0]["id"]
 
 
 def find_existing_document(
@@ -304,68 +1040,241 @@ def create_document(
     return insert_res.data[0]["id"]
 
 
+def bucket_chunks_by_length(
+    chunks: List[Dict[str, Any]],
+    max_inputs: int,
+    bucket_tokens: int = EMBEDDING_BUCKET_TOKENS,
+    max_batch_tokens: int = EMBEDDING_MAX_BATCH_TOKENS,
+) -> List[List[Dict[str, Any]]]:
+    """Agrupa chunks em lotes de embedding com tamanhos parecidos.
+
+    Cada chunk vai para a faixa ``ceil(token_count / bucket_tokens)``; dentro
+    da faixa os chunks são ordenados por ``token_count`` decrescente e
+    fatiados em lotes de no máximo ``max_inputs`` textos e
+    ``max_batch_tokens`` tokens somados.
+    """
+    buckets: Dict[int, List[Dict[str, Any]]] = {}
+    for ch in chunks:
+        key = -(-ch["token_count"] // bucket_tokens)
+        buckets.setdefault(key, []).append(ch)
+
+    batches = []
+    for key in sorted(buckets, reverse=True):
+        bucket = sorted(buckets[key], key=lambda ch: ch["token_count"], reverse=True)
+        batch: List[Dict[str, Any]] = []
+        batch_tokens = 0
+        for ch in bucket:
+            if batch and (
+                len(batch) >= max_inputs
+                or batch_tokens + ch["token_count"] > max_batch_tokens
+            ):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(ch)
+            batch_tokens += ch["token_count"]
+        if batch:
+            batches.append(batch)
+    return batches
+
+
+def embed_chunks(
+    chunks: List[Dict[str, Any]],
+    batch_size: int = 96,
+    max_concurrency: int = EMBEDDING_CONCURRENCY,
+    bulk: bool = False,
+) -> Dict[int, Embedding]:
+    """Gera os embeddings dos chunks, indexados por ``chunk["index"]``.
+
+    Os embeddings são pedidos por faixa de tamanho (ver
+    :func:`bucket_chunks_by_length`), uma chamada à API por lote, com até
+    ``max_concurrency`` lotes em paralelo e até ``batch_size`` textos
+    por lote. Com ``bulk=True`` e ao menos ``BULK_EMBED_MIN_CHUNKS`` chunks
+    pendentes, os lotes vão num único job da Batch API (:func:`bulk_embed`).
+    Só vão à API os conteúdos que não estão no cache local nem em kb_chunks
+    (:func:`load_stored_embeddings`).
+
+    Raises:
+        RuntimeError: Se qualquer embedding falhar ou for None
+        ValueError: Se embeddings inválidos forem detectados
+    """
+    total_chunks = len(chunks)
+
+    # Conteúdo repetido (cabeçalhos, rodapés, sumários) é embedado uma vez só
+    keys = [content_key(ch["content"]) for ch in chunks]
+    unique: Dict[str, Dict[str, Any]] = {}
+    for key, ch in zip(keys, chunks):
+        unique.setdefault(key, ch)
+
+    try:
+        embeddings_by_key = load_cached_embeddings(list(unique))
+    except sqlite3.Error as e:
+        print(f"⚠️  Não foi possível ler o cache de embeddings: {e}")
+        embeddings_by_key = {}
+    cached = len(embeddings_by_key)
+
+    # Conteúdo já embedado em outros documentos da base é reaproveitado
+    missing = {key: unique[key]["content"] for key in unique if key not in embeddings_by_key}
+    stored: Dict[str, Embedding] = {}
+    if missing:
+        try:
+            stored = load_stored_embeddings(missing)
+        except Exception as e:
+            print(f"⚠️  Não foi possível consultar embeddings já gravados: {e}")
+    embeddings_by_key.update(stored)
+
+    pending_keys = [key for key in unique if key not in embeddings_by_key]
+    pending = [unique[key] for key in pending_keys]
+    key_of = {id(ch): key for key, ch in zip(pending_keys, pending)}
+
+    embedding_batches = bucket_chunks_by_length(pending, max_inputs=batch_size)
+    print(
+        f"🧠 Gerando embeddings de {len(pending)} chunks em {len(embedding_batches)} lotes "
+        f"({total_chunks - len(unique)} repetidos, {cached} em cache, "
+        f"{len(stored)} já na base)..."
+    )
+
+    batch_texts = [[ch["content"] for ch in batch] for batch in embedding_batches]
+    try:
+        if bulk and len(pending) >= BULK_EMBED_MIN_CHUNKS:
+            batch_embeddings = bulk_embed(batch_texts)
+        else:
+            batch_embeddings = get_embeddings_batched(
+                batch_texts, max_concurrency=max_concurrency
+            )
+    except Exception as e:
+        raise RuntimeError(
+            f"❌ Falha crítica ao gerar embeddings: {e}\n"
+            f"   Documento não será marcado como indexado."
+        )
+
+    new_embeddings: Dict[str, Embedding] = {}
+    for batch, embeddings in zip(embedding_batches, batch_embeddings):
+        for ch, embedding in zip(batch, embeddings):
+            new_embeddings[key_of[id(ch)]] = embedding
+
+    try:
+        store_cached_embeddings(new_embeddings)
+    except sqlite3.Error as e:
+        print(f"⚠️  Não foi possível gravar o cache de embeddings: {e}")
+
+    embeddings_by_key.update(new_embeddings)
+    return {
+        ch["index"]: embeddings_by_key[key] for key, ch in zip(keys, chunks)
+    }
+
+
+def build_chunk_rows(
+    chunks: List[Dict[str, Any]],
+    embeddings_by_index: Dict[int, Embedding],
+    document_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Monta as linhas de kb_chunks na ordem de ``chunk_index``.
+
+    Sem ``document_id`` as linhas saem sem essa coluna (a RPC
+    ``ingest_kb_document`` a preenche no banco).
+    """
+    rows = []
+    for ch in sorted(chunks, key=lambda ch: ch["index"]):
+        row = {
+            "chunk_index": ch["index"],
+            "content": ch["content"],
+            "token_count": ch["token_count"],
+            "embedding": vector_literal(embeddings_by_index[ch["index"]]),
+            "metadata": {},
+        }
+        if document_id is not None:
+            row["document_id"] = document_id
+        rows.append(row)
+    return rows
+
+
 def insert_chunks(
     document_id: str,
     chunks: List[Dict[str, Any]],
-    batch_size: int = 10,
+    batch_size: int = 96,
+    embeddings_by_index: Optional[Dict[int, Embedding]] = None,
 ) -> None:
     """Insere chunks na tabela kb_chunks (com embedding).
 
+    Os embeddings vêm de :func:`embed_chunks`, a menos que já sejam passados
+    em ``embeddings_by_index``. As linhas são inseridas na ordem de
+    ``chunk_index``, em chamadas de até ``CHUNK_INSERT_BATCH_SIZE`` linhas.
+
     Raises:
         RuntimeError: Se qualquer embedding falhar ou for None
         ValueError: Se embeddings inválidos forem detectados
     """
     total_chunks = len(chunks)
-    print(f"💾 Inserindo {total_chunks} chunks em lotes de {batch_size}...")
 
-    for i in range(0, total_chunks, batch_size):
-        batch = chunks[i:i + batch_size]
-        rows = []
+    if embeddings_by_index is None:
+        embeddings_by_index = embed_chunks(chunks, batch_size=batch_size)
 
-        for ch in batch:
-            content = ch["content"]
-            token_count = ch["token_count"]
-            index = ch["index"]
+    rows = build_chunk_rows(chunks, embeddings_by_index, document_id=document_id)
 
-            # Gera embedding com retry automático
-            try:
-                embedding = get_embedding(content)
-            except Exception as e:
-                raise RuntimeError(
-                    f"❌ Falha crítica ao gerar embedding para chunk {index}: {e}\n"
-                    f"   Documento não será marcado como indexado."
-                )
+    print(f"💾 Inserindo {total_chunks} chunks...")
 
-            # CRITICAL: Validar que embedding foi gerado com sucesso
-            if embedding is None:
-                raise ValueError(
-                    f"❌ Embedding retornou None para chunk {index}.\n"
-                    f"   Isso pode indicar rate-limit ou erro silencioso da OpenAI.\n"
-                    f"   Documento não será marcado como indexado."
-                )
+    for i in range(0, total_chunks, CHUNK_INSERT_BATCH_SIZE):
+        _insert_chunk_rows(rows[i:i + CHUNK_INSERT_BATCH_SIZE])
 
-            if not isinstance(embedding, list) or len(embedding) == 0:
-                raise ValueError(
-                    f"❌ Embedding inválido para chunk {index}: "
-                    f"esperado lista não-vazia, recebido {type(embedding).__name__}.\n"
-                    f"   Documento não será marcado como indexado."
-                )
+    print(f"   ✅ {total_chunks} chunks inseridos")
 
-            rows.append({
-                "document_id": document_id,
-                "chunk_index": index,
-                "content": content,
-                "token_count": token_count,
-                "embedding": embedding,
-                "metadata": {},
-            })
 
-        insert_res = supabase.table("kb_chunks").insert(rows).execute()
+def _insert_chunk_rows(rows: List[Dict[str, Any]]) -> None:
+    """Insere linhas em kb_chunks com uma única chamada.
 
-        if insert_res.error:
-            raise RuntimeError(f"❌ Erro ao inserir chunks (lote {i // batch_size + 1}): {insert_res.error}")
+    Usa a RPC ``bulk_insert_kb_chunks`` (migrations/006); só se ela não
+    existir no banco recai para um INSERT REST com as mesmas linhas. Outros
+    erros não são refeitos: a RPC pode ter sido efetivada (ex.: timeout).
 
-        print(f"   ✅ Lote {i // batch_size + 1}/{(total_chunks + batch_size - 1) // batch_size} inserido ({len(rows)} chunks)")
+    Raises:
+        RuntimeError: Se a inserção falhar
+    """
+    try:
+        supabase.rpc("bulk_insert_kb_chunks", {"p_rows": rows}).execute()
+        return
+    except APIError as e:
+        if not is_missing_function_error(e):
+            raise RuntimeError(f"❌ Erro ao inserir chunks: {e}") from e
+        print(f"⚠️  RPC bulk_insert_kb_chunks indisponível, usando INSERT: {e}")
+
+    insert_res = supabase.table("kb_chunks").insert(rows).execute()
+
+    if not insert_res.data or len(insert_res.data) != len(rows):
+        raise RuntimeError("❌ Falha ao inserir chunks em kb_chunks.")
+
+
+def save_document_with_chunks(
+    collection_id: str,
+    external_id: str,
+    title: str,
+    doc_type: str,
+    content_hash: str,
+    metadata: Optional[Dict[str, Any]],
+    rows: List[Dict[str, Any]],
+) -> str:
+    """Grava documento e chunks em uma única transação (RPC ingest_kb_document).
+
+    Cria ou reaproveita o documento de (collection_id, external_id), troca
+    os chunks antigos pelos novos e marca como indexado.
+
+    Returns:
+        ID do documento
+    """
+    res = supabase.rpc("ingest_kb_document", {
+        "p_collection_id": collection_id,
+        "p_external_id": external_id,
+        "p_title": title,
+        "p_doc_type": doc_type,
+        "p_content_hash": content_hash,
+        "p_metadata": metadata or {},
+        "p_embedding_model": EMBEDDING_MODEL_ID,
+        "p_chunks": rows,
+    }).execute()
+
+    if not res.data:
+        raise RuntimeError("❌ RPC ingest_kb_document não retornou o documento.")
+
+    return res.data
 
 
 def mark_document_indexed(document_id: str, content_hash: str, total_chunks: int) -> None:
@@ -381,7 +1290,7 @@ def mark_document_indexed(document_id: str, content_hash: str, total_chunks: int
                 "metadata": {
                     **current_meta,
                     "total_chunks": total_chunks,
-                    "embedding_model": EMBEDDING_MODEL,
+                    "embedding_model": EMBEDDING_MODEL_ID,
                 }
             }) \
             .eq("id", document_id) \
@@ -392,6 +1301,59 @@ def mark_document_indexed(document_id: str, content_hash: str, total_chunks: int
 # Função principal de ingestão
 # ============================================================
 
+def _save_document_in_steps(
+    existing_doc: Optional[Dict[str, Any]],
+    collection_id: str,
+    external_id: str,
+    title: str,
+    doc_type: str,
+    content_hash: str,
+    metadata: Optional[Dict[str, Any]],
+    chunks: List[Dict[str, Any]],
+    embeddings_by_index: Dict[int, Embedding],
+) -> str:
+    """Grava documento e chunks com chamadas separadas (sem a RPC única)."""
+    if existing_doc:
+        document_id = existing_doc["id"]
+        print(f"🗑️  Apagando chunks antigos (document_id={document_id})...")
+        # Só a contagem (Content-Range) volta; as linhas apagadas não são serializadas
+        delete_res = supabase.table("kb_chunks") \
+            .delete(count=CountMethod.exact, returning=ReturnMethod.minimal) \
+            .eq("document_id", document_id) \
+            .execute()
+        chunks_deleted = delete_res.count or 0
+        print(f"   ✅ {chunks_deleted} chunks removidos")
+    else:
+        print("✨ Criando novo documento...")
+        document_id = create_document(
+            collection_id=collection_id,
+            title=title,
+            doc_type=doc_type,
+            source_url=None,
+            external_id=external_id,
+            content_hash=content_hash,
+            metadata=metadata or {}
+        )
+        print(f"   ✅ Documento criado (id: {document_id})")
+
+    # CRITICAL: Só marcar como indexado se TODOS os chunks forem inseridos
+    try:
+        insert_chunks(document_id, chunks, embeddings_by_index=embeddings_by_index)
+    except (RuntimeError, ValueError) as e:
+        print(f"\n❌ ERRO CRÍTICO durante inserção dos chunks:")
+        print(f"   {e}")
+        print(f"\n⚠️  Documento NÃO foi marcado como indexado (is_indexed=False)")
+        print(f"   Chunks podem estar parcialmente inseridos no banco.")
+        print(f"   Para reprocessar, execute novamente com o mesmo PDF.")
+        print(f"   Document ID: {document_id}")
+        raise  # Re-raise para interromper execução
+
+    print("✅ Marcando documento como indexado...")
+    mark_document_indexed(document_id, content_hash, len(chunks))
+
+    return document_id
+
+
 def ingest_pdf(
     pdf_path: str,
     collection_name: str,
@@ -402,41 +1364,74 @@ def ingest_pdf(
     chunk_max_tokens: int = 500,
     chunk_overlap_tokens: int = 50,
     force_reindex: bool = False,
+    page_workers: Optional[int] = None,
+    embed_concurrency: int = EMBEDDING_CONCURRENCY,
+    bulk: bool = False,
 ) -> str:
-    """Ingere PDF na base de conhecimento com controle de duplicatas."""
+    """Ingere PDF na base de conhecimento com controle de duplicatas.
+
+    ``page_workers`` é repassado a :func:`extract_text_from_pdf`;
+    ``embed_concurrency`` e ``bulk`` a :func:`embed_chunks`.
+    """
     if not os.path.exists(pdf_path):
         raise FileNotFoundError(f"❌ PDF não encontrado: {pdf_path}")
 
     external_id = os.path.abspath(pdf_path)
+    coll_desc = collection_description or f"Coleção gerada automaticamente para {collection_name}"
+    collection_id = None
+    existing_doc = None
+
+    # Hash em cache (mtime/tamanho inalterados): se o documento já está
+    # indexado com esse hash, nem abrimos o PDF
+    st = os.stat(pdf_path)
+    cached_hash = None if force_reindex else get_cached_file_hash(pdf_path, st)
+    if cached_hash:
+        collection_id = get_or_create_collection(
+            name=collection_name,
+            description=coll_desc,
+            metadata={}
+        )
+        existing_doc = find_existing_document(collection_id, external_id)
+        if (
+            existing_doc
+            and existing_doc.get("is_indexed", False)
+            and existing_doc.get("content_hash") == cached_hash
+        ):
+            print(f"✅ Documento já indexado e sem alterações. Pulando ingestão.")
+            print(f"   Document ID: {existing_doc['id']}")
+            print(f"   Título: {existing_doc['title']}")
+            return existing_doc["id"]
+
+    # Uma única leitura do arquivo alimenta o hash e o parser de PDF
+    with open(pdf_path, "rb") as f:
+        data = f.read()
 
     print(f"🔍 Calculando hash do arquivo...")
-    file_hash = calculate_file_hash(pdf_path)
+    file_hash = hashlib.sha256(data).hexdigest()
+    remember_file_hash(pdf_path, st, file_hash)
     print(f"   Hash: {file_hash[:16]}...")
 
-    print(f"📄 Lendo PDF: {pdf_path}")
-    text = extract_text_from_pdf(pdf_path)
-    print(f"   ✅ {len(text)} caracteres extraídos")
-
-    print("✂️  Gerando chunks...")
-    tokenizer = get_tokenizer()
-    chunks = chunk_text(
-        text,
+    # Páginas seguem direto para o chunker, sem montar o texto inteiro
+    print(f"📄 Lendo PDF e gerando chunks: {pdf_path}")
+    chunks = list(chunk_text_streaming(
+        iter_pdf_pages_text(pdf_path, page_workers=page_workers, data=data),
         max_tokens=chunk_max_tokens,
         overlap_tokens=chunk_overlap_tokens,
-        tokenizer=tokenizer
-    )
+        tokenizer=get_tokenizer()
+    ))
+    del data
+    if not chunks:
+        raise RuntimeError(f"❌ Nenhum texto extraído do PDF: {pdf_path}")
     print(f"   ✅ {len(chunks)} chunks gerados")
 
-    coll_desc = collection_description or f"Coleção gerada automaticamente para {collection_name}"
-    collection_id = get_or_create_collection(
-        name=collection_name,
-        description=coll_desc,
-        metadata={}
-    )
-
-    existing_doc = find_existing_document(collection_id, external_id)
+    if collection_id is None:
+        collection_id = get_or_create_collection(
+            name=collection_name,
+            description=coll_desc,
+            metadata={}
+        )
+        existing_doc = find_existing_document(collection_id, external_id)
 
-    should_reindex = False
     document_id = None
 
     if existing_doc:
@@ -454,55 +1449,63 @@ def ingest_pdf(
             print(f"⚠️  Arquivo modificado detectado!")
             print(f"   Hash antigo: {existing_hash[:16] if existing_hash else 'N/A'}...")
             print(f"   Hash novo:   {file_hash[:16]}...")
-            should_reindex = True
 
         elif not is_indexed:
             print(f"⚠️  Documento existente não indexado completamente. Reprocessando.")
-            should_reindex = True
 
         elif force_reindex:
             print(f"🔄 Reindexação forçada solicitada.")
-            should_reindex = True
-
-        if should_reindex:
-            print(f"🗑️  Apagando chunks antigos (document_id={document_id})...")
-            delete_res = supabase.table("kb_chunks").delete().eq("document_id", document_id).execute()
-            chunks_deleted = len(delete_res.data) if delete_res.data else 0
-            print(f"   ✅ {chunks_deleted} chunks removidos")
-    else:
-        print("✨ Criando novo documento...")
-        title = document_title or os.path.basename(pdf_path)
-        doc_meta = document_metadata or {}
-        document_id = create_document(
-            collection_id=collection_id,
-            title=title,
-            doc_type=document_type,
-            source_url=None,
-            external_id=external_id,
-            content_hash=file_hash,
-            metadata=doc_meta
-        )
-        print(f"   ✅ Documento criado (id: {document_id})")
 
-    # CRITICAL: Só marcar como indexado se TODOS os embeddings forem gerados com sucesso
+    # Embeddings antes de qualquer escrita: se falharem, o banco fica intacto
     try:
-        insert_chunks(document_id, chunks)
+        embeddings_by_index = embed_chunks(
+            chunks, max_concurrency=embed_concurrency, bulk=bulk
+        )
     except (RuntimeError, ValueError) as e:
         print(f"\n❌ ERRO CRÍTICO durante geração de embeddings:")
         print(f"   {e}")
-        print(f"\n⚠️  Documento NÃO foi marcado como indexado (is_indexed=False)")
-        print(f"   Chunks podem estar parcialmente inseridos no banco.")
+        print(f"\n⚠️  Nenhuma alteração foi gravada no banco.")
         print(f"   Para reprocessar, execute novamente com o mesmo PDF.")
-        print(f"   Document ID: {document_id}")
         raise  # Re-raise para interromper execução
 
-    print("✅ Marcando documento como indexado...")
-    mark_document_indexed(document_id, file_hash, len(chunks))
+    title = document_title or os.path.basename(pdf_path)
+    saved = False
+
+    if len(chunks) <= SINGLE_CALL_MAX_CHUNKS:
+        print(f"💾 Gravando documento e {len(chunks)} chunks em uma transação...")
+        try:
+            document_id = save_document_with_chunks(
+                collection_id=collection_id,
+                external_id=external_id,
+                title=title,
+                doc_type=document_type,
+                content_hash=file_hash,
+                metadata=document_metadata,
+                rows=build_chunk_rows(chunks, embeddings_by_index),
+            )
+            saved = True
+        except APIError as e:
+            if not is_missing_function_error(e):
+                raise
+            print(f"⚠️  RPC ingest_kb_document indisponível, gravando em etapas: {e}")
+
+    if not saved:
+        document_id = _save_document_in_steps(
+            existing_doc=existing_doc,
+            collection_id=collection_id,
+            external_id=external_id,
+            title=title,
+            doc_type=document_type,
+            content_hash=file_hash,
+            metadata=document_metadata,
+            chunks=chunks,
+            embeddings_by_index=embeddings_by_index,
+        )
 
     print(f"\n🎉 Ingestão concluída com sucesso!")
     print(f"   Document ID: {document_id}")
     print(f"   Total de chunks: {len(chunks)}")
-    print(f"   Modelo de embedding: {EMBEDDING_MODEL}")
+    print(f"   Modelo de embedding: {EMBEDDING_MODEL_ID}")
 
     return document_id
 
@@ -531,6 +1534,9 @@ Exemplos de uso:
 
   # Forçar reindexação
   python ingest_pdf.py --pdf ./materiais/lei_8112.pdf --collection "INSS 2024" --force
+
+  # Reindexação de PDF grande pela Batch API (mais barata, assíncrona)
+  python ingest_pdf.py --pdf ./materiais/vade_mecum.pdf --collection "INSS 2024" --force --bulk
         """
     )
 
@@ -547,6 +1553,20 @@ Exemplos de uso:
     parser.add_argument("--chunk-max-tokens", type=int, default=500, help="Tamanho máximo de tokens por chunk.")
     parser.add_argument("--chunk-overlap-tokens", type=int, default=50, help="Overlap de tokens entre chunks.")
     parser.add_argument("--force", action="store_true", help="Forçar reindexação mesmo se já indexado.")
+    parser.add_argument(
+        "--embed-concurrency",
+        type=int,
+        default=EMBEDDING_CONCURRENCY,
+        help="Requests de embeddings simultâneos (padrão: EMBEDDING_CONCURRENCY ou 8).",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help=(
+            "Usar a Batch API da OpenAI (metade do custo, pode levar horas) "
+            f"para documentos com {BULK_EMBED_MIN_CHUNKS}+ chunks novos."
+        ),
+    )
 
     args = parser.parse_args()
 
@@ -568,7 +1588,9 @@ Exemplos de uso:
             document_metadata=doc_metadata,
             chunk_max_tokens=args.chunk_max_tokens,
             chunk_overlap_tokens=args.chunk_overlap_tokens,
-            force_reindex=args.force
+            force_reindex=args.force,
+            embed_concurrency=args.embed_concurrency,
+            bulk=args.bulk,
         )
         return 0
     except Exception as e:
@@ -5,13 +5,18 @@ Este script carrega documentos em múltiplos formatos (PDF, DOCX, TXT, MD, CSV,
 divide-os em chunks, gera embeddings e os armazena no Supabase para RAG.
 """
 
+import asyncio
+import json
+import os
 import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
 from langchain_community.document_loaders import (
-    DirectoryLoader,
     PyPDFLoader,
     TextLoader,
     UnstructuredMarkdownLoader,
@@ -19,7 +24,15 @@ from langchain_community.document_loaders import (
 )
 from langchain_community.vectorstores import SupabaseVectorStore
 from langchain_core.documents import Document as LangChainDocument
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_openai import OpenAIEmbeddings
+from postgrest import ReturnMethod
+
+try:
+    import psycopg
+    from psycopg import sql
+    HAS_PSYCOPG = True
+except ImportError:
+    HAS_PSYCOPG = False
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -28,12 +41,119 @@ from src.config import get_settings
 from src.constants import SUPPORTED_DOCUMENT_TYPES
 from src.exceptions import DocumentLoadError, VectorStoreError
 from src.logging_config import get_logger
-from src.services import SupabaseService
-from src.utils.document_loaders import CSVLoader, ExcelLoader
+from src.services import SupabaseService, get_embeddings
+from src.services.document_control_service import DocumentControlService
+from src.utils.document_loaders import (
+    HAS_PYMUPDF,
+    HAS_PYPDFIUM2,
+    CSVLoader,
+    ExcelLoader,
+    PyMuPDFLoader,
+    PyPDFium2Loader,
+)
+from src.utils.text_splitter import FastTextSplitter, create_text_splitter
 
 # Load environment variables
 load_dotenv()
 
+# Pipeline de indexação: itens aguardando em cada fila entre estágios,
+# textos por chamada de embeddings, linhas por INSERT e lotes de embedding
+# simultâneos
+PIPELINE_QUEUE_SIZE = 4
+PIPELINE_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "500"))
+INSERT_BATCH_SIZE = int(os.getenv("INSERT_BATCH_SIZE", "500"))
+
+# Com DATABASE_URL e psycopg instalado, lotes a partir desse tamanho são
+# gravados com COPY direto no Postgres (abaixo disso, INSERT via REST)
+COPY_MIN_ROWS = 100
+PIPELINE_EMBED_WORKERS = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+
+# Processos para carregar arquivos (padrão: um por núcleo)
+LOAD_DOCUMENTS_NUM_WORKERS = int(
+    os.getenv("LOAD_DOCUMENTS_NUM_WORKERS") or os.cpu_count() or 1
+)
+
+# Processos do estágio de divisão do index_pipeline (padrão: um por núcleo;
+# 1 desativa o pool) e páginas por processo abaixo das quais um arquivo é
+# dividido em thread, sem o pool
+SPLIT_NUM_WORKERS = int(os.getenv("SPLIT_NUM_WORKERS") or os.cpu_count() or 1)
+PARALLEL_SPLIT_MIN_DOCUMENTS = 32
+
+# PyMuPDF (AGPL) só é usado quando pedido explicitamente com USE_PYMUPDF=1
+USE_PYMUPDF = os.getenv("USE_PYMUPDF", "").lower() in ("1", "true", "yes")
+
+# Estimativa de tokens por caractere registrada no controle de documentos
+CHARS_PER_TOKEN = 4
+
+
+def get_pdf_loader(file_path: Path) -> object:
+    """Obtém o carregador de PDF mais rápido instalado.
+
+    Ordem: PyMuPDF (só com ``USE_PYMUPDF=1``, por ser AGPL), pypdfium2
+    (ambos em C) e, por fim, o PyPDFLoader (pypdf, Python puro). Todos geram
+    um documento por página com os mesmos metadados.
+
+    Args:
+        file_path: Caminho para o arquivo PDF
+
+    Returns:
+        Instância do carregador de PDF
+    """
+    if USE_PYMUPDF and HAS_PYMUPDF:
+        return PyMuPDFLoader(file_path)
+    if HAS_PYPDFIUM2:
+        return PyPDFium2Loader(file_path)
+    return PyPDFLoader(str(file_path))
+
+
+def get_loader_for_file(file_path: Path) -> object:
+    """Obtém o carregador apropriado para um arquivo baseado em sua extensão.
+
+    Args:
+        file_path: Caminho para o arquivo
+
+    Returns:
+        Instância apropriada do carregador para o tipo de arquivo
+
+    Raises:
+        ValueError: Se o tipo de arquivo não for suportado
+    """
+    extension = file_path.suffix.lower()
+
+    loader_map = {
+        ".pdf": lambda: get_pdf_loader(file_path),
+        ".txt": lambda: TextLoader(str(file_path), encoding="utf-8"),
+        ".md": lambda: UnstructuredMarkdownLoader(str(file_path)),
+        ".rst": lambda: TextLoader(str(file_path), encoding="utf-8"),
+        ".doc": lambda: UnstructuredWordDocumentLoader(str(file_path)),
+        ".docx": lambda: UnstructuredWordDocumentLoader(str(file_path)),
+        ".csv": lambda: CSVLoader(file_path),
+        ".xlsx": lambda: ExcelLoader(file_path),
+        ".xls": lambda: ExcelLoader(file_path),
+    }
+
+    if extension not in loader_map:
+        raise ValueError(f"Tipo de arquivo não suportado: {extension}")
+
+    return loader_map[extension]()
+
+
+def load_file(
+    file_path: Path,
+) -> tuple[Path, Optional[list[LangChainDocument]], Optional[str]]:
+    """Carrega um arquivo; roda em processo separado no pool de carregamento.
+
+    Args:
+        file_path: Caminho para o arquivo
+
+    Returns:
+        Tupla (caminho, documentos ou None, mensagem de erro ou None)
+    """
+    try:
+        return file_path, get_loader_for_file(file_path).load(), None
+    except Exception as e:
+        return file_path, None, str(e)
+
 
 class DocumentIndexer:
     """Gerencia o carregamento, divisão e indexação de documentos.
@@ -55,48 +175,41 @@ class DocumentIndexer:
             settings=self.settings,
             logger=self.logger,
         )
+        self._copy_conn = None
+        self._doc_control: Optional[DocumentControlService] = None
+
+        # Controle de documentos da execução atual (ver index_changed_files):
+        # source_id por caminho, versões substituídas, chunks e caracteres
+        # gravados por source_id e erros de carregamento por caminho
+        self._source_ids: dict[str, int] = {}
+        self._replaced_sources: dict[int, list[int]] = {}
+        self._source_chunks: Counter = Counter()
+        self._source_chars: Counter = Counter()
+        self._load_failures: dict[str, str] = {}
+
+    @property
+    def doc_control(self) -> DocumentControlService:
+        """Serviço de controle de documentos (criado no primeiro uso)."""
+        if self._doc_control is None:
+            self._doc_control = DocumentControlService(
+                self.settings,
+                self.logger,
+                self.supabase_service.client,
+            )
+        return self._doc_control
 
     def _get_loader_for_file(self, file_path: Path) -> object:
-        """Obtém o carregador apropriado para um arquivo baseado em sua extensão.
-
-        Args:
-            file_path: Caminho para o arquivo
-
-        Returns:
-            Instância apropriada do carregador para o tipo de arquivo
-
-        Raises:
-            ValueError: Se o tipo de arquivo não for suportado
-        """
-        extension = file_path.suffix.lower()
-
-        loader_map = {
-            ".pdf": lambda: PyPDFLoader(str(file_path)),
-            ".txt": lambda: TextLoader(str(file_path), encoding="utf-8"),
-            ".md": lambda: UnstructuredMarkdownLoader(str(file_path)),
-            ".rst": lambda: TextLoader(str(file_path), encoding="utf-8"),
-            ".doc": lambda: UnstructuredWordDocumentLoader(str(file_path)),
-            ".docx": lambda: UnstructuredWordDocumentLoader(str(file_path)),
-            ".csv": lambda: CSVLoader(file_path),
-            ".xlsx": lambda: ExcelLoader(file_path),
-            ".xls": lambda: ExcelLoader(file_path),
-        }
+        """Obtém o carregador apropriado para um arquivo (ver get_loader_for_file)."""
+        return get_loader_for_file(file_path)
 
-        if extension not in loader_map:
-            raise ValueError(f"Tipo de arquivo não suportado: {extension}")
-
-        return loader_map[extension]()
-
-    def load_documents(self) -> list[LangChainDocument]:
-        """Carrega todos os documentos suportados do diretório de dados.
-
-        Suporta: PDF, DOCX, DOC, TXT, Markdown, CSV, Excel (XLSX, XLS)
+    def _find_supported_files(self) -> list[Path]:
+        """Lista os arquivos suportados do diretório de dados.
 
         Returns:
-            Lista de documentos carregados
+            Caminhos dos arquivos encontrados
 
         Raises:
-            DocumentLoadError: Se nenhum documento for encontrado ou o carregamento falhar
+            DocumentLoadError: Se o diretório não existir ou não houver arquivos
         """
         self.logger.info(
             "Carregando documentos",
@@ -134,82 +247,162 @@ class DocumentIndexer:
             by_type=file_types_found,
         )
 
-        # Carrega documentos
-        all_documents = []
-        load_errors = []
+        return supported_files
 
-        try:
-            for file_path in supported_files:
-                try:
-                    self.logger.info(
-                        f"Carregando arquivo: {file_path.name}",
-                        action="LOADING",
-                        file_type=file_path.suffix,
+    def _create_text_splitter(self) -> FastTextSplitter:
+        """Cria o divisor de texto configurado (Rust, se disponível)."""
+        return create_text_splitter(
+            chunk_size=self.settings.chunk_size,
+            chunk_overlap=self.settings.chunk_overlap,
+            by_tokens=self.settings.chunk_by_tokens,
+            model=self.settings.embedding_model,
+        )
+
+    def _insert_vectors(
+        self,
+        vectors: list[list[float]],
+        documents: list[LangChainDocument],
+    ) -> None:
+        """Grava chunks e embeddings na tabela de vetores.
+
+        Com ``DATABASE_URL`` configurado (e psycopg instalado), lotes de ao
+        menos ``COPY_MIN_ROWS`` linhas vão por ``COPY ... FROM STDIN``, que
+        valida tipos e permissões uma vez por lote. Os demais usam INSERTs
+        REST de ``INSERT_BATCH_SIZE`` linhas com ``return=minimal`` (o
+        PostgREST não devolve as linhas e seus embeddings).
+        """
+        if (
+            HAS_PSYCOPG
+            and self.settings.database_url
+            and len(documents) >= COPY_MIN_ROWS
+        ):
+            self._copy_vectors(vectors, documents)
+            return
+
+        rows = [
+            {
+                "content": document.page_content,
+                "metadata": document.metadata,
+                "embedding": vector,
+            }
+            for vector, document in zip(vectors, documents)
+        ]
+        if self._source_ids:
+            for row, document in zip(rows, documents):
+                row["source_id"] = document.metadata.get("source_id")
+        for i in range(0, len(rows), INSERT_BATCH_SIZE):
+            self.supabase_service.client.table(self.settings.supabase_table_name).insert(
+                rows[i:i + INSERT_BATCH_SIZE], returning=ReturnMethod.minimal
+            ).execute()
+
+    def _copy_vectors(
+        self,
+        vectors: list[list[float]],
+        documents: list[LangChainDocument],
+    ) -> None:
+        """Grava o lote com ``COPY`` em uma conexão direta (reaproveitada)."""
+        if self._copy_conn is None or self._copy_conn.closed:
+            self._copy_conn = psycopg.connect(self.settings.database_url)
+
+        table = sql.Identifier(self.settings.supabase_table_name)
+        with_source = bool(self._source_ids)
+        query = sql.SQL(
+            "COPY {} (content, metadata, embedding{}) FROM STDIN"
+        ).format(table, sql.SQL(", source_id" if with_source else ""))
+
+        with self._copy_conn.transaction():
+            with self._copy_conn.cursor() as cursor, cursor.copy(query) as copy:
+                for vector, document in zip(vectors, documents):
+                    row = (
+                        document.page_content,
+                        json.dumps(document.metadata, ensure_ascii=False, default=str),
+                        "[" + ",".join(map(repr, vector)) + "]",
                     )
+                    if with_source:
+                        row += (document.metadata.get("source_id"),)
+                    copy.write_row(row)
 
-                    loader = self._get_loader_for_file(file_path)
-                    documents = loader.load()
-                    all_documents.extend(documents)
+    async def _embed_batch(
+        self,
+        embeddings: OpenAIEmbeddings,
+        batch: list[LangChainDocument],
+    ) -> list[list[float]]:
+        """Gera os embeddings de um lote de chunks.
+
+        Textos repetidos no lote (cabeçalhos, rodapés) são embedados uma vez;
+        cada chunk continua com sua linha e metadados. Usa o cliente
+        AsyncOpenAI do próprio OpenAIEmbeddings, sem threads.
+        """
+        unique_texts = list(dict.fromkeys(doc.page_content for doc in batch))
+        unique_vectors = await embeddings.aembed_documents(unique_texts)
+        vector_by_text = dict(zip(unique_texts, unique_vectors))
+        return [vector_by_text[doc.page_content] for doc in batch]
+
+    def load_documents(self) -> list[LangChainDocument]:
+        """Carrega todos os documentos suportados do diretório de dados.
+
+        Suporta: PDF, DOCX, DOC, TXT, Markdown, CSV, Excel (XLSX, XLS).
+        Os arquivos são lidos em paralelo (``LOAD_DOCUMENTS_NUM_WORKERS``
+        processos) e todos os documentos ficam em memória; para diretórios
+        grandes, prefira ``index_pipeline``.
+
+        Returns:
+            Lista de documentos carregados
+
+        Raises:
+            DocumentLoadError: Se nenhum documento for encontrado ou o carregamento falhar
+        """
+        supported_files = self._find_supported_files()
+        workers = min(LOAD_DOCUMENTS_NUM_WORKERS, len(supported_files))
+        executor = (
+            ProcessPoolExecutor(max_workers=workers)
+            if workers > 1
+            else ThreadPoolExecutor(max_workers=1)
+        )
+
+        all_documents: list[LangChainDocument] = []
+        load_errors: list[str] = []
 
+        with executor:
+            for file_path, documents, error in executor.map(load_file, supported_files):
+                if error is None:
                     self.logger.info(
                         f"Arquivo carregado com sucesso: {file_path.name}",
                         action="SUCCESS",
+                        file_type=file_path.suffix,
                         chunks=len(documents),
                     )
-
-                except Exception as e:
-                    error_msg = f"Falha ao carregar {file_path.name}: {str(e)}"
+                    all_documents.extend(documents)
+                else:
                     self.logger.warning(
-                        error_msg,
+                        f"Falha ao carregar {file_path.name}: {error}",
                         action="WARNING",
                         file=str(file_path),
-                        error=str(e),
+                        error=error,
                     )
-                    load_errors.append(error_msg)
-
-            if not all_documents:
-                error_summary = "\n".join(load_errors)
-                raise DocumentLoadError(
-                    f"Falha ao carregar qualquer documento. Erros:\n{error_summary}"
-                )
-
-            if load_errors:
-                self.logger.warning(
-                    "Alguns arquivos falharam ao carregar",
-                    action="WARNING",
-                    failed_count=len(load_errors),
-                    success_count=len(all_documents),
-                )
+                    load_errors.append(f"Falha ao carregar {file_path.name}: {error}")
 
-            self.logger.info(
-                "Todos os documentos carregados com sucesso",
-                action="SUCCESS",
-                total_chunks=len(all_documents),
-                files_processed=len(supported_files),
-                files_failed=len(load_errors),
+        if not all_documents:
+            error_summary = "\n".join(load_errors)
+            raise DocumentLoadError(
+                f"Falha ao carregar qualquer documento. Erros:\n{error_summary}"
             )
 
-            return all_documents
-
-        except DocumentLoadError:
-            raise
+        self.logger.info(
+            "Todos os documentos carregados com sucesso",
+            action="SUCCESS",
+            total_chunks=len(all_documents),
+            files_processed=len(supported_files),
+            files_failed=len(load_errors),
+        )
 
-        except Exception as e:
-            self.logger.error(
-                "Falha ao carregar documentos",
-                action="ERROR",
-                exc_info=True,
-            )
-            raise DocumentLoadError(
-                "Falha ao carregar documentos",
-                original_error=e,
-            ) from e
+        return all_documents
 
     def split_documents(
         self,
         documents: list[LangChainDocument],
     ) -> list[LangChainDocument]:
-        """Divide documentos em chunks menores.
+        """Divide documentos em chunks menores (mesmo divisor do index_pipeline).
 
         Args:
             documents: Documentos para dividir
@@ -224,14 +417,7 @@ class DocumentIndexer:
             chunk_overlap=self.settings.chunk_overlap,
         )
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.settings.chunk_size,
-            chunk_overlap=self.settings.chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""],
-        )
-
-        chunks = text_splitter.split_documents(documents)
+        chunks = self._create_text_splitter().split_documents(documents)
 
         self.logger.info(
             "Documentos divididos em chunks",
@@ -245,104 +431,409 @@ class DocumentIndexer:
         self,
         chunks: list[LangChainDocument],
     ) -> SupabaseVectorStore:
-        """Cria vector store e indexa documentos.
+        """Gera embeddings e grava chunks já divididos na tabela de vetores.
+
+        Usa os mesmos lotes (``PIPELINE_BATCH_SIZE``) e a mesma gravação
+        (``_insert_vectors``) do index_pipeline.
 
         Args:
             chunks: Chunks de documentos para indexar
 
         Returns:
-            Vector store configurado
+            Vector store apontando para a tabela indexada
 
         Raises:
             VectorStoreError: Se a indexação falhar
         """
         self.logger.info(
-            "Criando vector store no Supabase",
+            "Indexando documentos no Supabase",
             action="LOADING",
             table=self.settings.supabase_table_name,
+            chunks=len(chunks),
         )
-        self.logger.info(
-            "Isso pode levar alguns minutos...",
-            action="LOADING",
+
+        embeddings = get_embeddings(
+            self.settings.embedding_model,
+            self.settings.openai_api_key,
+            self.settings.embedding_dimensions,
         )
 
         try:
-            # Import aqui para evitar dependência circular
-            from langchain_openai import OpenAIEmbeddings
-
-            # Cria embeddings
-            embeddings = OpenAIEmbeddings(
-                model=self.settings.embedding_model,
-                openai_api_key=self.settings.openai_api_key,
+            for i in range(0, len(chunks), PIPELINE_BATCH_SIZE):
+                batch = chunks[i:i + PIPELINE_BATCH_SIZE]
+                vectors = await self._embed_batch(embeddings, batch)
+                await asyncio.to_thread(self._insert_vectors, vectors, batch)
+        except Exception as e:
+            self.logger.error(
+                "Falha ao indexar documentos",
+                action="ERROR",
+                exc_info=True,
             )
+            raise VectorStoreError(
+                "Falha ao indexar documentos no Supabase",
+                operation="index_documents",
+                original_error=e,
+            ) from e
+        finally:
+            if self._copy_conn is not None:
+                self._copy_conn.close()
+                self._copy_conn = None
+
+        self.logger.info(
+            "Vetores indexados com sucesso",
+            action="SUCCESS",
+            vectors=len(chunks),
+        )
+
+        return SupabaseVectorStore(
+            client=self.supabase_service.client,
+            embedding=embeddings,
+            table_name=self.settings.supabase_table_name,
+            query_name=self.settings.supabase_query_name,
+        )
+
+    async def index_pipeline(self, files: Optional[list[Path]] = None) -> int:
+        """Indexa o diretório de dados em pipeline: Load → Split → Embed → Upsert.
+
+        Os estágios rodam ao mesmo tempo, ligados por filas limitadas
+        (``PIPELINE_QUEUE_SIZE``) que seguram o estágio anterior quando o
+        seguinte atrasa: enquanto um arquivo é lido, os chunks do anterior
+        já estão sendo embedados e gravados. A memória fica limitada a alguns
+        arquivos e lotes em trânsito, nunca ao corpus inteiro.
+
+        Args:
+            files: Arquivos a indexar (padrão: todos os suportados em data_dir)
 
-            # Cria vector store
-            vectorstore = SupabaseVectorStore.from_documents(
-                documents=chunks,
-                embedding=embeddings,
-                client=self.supabase_service.client,
-                table_name=self.settings.supabase_table_name,
-                query_name=self.settings.supabase_query_name,
+        Returns:
+            Número de vetores gravados
+
+        Raises:
+            DocumentLoadError: Se nenhum documento puder ser carregado
+            VectorStoreError: Se a geração de embeddings ou a gravação falhar
+        """
+        supported_files = files if files is not None else self._find_supported_files()
+        text_splitter = self._create_text_splitter()
+        embeddings = get_embeddings(
+            self.settings.embedding_model,
+            self.settings.openai_api_key,
+            self.settings.embedding_dimensions,
+        )
+
+        load_q: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        embed_q: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        upsert_q: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        load_errors: list[str] = []
+        stage_seconds = {"split": 0.0, "embed": 0.0, "upsert": 0.0}
+        indexed = 0
+
+        async def load_stage() -> None:
+            loop = asyncio.get_running_loop()
+            workers = min(LOAD_DOCUMENTS_NUM_WORKERS, len(supported_files))
+            executor = (
+                ProcessPoolExecutor(max_workers=workers)
+                if workers > 1
+                else ThreadPoolExecutor(max_workers=1)
             )
+            # No máximo 2 arquivos por worker entre o parser e a fila
+            window = asyncio.Semaphore(2 * workers)
 
-            self.logger.info(
-                "Vector store criado com sucesso",
-                action="SUCCESS",
-                vectors=len(chunks),
+            async def load_one(file_path: Path) -> None:
+                async with window:
+                    _, documents, error = await loop.run_in_executor(
+                        executor, load_file, file_path
+                    )
+                    if error is None:
+                        self.logger.info(
+                            f"Arquivo carregado com sucesso: {file_path.name}",
+                            action="SUCCESS",
+                            file_type=file_path.suffix,
+                            chunks=len(documents),
+                        )
+                        source_id = self._source_ids.get(str(file_path))
+                        if source_id is not None:
+                            for document in documents:
+                                document.metadata["source_id"] = source_id
+                        await load_q.put(documents)
+                    else:
+                        self.logger.warning(
+                            f"Falha ao carregar {file_path.name}: {error}",
+                            action="WARNING",
+                            file=str(file_path),
+                            error=error,
+                        )
+                        load_errors.append(f"Falha ao carregar {file_path.name}: {error}")
+                        self._load_failures[str(file_path)] = error
+
+            try:
+                await asyncio.gather(*(load_one(path) for path in supported_files))
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+            await load_q.put(None)
+
+        async def split_documents(
+            executor: Optional[ProcessPoolExecutor],
+            documents: list[LangChainDocument],
+        ) -> list[LangChainDocument]:
+            workers = min(SPLIT_NUM_WORKERS, len(documents) // PARALLEL_SPLIT_MIN_DOCUMENTS)
+            if executor is None or workers <= 1:
+                return await asyncio.to_thread(text_splitter.split_documents, documents)
+
+            # Arquivos grandes (muitas páginas) são divididos em lotes
+            # contíguos, que preservam a ordem dos chunks e diluem o custo de
+            # enviar os documentos aos processos
+            loop = asyncio.get_running_loop()
+            size = -(-len(documents) // workers)
+            parts = await asyncio.gather(*(
+                loop.run_in_executor(
+                    executor, text_splitter.split_documents, documents[i:i + size]
+                )
+                for i in range(0, len(documents), size)
+            ))
+            return [chunk for part in parts for chunk in part]
+
+        async def split_stage() -> None:
+            executor = (
+                ProcessPoolExecutor(max_workers=SPLIT_NUM_WORKERS)
+                if SPLIT_NUM_WORKERS > 1
+                else None
             )
+            pending: list[LangChainDocument] = []
+            try:
+                while (documents := await load_q.get()) is not None:
+                    start = time.perf_counter()
+                    pending.extend(await split_documents(executor, documents))
+                    stage_seconds["split"] += time.perf_counter() - start
+                    while len(pending) >= PIPELINE_BATCH_SIZE:
+                        await embed_q.put(pending[:PIPELINE_BATCH_SIZE])
+                        del pending[:PIPELINE_BATCH_SIZE]
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+            if pending:
+                await embed_q.put(pending)
+            for _ in range(PIPELINE_EMBED_WORKERS):
+                await embed_q.put(None)
+
+        async def embed_worker() -> None:
+            while (batch := await embed_q.get()) is not None:
+                start = time.perf_counter()
+                vectors = await self._embed_batch(embeddings, batch)
+                elapsed = time.perf_counter() - start
+                stage_seconds["embed"] += elapsed
+                self.logger.debug(
+                    "Lote de embeddings gerado",
+                    chunks=len(batch),
+                    seconds=round(elapsed, 2),
+                )
+                await upsert_q.put((vectors, batch))
+
+        async def embed_stage() -> None:
+            await asyncio.gather(*(embed_worker() for _ in range(PIPELINE_EMBED_WORKERS)))
+            await upsert_q.put(None)
+
+        async def upsert_stage() -> None:
+            nonlocal indexed
+            while (item := await upsert_q.get()) is not None:
+                vectors, batch = item
+                start = time.perf_counter()
+                await asyncio.to_thread(self._insert_vectors, vectors, batch)
+                elapsed = time.perf_counter() - start
+                stage_seconds["upsert"] += elapsed
+                indexed += len(batch)
+                if self._source_ids:
+                    for document in batch:
+                        source_id = document.metadata.get("source_id")
+                        self._source_chunks[source_id] += 1
+                        self._source_chars[source_id] += len(document.page_content)
+                self.logger.debug(
+                    "Lote de vetores gravado",
+                    chunks=len(batch),
+                    seconds=round(elapsed, 2),
+                    total=indexed,
+                )
 
-            return vectorstore
+        self.logger.info(
+            "Indexando documentos no Supabase",
+            action="LOADING",
+            table=self.settings.supabase_table_name,
+            files=len(supported_files),
+        )
 
+        tasks = [
+            asyncio.create_task(stage())
+            for stage in (load_stage, split_stage, embed_stage, upsert_stage)
+        ]
+        try:
+            await asyncio.gather(*tasks)
         except Exception as e:
+            for task in tasks:
+                task.cancel()
             self.logger.error(
-                "Falha ao criar vector store",
+                "Falha no pipeline de indexação",
                 action="ERROR",
                 exc_info=True,
             )
             raise VectorStoreError(
                 "Falha ao indexar documentos no Supabase",
-                operation="create_vectorstore",
+                operation="index_pipeline",
                 original_error=e,
             ) from e
+        finally:
+            if self._copy_conn is not None:
+                self._copy_conn.close()
+                self._copy_conn = None
 
-    async def run(self) -> None:
-        """Executa o pipeline completo de indexação."""
-        print("\n" + "=" * 60)
-        print("🚀 INDEXAÇÃO DE DOCUMENTOS - RAG")
-        print("=" * 60 + "\n")
+        if indexed == 0 and load_errors:
+            error_summary = "\n".join(load_errors)
+            raise DocumentLoadError(
+                f"Falha ao carregar qualquer documento. Erros:\n{error_summary}"
+            )
+
+        self.logger.info(
+            "Vetores indexados com sucesso",
+            action="SUCCESS",
+            vectors=indexed,
+            files_failed=len(load_errors),
+            **{f"{stage}_seconds": round(sec, 2) for stage, sec in stage_seconds.items()},
+        )
+
+        return indexed
+
+    def _start_changed_files(self, files: list[Path]) -> list[Path]:
+        """Registra no controle de documentos os arquivos novos ou alterados.
+
+        Arquivos cujo hash SHA-256 já foi processado são ignorados. Para os
+        demais, remove chunks deixados por uma tentativa anterior do mesmo
+        ``source_id`` e guarda o ``source_id`` da nova versão e as versões
+        ativas anteriores do mesmo caminho, que serão substituídas.
+
+        Returns:
+            Arquivos que precisam ser indexados
+        """
+        changed = []
+        for file_path in files:
+            file_hash = self.doc_control.calculate_file_hash(file_path)
+            if self.doc_control.is_document_processed(file_hash):
+                self.logger.info(
+                    f"Arquivo sem alterações, ignorado: {file_path.name}",
+                    action="LOADING",
+                    file=str(file_path),
+                )
+                continue
+
+            previous = self.doc_control.get_active_source_ids(file_path)
+            source_id = self.doc_control.start_processing(file_path, file_hash)
+            # O mesmo hash reaproveita o source_id: chunks de uma tentativa
+            # anterior que falhou no meio seriam duplicados pela nova
+            self.doc_control.delete_chunks(source_id)
+            self._source_ids[str(file_path)] = source_id
+            self._replaced_sources[source_id] = [
+                old_id for old_id in previous if old_id != source_id
+            ]
+            changed.append(file_path)
+
+        return changed
+
+    def _finish_changed_files(self, duration_ms: int) -> None:
+        """Conclui (ou marca como falha) cada arquivo indexado na execução.
+
+        Versões anteriores de um arquivo só são desativadas (e seus chunks
+        removidos) depois que a nova versão foi gravada por completo.
+        """
+        for path, source_id in self._source_ids.items():
+            error = self._load_failures.get(path)
+            if error is not None:
+                self.doc_control.fail_processing(source_id, error)
+                continue
+
+            self.doc_control.complete_processing(
+                source_id,
+                chunks_created=self._source_chunks[source_id],
+                total_tokens=self._source_chars[source_id] // CHARS_PER_TOKEN,
+                processing_duration_ms=duration_ms,
+            )
+            for old_id in self._replaced_sources.get(source_id, []):
+                self.doc_control.deactivate_document(old_id)
+
+    async def index_changed_files(self, files: Optional[list[Path]] = None) -> int:
+        """Indexa só os arquivos novos ou alterados desde a última execução.
+
+        Usa o controle de documentos (``document_sources``): arquivos com
+        hash já processado são pulados; os demais passam pelo
+        ``index_pipeline`` com ``source_id`` em cada chunk e, ao final, a
+        versão anterior do mesmo arquivo é desativada.
+
+        Args:
+            files: Arquivos a considerar (padrão: todos os suportados em data_dir)
+
+        Returns:
+            Número de vetores gravados
+
+        Raises:
+            DocumentLoadError: Se nenhum documento puder ser carregado
+            VectorStoreError: Se a geração de embeddings ou a gravação falhar
+            SupabaseError: Se o controle de documentos falhar
+        """
+        files = files if files is not None else self._find_supported_files()
+
+        self._source_ids.clear()
+        self._replaced_sources.clear()
+        self._source_chunks.clear()
+        self._source_chars.clear()
+        self._load_failures.clear()
 
         try:
-            # Carrega documentos
-            documents = self.load_documents()
+            changed = await asyncio.to_thread(self._start_changed_files, files)
+            if not changed:
+                self.logger.info(
+                    "Nenhum arquivo novo ou alterado para indexar",
+                    action="SUCCESS",
+                    files=len(files),
+                )
+                return 0
+
+            start = time.perf_counter()
+            try:
+                indexed = await self.index_pipeline(changed)
+            except Exception as e:
+                for source_id in self._source_ids.values():
+                    await asyncio.to_thread(
+                        self.doc_control.fail_processing, source_id, str(e)
+                    )
+                raise
 
-            # Divide em chunks
-            chunks = self.split_documents(documents)
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            await asyncio.to_thread(self._finish_changed_files, duration_ms)
+            return indexed
+        finally:
+            self._source_ids.clear()
 
-            # Indexa documentos
-            await self.index_documents(chunks)
+    async def run(self) -> None:
+        """Executa o pipeline completo de indexação."""
+        self.logger.info("Indexação de documentos - RAG", action="STARTUP")
 
-            # Resumo de sucesso
-            print("\n" + "=" * 60)
-            print("✅ INDEXAÇÃO COMPLETA!")
-            print("=" * 60)
-            print(f"📊 Total de vetores: {len(chunks)}")
-            print(f"📁 Localização: Supabase (tabela '{self.settings.supabase_table_name}')")
-            print("\n💡 Próximo passo: Execute 'python bot.py' para iniciar o bot")
-            print("=" * 60 + "\n")
+        try:
+            # Carrega, divide, gera embeddings e grava em pipeline os
+            # arquivos novos ou alterados
+            total_vectors = await self.index_changed_files()
+
+            self.logger.info(
+                "Indexação completa. Próximo passo: python bot.py",
+                action="SUCCESS",
+                vectors=total_vectors,
+                table=self.settings.supabase_table_name,
+            )
 
         except DocumentLoadError as e:
-            print(f"\n❌ Erro ao Carregar Documentos: {e}\n")
+            self.logger.error(f"Erro ao carregar documentos: {e}", action="ERROR")
             sys.exit(1)
 
         except VectorStoreError as e:
-            print(f"\n❌ Erro no Vector Store: {e}\n")
+            self.logger.error(f"Erro no vector store: {e}", action="ERROR")
             sys.exit(1)
 
         except Exception as e:
-            print(f"\n❌ Erro Inesperado: {e}\n")
-            import traceback
-
-            traceback.print_exc()
+            self.logger.error(f"Erro inesperado: {e}", action="ERROR", exc_info=True)
             sys.exit(1)
 
 
@@ -353,6 +844,10 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    import asyncio
-
-    asyncio.run(main())
+    # uvloop (libuv) agenda as corrotinas do pipeline com menos overhead
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -0,0 +1,30 @@
+-- ============================================================================
+-- Knowledge Base Chunk Counts
+-- ============================================================================
+-- Função RPC para contar chunks de vários documentos em uma única chamada
+-- (usada pelo batch_ingest.py ao montar o relatório de ingestão)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION count_kb_chunks_per_document(
+  p_document_ids uuid[]
+)
+RETURNS TABLE (
+  document_id uuid,
+  chunk_count bigint
+)
+LANGUAGE sql STABLE
+AS $$
+  SELECT
+    c.document_id,
+    COUNT(*) AS chunk_count
+  FROM kb_chunks c
+  WHERE c.document_id = ANY(p_document_ids)
+  GROUP BY c.document_id;
+$$;
+
+-- Índice para agregações por documento
+CREATE INDEX IF NOT EXISTS idx_kb_chunks_document_id
+ON kb_chunks(document_id);
+
+-- Comentários para documentação
+COMMENT ON FUNCTION count_kb_chunks_per_document IS 'Conta chunks agrupados por documento para uma lista de IDs';
@@ -0,0 +1,49 @@
+-- ============================================================================
+-- Knowledge Base Bulk Chunk Insert
+-- ============================================================================
+-- Função RPC para inserir todos os chunks de um documento em uma única
+-- chamada (usada pelo ingest_pdf.py no lugar de um INSERT REST por lote)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION bulk_insert_kb_chunks(
+  p_rows jsonb
+)
+RETURNS integer
+LANGUAGE sql
+AS $$
+  WITH inserted AS (
+    INSERT INTO kb_chunks (
+      document_id,
+      chunk_index,
+      content,
+      token_count,
+      embedding,
+      metadata
+    )
+    SELECT
+      r.document_id,
+      r.chunk_index,
+      r.content,
+      r.token_count,
+      -- Aceita o literal pgvector como string ("[x,y,...]") ou um array JSON,
+      -- que tem o mesmo formato textual
+      CASE jsonb_typeof(r.embedding)
+        WHEN 'string' THEN (r.embedding #>> '{}')::vector
+        ELSE r.embedding::text::vector
+      END,
+      COALESCE(r.metadata, '{}'::jsonb)
+    FROM jsonb_to_recordset(p_rows) AS r(
+      document_id uuid,
+      chunk_index int,
+      content text,
+      token_count int,
+      embedding jsonb,
+      metadata jsonb
+    )
+    RETURNING 1
+  )
+  SELECT COUNT(*)::integer FROM inserted;
+$$;
+
+-- Comentários para documentação
+COMMENT ON FUNCTION bulk_insert_kb_chunks IS 'Insere em lote chunks (com embedding) recebidos como array JSONB';
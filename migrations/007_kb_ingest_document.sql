@@ -0,0 +1,97 @@
+-- ============================================================================
+-- Knowledge Base Single-Call Document Ingestion
+-- ============================================================================
+-- Função RPC que grava documento + chunks em uma única transação: cria ou
+-- reaproveita o documento (collection_id, external_id), troca os chunks e
+-- marca como indexado (usada pelo ingest_pdf.py)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION ingest_kb_document(
+  p_collection_id uuid,
+  p_external_id text,
+  p_title text,
+  p_doc_type text,
+  p_content_hash text,
+  p_metadata jsonb,
+  p_embedding_model text,
+  p_chunks jsonb
+)
+RETURNS uuid
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_document_id uuid;
+  v_total_chunks integer;
+BEGIN
+  -- Documento existente mantém título e metadata; só é desmarcado
+  INSERT INTO kb_documents (
+    collection_id,
+    title,
+    doc_type,
+    external_id,
+    content_hash,
+    metadata,
+    is_active,
+    is_indexed
+  )
+  VALUES (
+    p_collection_id,
+    p_title,
+    p_doc_type,
+    p_external_id,
+    p_content_hash,
+    COALESCE(p_metadata, '{}'::jsonb),
+    true,
+    false
+  )
+  ON CONFLICT (collection_id, external_id)
+  DO UPDATE SET is_indexed = false
+  RETURNING id INTO v_document_id;
+
+  DELETE FROM kb_chunks WHERE document_id = v_document_id;
+
+  INSERT INTO kb_chunks (
+    document_id,
+    chunk_index,
+    content,
+    token_count,
+    embedding,
+    metadata
+  )
+  SELECT
+    v_document_id,
+    r.chunk_index,
+    r.content,
+    r.token_count,
+    CASE jsonb_typeof(r.embedding)
+      WHEN 'string' THEN (r.embedding #>> '{}')::vector
+      ELSE r.embedding::text::vector
+    END,
+    COALESCE(r.metadata, '{}'::jsonb)
+  FROM jsonb_to_recordset(p_chunks) AS r(
+    chunk_index int,
+    content text,
+    token_count int,
+    embedding jsonb,
+    metadata jsonb
+  );
+
+  GET DIAGNOSTICS v_total_chunks = ROW_COUNT;
+
+  UPDATE kb_documents
+  SET
+    is_indexed = true,
+    content_hash = p_content_hash,
+    indexed_at = now(),
+    metadata = COALESCE(metadata, '{}'::jsonb) || jsonb_build_object(
+      'total_chunks', v_total_chunks,
+      'embedding_model', p_embedding_model
+    )
+  WHERE id = v_document_id;
+
+  RETURN v_document_id;
+END;
+$$;
+
+-- Comentários para documentação
+COMMENT ON FUNCTION ingest_kb_document IS 'Grava documento e chunks (com embedding) em uma única transação e marca como indexado';
@@ -0,0 +1,42 @@
+-- ============================================================================
+-- Knowledge Base Chunk Content Hash
+-- ============================================================================
+-- Hash (md5) do conteúdo de cada chunk, calculado pelo banco, e função RPC
+-- que devolve embeddings já gravados para uma lista de hashes: o
+-- ingest_pdf.py só pede à OpenAI embeddings de conteúdo inédito (cabeçalhos,
+-- rodapés e artigos repetidos entre documentos são reaproveitados).
+-- Obs.: adicionar a coluna gerada reescreve a tabela kb_chunks.
+-- ============================================================================
+
+ALTER TABLE kb_chunks
+ADD COLUMN IF NOT EXISTS content_hash text
+GENERATED ALWAYS AS (md5(content)) STORED;
+
+-- Não é único: o mesmo conteúdo continua tendo uma linha por documento
+CREATE INDEX IF NOT EXISTS idx_kb_chunks_content_hash
+ON kb_chunks(content_hash);
+
+CREATE OR REPLACE FUNCTION find_kb_chunk_embeddings(
+  p_content_hashes text[],
+  p_embedding_model text
+)
+RETURNS TABLE (
+  content_hash text,
+  embedding text
+)
+LANGUAGE sql STABLE
+AS $$
+  -- Só documentos indexados com o mesmo modelo de embedding
+  SELECT DISTINCT ON (c.content_hash)
+    c.content_hash,
+    c.embedding::text AS embedding
+  FROM kb_chunks c
+  JOIN kb_documents d ON d.id = c.document_id
+  WHERE c.content_hash = ANY(p_content_hashes)
+    AND d.is_indexed
+    AND d.metadata->>'embedding_model' = p_embedding_model
+  ORDER BY c.content_hash;
+$$;
+
+-- Comentários para documentação
+COMMENT ON FUNCTION find_kb_chunk_embeddings IS 'Retorna um embedding já gravado por hash de conteúdo (md5) para o modelo informado';
@@ -0,0 +1,103 @@
+-- ============================================================================
+-- Half-Precision Vector Indexes
+-- ============================================================================
+-- Índices vetoriais sobre embedding::halfvec (float16, pgvector >= 0.7):
+-- metade do tamanho dos índices float32, com recall praticamente igual.
+-- As colunas continuam vector(1536): a busca ordena pela distância em
+-- halfvec (usando o índice) e a similaridade devolvida é calculada com o
+-- vetor completo. Inserções (LangChain, REST e RPCs) não mudam.
+-- Obs.: com EMBEDDING_DIMENSIONS, troque 1536 pela dimensão usada.
+-- ============================================================================
+
+-- documents (LangChain / match_documents)
+DROP INDEX IF EXISTS documents_embedding_idx;
+
+CREATE INDEX IF NOT EXISTS documents_embedding_halfvec_idx
+ON documents
+USING ivfflat ((embedding::halfvec(1536)) halfvec_cosine_ops)
+WITH (lists = 100);
+
+CREATE OR REPLACE FUNCTION match_documents (
+    query_embedding vector(1536),
+    match_count INT DEFAULT 5,
+    filter JSONB DEFAULT '{}'::jsonb
+)
+RETURNS TABLE (
+    id BIGINT,
+    content TEXT,
+    metadata JSONB,
+    document_id UUID,
+    source_name TEXT,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        documents.id,
+        documents.content,
+        documents.metadata,
+        documents.document_id,
+        documents.source_name,
+        1 - (documents.embedding <=> query_embedding) AS similarity
+    FROM documents
+    WHERE (metadata @> filter) OR (filter = '{}'::jsonb)
+    ORDER BY documents.embedding::halfvec(1536) <=> query_embedding::halfvec(1536)
+    LIMIT match_count;
+END;
+$$;
+
+-- kb_chunks (match_kb_chunks)
+DROP INDEX IF EXISTS idx_kb_chunks_embedding_ivfflat;
+
+CREATE INDEX IF NOT EXISTS idx_kb_chunks_embedding_halfvec
+ON kb_chunks
+USING ivfflat ((embedding::halfvec(1536)) halfvec_cosine_ops)
+WITH (lists = 100);
+
+CREATE OR REPLACE FUNCTION match_kb_chunks(
+  query_embedding vector(1536),
+  match_threshold float DEFAULT 0.7,
+  match_count int DEFAULT 5,
+  filter_collection_id uuid DEFAULT NULL
+)
+RETURNS TABLE (
+  chunk_id uuid,
+  document_id uuid,
+  document_title text,
+  collection_name text,
+  collection_id uuid,
+  content text,
+  chunk_index int,
+  similarity float,
+  doc_metadata jsonb
+)
+LANGUAGE sql STABLE
+AS $$
+  SELECT
+    c.id AS chunk_id,
+    c.document_id,
+    d.title AS document_title,
+    coll.name AS collection_name,
+    coll.id AS collection_id,
+    c.content,
+    c.chunk_index,
+    1 - (c.embedding <=> query_embedding) AS similarity,
+    d.metadata AS doc_metadata
+  FROM kb_chunks c
+  JOIN kb_documents d ON c.document_id = d.id
+  JOIN kb_collections coll ON d.collection_id = coll.id
+  WHERE
+    d.is_active = true
+    AND d.is_indexed = true
+    AND (filter_collection_id IS NULL OR coll.id = filter_collection_id)
+    AND 1 - (c.embedding <=> query_embedding) > match_threshold
+  ORDER BY c.embedding::halfvec(1536) <=> query_embedding::halfvec(1536)
+  LIMIT match_count;
+$$;
+
+-- Comentários para documentação
+COMMENT ON INDEX documents_embedding_halfvec_idx IS 'Índice IVFFlat float16 para busca vetorial em documents';
+COMMENT ON INDEX idx_kb_chunks_embedding_halfvec IS 'Índice IVFFlat float16 para busca vetorial em kb_chunks';
+COMMENT ON FUNCTION match_kb_chunks IS 'Busca vetorial por similaridade nos chunks da base de conhecimento (índice halfvec)';
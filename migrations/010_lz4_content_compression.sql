@@ -0,0 +1,16 @@
+-- ============================================================================
+-- LZ4 Compression for Chunk Content
+-- ============================================================================
+-- Troca a compressão TOAST do texto dos chunks de pglz para lz4 (PostgreSQL
+-- 14+): compressão e leitura bem mais rápidas com taxa semelhante. Linhas
+-- com embedding de 1536 dimensões já passam do limite do TOAST, então o
+-- conteúdo é comprimido no banco sem mudar o formato da coluna (busca,
+-- content_hash e LangChain continuam lendo texto puro).
+-- Só vale para linhas novas ou reescritas; reindexar aplica aos antigos.
+-- ============================================================================
+
+ALTER TABLE kb_chunks
+ALTER COLUMN content SET COMPRESSION lz4;
+
+ALTER TABLE documents
+ALTER COLUMN content SET COMPRESSION lz4;
@@ -0,0 +1,39 @@
+-- ============================================================================
+-- Knowledge Base Collection Document Counts
+-- ============================================================================
+-- Função RPC que lista as coleções com a contagem de documentos ativos em
+-- uma única consulta agrupada (usada pelo /admin_list_collections, que antes
+-- fazia uma consulta de contagem por coleção)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION list_kb_collections_with_counts()
+RETURNS TABLE (
+  id uuid,
+  name text,
+  description text,
+  created_at timestamptz,
+  doc_count bigint
+)
+LANGUAGE sql STABLE
+AS $$
+  SELECT
+    coll.id,
+    coll.name,
+    coll.description,
+    coll.created_at,
+    COUNT(d.id) AS doc_count
+  FROM kb_collections coll
+  LEFT JOIN kb_documents d
+    ON d.collection_id = coll.id
+   AND d.is_active = true
+  GROUP BY coll.id
+  ORDER BY coll.created_at DESC;
+$$;
+
+-- Índice para a contagem de documentos ativos por coleção
+CREATE INDEX IF NOT EXISTS idx_kb_documents_collection_active
+ON kb_documents(collection_id)
+WHERE is_active = true;
+
+-- Comentários para documentação
+COMMENT ON FUNCTION list_kb_collections_with_counts IS 'Lista coleções com a contagem de documentos ativos de cada uma';
@@ -0,0 +1,60 @@
+-- ============================================================================
+-- Knowledge Base Collection Stats
+-- ============================================================================
+-- Função RPC que calcula as estatísticas de uma coleção no banco e devolve
+-- um único JSON (usada pelo /admin_stats, que antes baixava todos os
+-- documentos e chunks para agregar em Python)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION kb_collection_stats(
+  p_collection_name text
+)
+RETURNS json
+LANGUAGE sql STABLE
+AS $$
+  WITH coll AS (
+    SELECT id, name, description
+    FROM kb_collections
+    WHERE name = p_collection_name
+    LIMIT 1
+  ),
+  docs AS (
+    SELECT
+      d.id,
+      d.title,
+      COALESCE(d.is_active, false) AS is_active,
+      COALESCE(d.is_indexed, false) AS is_indexed,
+      COUNT(c.id) AS chunk_count,
+      COALESCE(SUM(c.token_count), 0) AS token_count
+    FROM coll
+    JOIN kb_documents d ON d.collection_id = coll.id
+    LEFT JOIN kb_chunks c ON c.document_id = d.id
+    GROUP BY d.id
+  )
+  SELECT json_build_object(
+    'id', coll.id,
+    'name', coll.name,
+    'description', coll.description,
+    'doc_count', (SELECT COUNT(*) FROM docs),
+    'active_count', (SELECT COUNT(*) FROM docs WHERE is_active),
+    'indexed_count', (SELECT COUNT(*) FROM docs WHERE is_indexed),
+    'total_chunks', (SELECT COALESCE(SUM(chunk_count), 0) FROM docs),
+    'total_tokens', (SELECT COALESCE(SUM(token_count), 0) FROM docs),
+    'top_docs', COALESCE(
+      (
+        SELECT json_agg(t)
+        FROM (
+          SELECT title, chunk_count AS chunks, is_indexed AS indexed
+          FROM docs
+          ORDER BY chunk_count DESC
+          LIMIT 10
+        ) t
+      ),
+      '[]'::json
+    )
+  )
+  FROM coll;
+$$;
+
+-- Comentários para documentação
+COMMENT ON FUNCTION kb_collection_stats IS 'Estatísticas agregadas de uma coleção (documentos, chunks, tokens e top 10 documentos) em um JSON; NULL se a coleção não existir';
@@ -0,0 +1,41 @@
+-- ============================================================================
+-- HNSW Vector Indexes
+-- ============================================================================
+-- Troca os índices IVFFlat (halfvec) da migração 009 por HNSW: a latência
+-- da busca não depende de "lists"/"probes" calibrados para o tamanho da
+-- tabela e o recall não cai conforme o corpus cresce sem REINDEX.
+-- As funções de busca fixam hnsw.ef_search = 100 na própria definição,
+-- valendo para qualquer sessão (REST/RPC). O padrão do pgvector (40) é só
+-- 2x o maior k do bot (K_DOCUMENTS <= 20) e o HNSW aplica os filtros
+-- (metadata/collection_id) depois da busca, descartando candidatos; 100
+-- mantém o recall alto com m = 16 / ef_construction = 64 a um custo de
+-- latência pequeno.
+-- Obs.: com EMBEDDING_DIMENSIONS, troque 1536 pela dimensão usada.
+-- Obs.: em tabelas grandes, aumente maintenance_work_mem antes de rodar.
+-- ============================================================================
+
+-- documents (LangChain / match_documents)
+DROP INDEX IF EXISTS documents_embedding_halfvec_idx;
+
+CREATE INDEX IF NOT EXISTS documents_embedding_hnsw_idx
+ON documents
+USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
+WITH (m = 16, ef_construction = 64);
+
+ALTER FUNCTION match_documents(vector, INT, JSONB)
+SET hnsw.ef_search = 100;
+
+-- kb_chunks (match_kb_chunks)
+DROP INDEX IF EXISTS idx_kb_chunks_embedding_halfvec;
+
+CREATE INDEX IF NOT EXISTS idx_kb_chunks_embedding_hnsw
+ON kb_chunks
+USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
+WITH (m = 16, ef_construction = 64);
+
+ALTER FUNCTION match_kb_chunks(vector, float, int, uuid)
+SET hnsw.ef_search = 100;
+
+-- Comentários para documentação
+COMMENT ON INDEX documents_embedding_hnsw_idx IS 'Índice HNSW float16 para busca vetorial em documents';
+COMMENT ON INDEX idx_kb_chunks_embedding_hnsw IS 'Índice HNSW float16 para busca vetorial em kb_chunks';
@@ -0,0 +1,28 @@
+-- ============================================================================
+-- Knowledge Base Chunk Stats Covering Index
+-- ============================================================================
+-- Índice coberto para as contagens do kb_collection_stats (migração 012):
+-- com token_count no índice, COUNT(c.id) e SUM(c.token_count) por documento
+-- saem de um index-only scan, sem visitar as linhas (e seus embeddings) na
+-- tabela. A contagem continua exata.
+-- Obs.: o index-only scan só evita a tabela nas páginas marcadas como
+-- all-visible no visibility map, que só o VACUUM atualiza. Depois de
+-- aplicar esta migração (e de cargas grandes), rode fora de transação:
+--     VACUUM (ANALYZE) kb_chunks;
+-- (o SQL Editor do Supabase executa o script em uma transação, por isso o
+-- VACUUM não faz parte dele; o autovacuum também acaba marcando as páginas)
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_kb_chunks_document_id_token_count
+ON kb_chunks(document_id)
+INCLUDE (id, token_count);
+
+-- O índice simples da migração 005 fica redundante
+DROP INDEX IF EXISTS idx_kb_chunks_document_id;
+
+-- Estatísticas para o planejador escolher o novo índice (o visibility map
+-- depende do VACUUM, ver cabeçalho)
+ANALYZE kb_chunks;
+
+-- Comentários para documentação
+COMMENT ON INDEX idx_kb_chunks_document_id_token_count IS 'Contagem de chunks e soma de tokens por documento via index-only scan';
@@ -91,6 +91,15 @@ DROP FUNCTION IF EXISTS reset_rate_limit_if_expired(VARCHAR);
 DROP FUNCTION IF EXISTS clean_expired_cache();
 DROP FUNCTION IF EXISTS match_documents(vector, INT, JSONB);
 
+-- Vector indexes from 009 (IVFFlat halfvec) and 013 (HNSW halfvec) only
+-- serve the halfvec ordering of the match_documents dropped above; put back
+-- the plain IVFFlat index on the kept documents table
+DROP INDEX IF EXISTS documents_embedding_hnsw_idx;
+DROP INDEX IF EXISTS documents_embedding_halfvec_idx;
+CREATE INDEX IF NOT EXISTS documents_embedding_idx ON documents
+  USING ivfflat (embedding vector_cosine_ops)
+  WITH (lists = 100);
+
 -- ============================================================================
 -- STEP 5: Drop Triggers
 -- ============================================================================
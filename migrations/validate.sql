@@ -68,7 +68,6 @@ END $$;
 DO $$
 DECLARE
     expected_indexes TEXT[] := ARRAY[
-        'documents_embedding_idx',
         'documents_document_id_idx',
         'documents_source_name_idx',
         'query_history_user_id_idx',
@@ -97,6 +96,43 @@ BEGIN
     END LOOP;
 END $$;
 
+-- Vector indexes: the name depends on the last index migration applied
+-- (001: IVFFlat, 009: IVFFlat halfvec, 013: HNSW halfvec)
+DO $$
+DECLARE
+    rec RECORD;
+    found_index TEXT;
+BEGIN
+    FOR rec IN
+        SELECT * FROM (VALUES
+            ('documents', ARRAY['documents_embedding_hnsw_idx', 'documents_embedding_halfvec_idx', 'documents_embedding_idx']),
+            ('kb_chunks', ARRAY['idx_kb_chunks_embedding_hnsw', 'idx_kb_chunks_embedding_halfvec', 'idx_kb_chunks_embedding_ivfflat'])
+        ) AS v(table_name, index_names)
+    LOOP
+        -- kb_chunks only exists once the knowledge base tables are created
+        CONTINUE WHEN NOT EXISTS (
+            SELECT 1 FROM pg_tables
+            WHERE schemaname = 'public' AND tablename = rec.table_name
+        );
+
+        SELECT indexname INTO found_index
+        FROM pg_indexes
+        WHERE schemaname = 'public'
+          AND tablename = rec.table_name
+          AND indexname = ANY (rec.index_names)
+        ORDER BY array_position(rec.index_names, indexname::TEXT)
+        LIMIT 1;
+
+        IF found_index IS NOT NULL THEN
+            INSERT INTO validation_results (test_category, test_name, status, message)
+            VALUES ('Indexes', 'Vector index: ' || rec.table_name, 'PASS', 'Index exists: ' || found_index);
+        ELSE
+            INSERT INTO validation_results (test_category, test_name, status, message)
+            VALUES ('Indexes', 'Vector index: ' || rec.table_name, 'FAIL', 'No vector index on embedding');
+        END IF;
+    END LOOP;
+END $$;
+
 -- ============================================================================
 -- TEST 3: Function Existence
 -- ============================================================================
@@ -5,14 +5,18 @@ through a web interface.
 """
 
 from datetime import datetime
+import hashlib
+import os
 from pathlib import Path
+import re
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
+from starlette.types import Scope
 
 from src.config import FilterLevel, get_settings
 from src.logging_config import get_logger
@@ -108,10 +112,26 @@ async def startup_event() -> None:
         logger.error("Failed to load vector store", action="ERROR", exc_info=True)
 
 
+# Web interface page, read once and served from memory
+INDEX_HTML_PATH = Path("web/index.html")
+INDEX_HTML: Optional[bytes] = (
+    INDEX_HTML_PATH.read_bytes() if INDEX_HTML_PATH.exists() else None
+)
+INDEX_ETAG: Optional[str] = (
+    f'"{hashlib.md5(INDEX_HTML).hexdigest()}"' if INDEX_HTML is not None else None
+)
+
+
 @app.get("/")
-async def root() -> FileResponse:
+async def root(request: Request) -> Response:
     """Serve the web interface."""
-    return FileResponse("web/index.html")
+    if INDEX_HTML is None:
+        raise HTTPException(status_code=404, detail=f"{INDEX_HTML_PATH} not found")
+
+    headers = {"Cache-Control": "public, max-age=300", "ETag": INDEX_ETAG}
+    if request.headers.get("if-none-match") == INDEX_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(INDEX_HTML, media_type="text/html", headers=headers)
 
 
 @app.get("/api/health")
@@ -213,23 +233,51 @@ async def process_query(request: QueryRequestModel) -> QueryResponseModel:
 # Static Files
 # ============================================================================
 
+# Fingerprinted asset names, e.g. terminal.3f2a9c1b.js
+HASHED_ASSET_PATTERN = re.compile(r"\.[0-9a-f]{8,}\.\w+$")
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that adds Cache-Control to every file response.
+
+    Fingerprinted files are cached as immutable for a day; anything else for
+    an hour, then revalidated through the ETag/Last-Modified headers that
+    StaticFiles already sends.
+    """
+
+    def file_response(
+        self,
+        full_path: "os.PathLike[str] | str",
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        """Build the file response with its Cache-Control header."""
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if HASHED_ASSET_PATTERN.search(str(full_path)):
+            response.headers["Cache-Control"] = "public, max-age=86400, immutable"
+        else:
+            response.headers["Cache-Control"] = "public, max-age=3600"
+        return response
+
+
 # Mount static files with existence checks
 css_dir = Path("web/css")
 js_dir = Path("web/js")
 assets_dir = Path("web/assets")
 
 if css_dir.exists():
-    app.mount("/css", StaticFiles(directory=str(css_dir)), name="css")
+    app.mount("/css", CachedStaticFiles(directory=str(css_dir)), name="css")
 else:
     logger.warning(f"CSS directory not found: {css_dir}")
 
 if js_dir.exists():
-    app.mount("/js", StaticFiles(directory=str(js_dir)), name="js")
+    app.mount("/js", CachedStaticFiles(directory=str(js_dir)), name="js")
 else:
     logger.warning(f"JS directory not found: {js_dir}")
 
 if assets_dir.exists():
-    app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
+    app.mount("/assets", CachedStaticFiles(directory=str(assets_dir)), name="assets")
 else:
     logger.warning(f"Assets directory not found: {assets_dir}")
 
@@ -239,12 +287,17 @@ else:
 # ============================================================================
 
 
-def run_api_server(host: str = "0.0.0.0", port: int = 8000) -> None:
+def run_api_server(
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    reload: bool = False,
+) -> None:
     """Run the API server.
 
     Args:
         host: Host to bind to
         port: Port to bind to
+        reload: Restart on source changes (development only)
     """
     import uvicorn
 
@@ -253,13 +306,14 @@ def run_api_server(host: str = "0.0.0.0", port: int = 8000) -> None:
         action="STARTUP",
         host=host,
         port=port,
+        reload=reload,
     )
 
     uvicorn.run(
         "src.api:app",
         host=host,
         port=port,
-        reload=True,
+        reload=reload,
         log_level="info",
     )
 
@@ -3,29 +3,38 @@ Admin Commands for Knowledge Base Management
 Comandos administrativos para gerenciar a base de conhecimento.
 """
 
+import asyncio
+import os
+
 import discord
 from discord import app_commands
 from discord.ext import commands
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from datetime import datetime
-from postgrest import CountMethod
+from functools import lru_cache
+from postgrest import CountMethod, ReturnMethod
 
 from src.config import get_settings
-from src.logging_config import get_logger
+
+if TYPE_CHECKING:
+    from src.bot.client import DiscordRAGBot
 
 
 # Lista de IDs de usuários admin
-def get_admin_user_ids() -> set[int]:
+@lru_cache(maxsize=1)
+def get_admin_user_ids() -> frozenset[int]:
     """Obtém lista de IDs de usuários admin.
 
-    Lê a configuração ADMIN_USER_IDS do .env e retorna como conjunto.
+    Lê a configuração ADMIN_USER_IDS do .env e retorna como conjunto. O
+    resultado é memoizado; use ``get_admin_user_ids.cache_clear()`` após
+    recarregar as configurações.
 
     Returns:
         Conjunto de IDs de usuários Discord com permissões admin.
         Retorna conjunto vazio se nenhum admin estiver configurado.
     """
     settings = get_settings()
-    return set(settings.admin_user_ids)
+    return frozenset(settings.admin_user_ids)
 
 
 def is_admin(user_id: int) -> bool:
@@ -40,24 +49,38 @@ def is_admin(user_id: int) -> bool:
     return user_id in get_admin_user_ids()
 
 
-async def check_admin_permission(interaction: discord.Interaction) -> bool:
-    """Verifica permissão de admin antes de executar comando.
+def uuid_prefix_range(prefix: str) -> Optional[tuple[str, str]]:
+    """Converte o prefixo de um UUID no intervalo de UUIDs que o começam.
 
-    Envia mensagem de erro efêmera ao usuário se não tiver permissão.
+    Permite buscar por prefixo com ``id >= menor AND id <= maior``, que usa o
+    índice B-tree da chave primária, em vez de ``id::text LIKE 'prefixo%'``.
 
     Args:
-        interaction: Interação Discord do comando
+        prefix: Início do UUID (hífens opcionais)
 
     Returns:
-        True se usuário tem permissão admin, False caso contrário.
+        Tupla (menor, maior) UUID do intervalo, ou None se o prefixo não for
+        hexadecimal válido.
     """
-    if not is_admin(interaction.user.id):
-        await interaction.response.send_message(
-            "❌ Você não tem permissão para usar este comando.",
-            ephemeral=True
-        )
-        return False
-    return True
+    digits = prefix.replace("-", "").lower()
+    if not digits or len(digits) > 32 or any(c not in "0123456789abcdef" for c in digits):
+        return None
+
+    def as_uuid(hex32: str) -> str:
+        return f"{hex32[:8]}-{hex32[8:12]}-{hex32[12:16]}-{hex32[16:20]}-{hex32[20:]}"
+
+    return as_uuid(digits.ljust(32, "0")), as_uuid(digits.ljust(32, "f"))
+
+
+def _interaction_is_admin(interaction: discord.Interaction) -> bool:
+    """Predicado do ``admin_only``: o autor da interação é admin?"""
+    return interaction.user.id in get_admin_user_ids()
+
+
+# Restringe um comando a admins. A verificação roda no pipeline de checks do
+# discord.py, antes do comando; a negação é respondida em
+# AdminCommands.cog_app_command_error
+admin_only = app_commands.check(_interaction_is_admin)
 
 
 class AdminCommands(commands.Cog):
@@ -67,20 +90,60 @@ class AdminCommands(commands.Cog):
     incluindo listagem de coleções, estatísticas e reindexação.
     """
 
-    def __init__(self, bot: commands.Bot):
+    def __init__(self, bot: "DiscordRAGBot"):
         """Inicializa o cog de comandos administrativos.
 
+        Reaproveita as configurações, o logger e o SupabaseService do bot,
+        em vez de criar outros.
+
         Args:
-            bot: Instância do bot Discord
+            bot: Instância do DiscordRAGBot
         """
         self.bot = bot
-        self.settings = get_settings()
-        self.logger = get_logger()
+        self.settings = bot.settings
+        self.logger = bot.logger
+        self.supabase_service = bot.supabase_service
+
+    async def cog_app_command_error(
+        self,
+        interaction: discord.Interaction,
+        error: app_commands.AppCommandError,
+    ) -> None:
+        """Responde às chamadas barradas pelo ``admin_only``.
+
+        A negação é registrada só como aviso. Como este handler existe, a
+        árvore de comandos não registra os erros dos comandos do cog; os
+        demais erros são registrados aqui, com o traceback original.
+
+        Args:
+            interaction: Interação Discord do comando
+            error: Erro levantado pelo comando ou por seus checks
+        """
+        command_name = interaction.command.name if interaction.command else None
+
+        if isinstance(error, app_commands.CheckFailure):
+            self.logger.warning(
+                "Admin command denied",
+                action="WARNING",
+                user_id=interaction.user.id,
+                command=command_name,
+            )
+            await interaction.response.send_message(
+                "❌ Você não tem permissão para usar este comando.",
+                ephemeral=True
+            )
+            return
 
-        # Importar services
-        from src.services import SupabaseService
-        self.supabase_service = SupabaseService(settings=self.settings, logger=self.logger)
+        original = getattr(error, "original", error)
+        self.logger.error(
+            "Unhandled error in admin command",
+            action="ERROR",
+            user_id=interaction.user.id,
+            command=command_name,
+            exc_info=original,
+        )
 
+    @admin_only
     @app_commands.command(
         name="admin_list_collections",
         description="[ADMIN] Listar todas as coleções da base de conhecimento"
@@ -94,16 +157,15 @@ class AdminCommands(commands.Cog):
         Args:
             interaction: Interação Discord do comando
         """
-        if not await check_admin_permission(interaction):
-            return
-
         await interaction.response.defer(ephemeral=True)
 
         try:
-            result = self.supabase_service.client.table("kb_collections")\
-                .select("id, name, description, created_at, metadata")\
-                .order("created_at", desc=True)\
-                .execute()
+            # Contagem de documentos agrupada no banco (uma consulta no total)
+            result = await asyncio.to_thread(
+                self.supabase_service.client.rpc(
+                    "list_kb_collections_with_counts", {}
+                ).execute
+            )
 
             if not result.data:
                 await interaction.followup.send(
@@ -112,23 +174,16 @@ class AdminCommands(commands.Cog):
                 )
                 return
 
-            collections_data = []
-            for coll in result.data:
-                docs_res = self.supabase_service.client.table("kb_documents")\
-                    .select("id", count=CountMethod.exact)\
-                    .eq("collection_id", coll["id"])\
-                    .eq("is_active", True)\
-                    .execute()
-
-                doc_count = docs_res.count or 0
-
-                collections_data.append({
+            collections_data = [
+                {
                     "id": coll["id"],
                     "name": coll["name"],
-                    "description": coll.get("description", "Sem descrição"),
-                    "doc_count": doc_count,
+                    "description": coll.get("description") or "Sem descrição",
+                    "doc_count": coll.get("doc_count") or 0,
                     "created_at": coll["created_at"]
-                })
+                }
+                for coll in result.data
+            ]
 
             embed = discord.Embed(
                 title="📚 Coleções da Base de Conhecimento",
@@ -170,6 +225,7 @@ class AdminCommands(commands.Cog):
                 ephemeral=True
             )
 
+    @admin_only
     @app_commands.command(
         name="admin_stats",
         description="[ADMIN] Estatísticas de uma coleção"
@@ -189,71 +245,44 @@ class AdminCommands(commands.Cog):
             interaction: Interação Discord do comando
             colecao: Nome da coleção para exibir estatísticas
         """
-        if not await check_admin_permission(interaction):
-            return
-
         await interaction.response.defer(ephemeral=True)
 
         try:
-            coll_res = self.supabase_service.client.table("kb_collections")\
-                .select("*")\
-                .eq("name", colecao)\
-                .limit(1)\
-                .execute()
+            # Agregações feitas no banco: uma consulta, resposta de tamanho fixo
+            stats_res = await asyncio.to_thread(
+                self.supabase_service.client.rpc(
+                    "kb_collection_stats",
+                    {"p_collection_name": colecao}
+                ).execute
+            )
 
-            if not coll_res.data:
+            stats = stats_res.data
+            if not stats:
                 await interaction.followup.send(
                     f"❌ Coleção '{colecao}' não encontrada.",
                     ephemeral=True
                 )
                 return
 
-            collection = coll_res.data[0]
-            collection_id = collection["id"]
-
-            docs_res = self.supabase_service.client.table("kb_documents")\
-                .select("*")\
-                .eq("collection_id", collection_id)\
-                .execute()
-
-            documents = docs_res.data
-            active_docs = [d for d in documents if d.get("is_active", False)]
-            indexed_docs = [d for d in documents if d.get("is_indexed", False)]
-
-            # Guard against empty document list to prevent PostgreSQL error
-            if documents:
-                chunks_res = self.supabase_service.client.table("kb_chunks")\
-                    .select("id, document_id, token_count", count=CountMethod.exact)\
-                    .in_("document_id", [d["id"] for d in documents])\
-                    .execute()
-                total_chunks = chunks_res.count or 0
-                chunks_data = chunks_res.data or []
-                total_tokens = sum(chunk.get("token_count", 0) for chunk in chunks_data)
-
-                # Build document_id -> chunk count mapping to avoid N+1 queries
-                from collections import defaultdict
-                doc_chunk_counts: dict[str, int] = defaultdict(int)
-                for chunk in chunks_data:
-                    doc_chunk_counts[chunk["document_id"]] += 1
-            else:
-                total_chunks = 0
-                total_tokens = 0
-                doc_chunk_counts = {}
+            collection_id = stats["id"]
+            doc_count = stats["doc_count"]
+            total_chunks = stats["total_chunks"]
+            total_tokens = stats["total_tokens"]
 
             embedding_cost = (total_tokens / 1_000_000) * 0.02
 
             embed = discord.Embed(
-                title=f"📊 Estatísticas: {collection['name']}",
-                description=collection.get("description", "Sem descrição"),
+                title=f"📊 Estatísticas: {stats['name']}",
+                description=stats.get("description") or "Sem descrição",
                 color=discord.Color.green(),
                 timestamp=datetime.utcnow()
             )
 
             embed.add_field(
                 name="📄 Documentos",
-                value=f"**Total:** {len(documents)}\n"
-                      f"**Ativos:** {len(active_docs)}\n"
-                      f"**Indexados:** {len(indexed_docs)}",
+                value=f"**Total:** {doc_count}\n"
+                      f"**Ativos:** {stats['active_count']}\n"
+                      f"**Indexados:** {stats['indexed_count']}",
                 inline=True
             )
 
@@ -267,27 +296,15 @@ class AdminCommands(commands.Cog):
 
             embed.add_field(
                 name="📈 Médias",
-                value=f"**Chunks/doc:** {total_chunks // len(documents) if documents else 0}\n"
+                value=f"**Chunks/doc:** {total_chunks // doc_count if doc_count else 0}\n"
                       f"**Tokens/chunk:** {total_tokens // total_chunks if total_chunks else 0}",
                 inline=True
             )
 
-            if documents:
-                # Use pre-fetched chunk counts to avoid N+1 queries
-                docs_with_chunks = [
-                    {
-                        "title": doc["title"],
-                        "chunks": doc_chunk_counts.get(doc["id"], 0),
-                        "indexed": doc.get("is_indexed", False)
-                    }
-                    for doc in documents
-                ]
-
-                docs_with_chunks.sort(key=lambda x: x["chunks"], reverse=True)
-
+            if doc_count:
                 top_docs_text = "\n".join([
                     f"{'✅' if d['indexed'] else '⏳'} **{d['title'][:40]}** - {d['chunks']} chunks"
-                    for d in docs_with_chunks[:10]
+                    for d in stats["top_docs"]
                 ])
 
                 embed.add_field(
@@ -320,6 +337,7 @@ class AdminCommands(commands.Cog):
                 ephemeral=True
             )
 
+    @admin_only
     @app_commands.command(
         name="admin_reindex",
         description="[ADMIN] Forçar reindexação de um documento"
@@ -341,19 +359,23 @@ class AdminCommands(commands.Cog):
             interaction: Interação Discord do comando
             documento_id: ID do documento (primeiros 8 caracteres são suficientes)
         """
-        if not await check_admin_permission(interaction):
-            return
-
         await interaction.response.defer(ephemeral=True)
 
         try:
-            docs_res = self.supabase_service.client.table("kb_documents")\
-                .select("id, title, external_id, collection_id")\
-                .like("id", f"{documento_id}%")\
-                .limit(1)\
-                .execute()
+            id_range = uuid_prefix_range(documento_id)
+            docs_res = None
+            if id_range is not None:
+                # Intervalo na chave primária (índice B-tree), não LIKE no texto
+                docs_res = await asyncio.to_thread(
+                    self.supabase_service.client.table("kb_documents")
+                    .select("id, title, external_id, collection_id")
+                    .gte("id", id_range[0])
+                    .lte("id", id_range[1])
+                    .limit(1)
+                    .execute
+                )
 
-            if not docs_res.data:
+            if docs_res is None or not docs_res.data:
                 await interaction.followup.send(
                     f"❌ Documento com ID '{documento_id}*' não encontrado.",
                     ephemeral=True
@@ -372,7 +394,6 @@ class AdminCommands(commands.Cog):
                 )
                 return
 
-            import os
             if not os.path.exists(external_id):
                 await interaction.followup.send(
                     f"❌ Arquivo fonte não encontrado: `{external_id}`\n"
@@ -381,17 +402,24 @@ class AdminCommands(commands.Cog):
                 )
                 return
 
-            delete_res = self.supabase_service.client.table("kb_chunks")\
-                .delete()\
-                .eq("document_id", doc_id)\
-                .execute()
-
-            chunks_deleted = len(delete_res.data) if delete_res.data else 0
+            # Primeiro desmarca o documento, depois remove os chunks: se a
+            # remoção falhar, o documento continua não indexado e a ingestão
+            # o reprocessa (o inverso deixaria is_indexed=True sem chunks)
+            await asyncio.to_thread(
+                self.supabase_service.client.table("kb_documents")
+                .update({"is_indexed": False}, returning=ReturnMethod.minimal)
+                .eq("id", doc_id)
+                .execute
+            )
+            # Da remoção só volta a contagem (Content-Range), sem as linhas
+            delete_res = await asyncio.to_thread(
+                self.supabase_service.client.table("kb_chunks")
+                .delete(count=CountMethod.exact, returning=ReturnMethod.minimal)
+                .eq("document_id", doc_id)
+                .execute
+            )
 
-            self.supabase_service.client.table("kb_documents")\
-                .update({"is_indexed": False})\
-                .eq("id", doc_id)\
-                .execute()
+            chunks_deleted = delete_res.count or 0
 
             await interaction.followup.send(
                 f"🔄 Reindexação preparada para **{doc_title}**\n\n"
@@ -426,6 +454,6 @@ class AdminCommands(commands.Cog):
             )
 
 
-async def setup(bot: commands.Bot) -> None:
+async def setup(bot: "DiscordRAGBot") -> None:
     """Setup function para adicionar cog."""
     await bot.add_cog(AdminCommands(bot))
@@ -1,5 +1,6 @@
 """Discord slash commands."""
 
+import asyncio
 from typing import TYPE_CHECKING
 
 import discord
@@ -142,7 +143,9 @@ def setup_commands(bot: "DiscordRAGBot") -> None:
 
         # Set filter level
         filter_level = FilterLevel(nivel.value)
-        bot.config_service.set_filter_level(guild_id, filter_level)
+        await asyncio.to_thread(
+            bot.config_service.set_filter_level, guild_id, filter_level
+        )
 
         # Emoji mapping
         emojis = {
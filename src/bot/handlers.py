@@ -1,6 +1,8 @@
 """Discord event handlers for messages and mentions."""
 
-from typing import TYPE_CHECKING
+from functools import lru_cache
+import re
+from typing import TYPE_CHECKING, Iterator
 
 import discord
 
@@ -10,6 +12,56 @@ if TYPE_CHECKING:
     from src.bot.client import DiscordRAGBot
 
 
+@lru_cache(maxsize=4)
+def mention_pattern(user_id: int) -> re.Pattern[str]:
+    """Compiled pattern matching both mention forms (<@id> and <@!id>).
+
+    Args:
+        user_id: Discord user ID being mentioned
+
+    Returns:
+        Compiled regex, cached per user ID
+    """
+    return re.compile(rf"<@!?{user_id}>")
+
+
+def iter_message_chunks(content: str, max_length: int = 2000) -> Iterator[str]:
+    """Yield message-sized pieces of content, preferring line/word breaks.
+
+    Each piece is cut after the last newline (or, failing that, the last
+    space) in the second half of the window, so words are not split
+    across messages. Nothing is dropped: joining the pieces gives back
+    the original content.
+
+    Args:
+        content: Message content
+        max_length: Maximum length of each piece
+
+    Yields:
+        Consecutive pieces of at most max_length characters
+    """
+    start = 0
+    length = len(content)
+
+    while length - start > max_length:
+        end = start + max_length
+        min_cut = start + max_length // 2
+
+        cut = content.rfind("\n", min_cut, end)
+        if cut == -1:
+            cut = content.rfind(" ", min_cut, end)
+
+        if cut == -1:
+            yield content[start:end]
+            start = end
+        else:
+            yield content[start:cut + 1]
+            start = cut + 1
+
+    if start < length:
+        yield content[start:]
+
+
 async def send_long_message(
     channel: discord.abc.Messageable,
     content: str,
@@ -26,12 +78,7 @@ async def send_long_message(
         await channel.send(content)
         return
 
-    # Split into chunks
-    chunks = [
-        content[i : i + max_length] for i in range(0, len(content), max_length)
-    ]
-
-    for chunk in chunks:
+    for chunk in iter_message_chunks(content, max_length):
         await channel.send(chunk)
 
 
@@ -72,7 +119,7 @@ def setup_handlers(bot: "DiscordRAGBot") -> None:
             message: Discord message with mention
         """
         # Extract question (remove mention)
-        question = message.content.replace(f"<@{bot.user.id}>", "").strip()
+        question = mention_pattern(bot.user.id).sub("", message.content).strip()
 
         if not question:
             await message.channel.send("❓ Faça uma pergunta após me mencionar!")
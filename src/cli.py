@@ -106,39 +106,42 @@ def load_documents() -> None:
 
         print(f"📁 Found {len(pdf_files)} PDF files\n")
 
-        # Process each file
-        for i, pdf_file in enumerate(pdf_files, 1):
-            print(f"[{i}/{len(pdf_files)}] Processing: {pdf_file.name}")
+        # Import processing here to avoid loading heavy dependencies early
+        from load import DocumentIndexer
 
-            # Check if already processed
-            should_process, message = doc_control.should_process_file(pdf_file)
+        indexer = DocumentIndexer()
 
-            if not should_process:
-                print(f"   ⏭️  Skipping: {message}\n")
-                continue
+        async def process_files() -> int:
+            """Process each new file, returning the number of chunks indexed."""
+            total_chunks = 0
 
-            print(f"   ⏳ Processing new file...")
+            for i, pdf_file in enumerate(pdf_files, 1):
+                print(f"[{i}/{len(pdf_files)}] Processing: {pdf_file.name}")
 
-            # Import processing here to avoid loading heavy dependencies early
-            from load import DocumentIndexer
+                # Check if already processed
+                should_process, message = doc_control.should_process_file(pdf_file)
 
-            indexer = DocumentIndexer()
+                if not should_process:
+                    print(f"   ⏭️  Skipping: {message}\n")
+                    continue
+
+                print(f"   ⏳ Processing new file...")
 
-            async def process_file() -> None:
-                """Process a single file."""
                 try:
-                    # Load and process
-                    documents = indexer.load_documents()
-                    chunks = indexer.split_documents(documents)
-                    await indexer.index_documents(chunks)
+                    # Stream pages → chunks → embeddings → inserts in batches
+                    chunk_count = await indexer.index_changed_files([pdf_file])
+                    total_chunks += chunk_count
 
-                    print(f"   ✅ Processed: {len(chunks)} chunks\n")
+                    print(f"   ✅ Processed: {chunk_count} chunks\n")
                 except (DocumentLoadError, VectorStoreError) as e:
                     print(f"   ❌ Failed: {e}\n")
 
-            # Run async processing
-            asyncio.run(process_file())
+            return total_chunks
+
+        # One event loop for every file, so the embeddings client pool is reused
+        total_chunks = asyncio.run(process_files())
 
+        print(f"📊 Total: {total_chunks} chunks\n")
         print("=" * 60)
         print("✅ LOADING COMPLETE!")
         print("=" * 60)
@@ -58,12 +58,25 @@ class Settings(BaseSettings):
         default="match_documents",
         description="Function name for similarity search",
     )
+    database_url: Optional[str] = Field(
+        default=None,
+        description="Direct Postgres DSN (enables COPY bulk inserts in load.py)",
+    )
 
     # RAG Configuration
     embedding_model: str = Field(
         default="text-embedding-3-small",
         description="OpenAI embedding model",
     )
+    embedding_dimensions: Optional[int] = Field(
+        default=None,
+        ge=64,
+        le=3072,
+        description=(
+            "Truncated embedding size for text-embedding-3 models "
+            "(must match the vector column; None keeps the model default)"
+        ),
+    )
     chunk_size: int = Field(
         default=1000,
         ge=100,
@@ -76,12 +89,32 @@ class Settings(BaseSettings):
         le=1000,
         description="Overlap between text chunks",
     )
+    chunk_by_tokens: bool = Field(
+        default=False,
+        description="Measure chunk_size and chunk_overlap in embedding tokens instead of characters",
+    )
     k_documents: int = Field(
         default=5,
         ge=1,
         le=20,
         description="Number of documents to retrieve",
     )
+    vectorstore_warmup: bool = Field(
+        default=True,
+        description="Run a warm-up retrieval when the vector store loads",
+    )
+    query_batch_size: int = Field(
+        default=16,
+        ge=1,
+        le=256,
+        description="Maximum concurrent queries embedded in one request",
+    )
+    query_batch_wait_ms: int = Field(
+        default=10,
+        ge=0,
+        le=1000,
+        description="Milliseconds to wait for more queries to batch together",
+    )
 
     # LLM Configuration
     llm_temperature: float = Field(
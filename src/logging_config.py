@@ -215,7 +215,7 @@ class BotLogger:
         self,
         message: str,
         action: str = "ERROR",
-        exc_info: bool = False,
+        exc_info: bool | BaseException = False,
         **context: Any,
     ) -> None:
         """Log error message.
@@ -223,7 +223,8 @@ class BotLogger:
         Args:
             message: Log message
             action: Action category
-            exc_info: Include exception traceback
+            exc_info: Include exception traceback (True for the exception
+                being handled, or the exception instance to log)
             **context: Additional context
         """
         self.logger.error(
@@ -1,7 +1,7 @@
 """Service layer for business logic and external integrations."""
 
 from src.services.supabase_service import SupabaseService
-from src.services.vectorstore_service import VectorStoreService
+from src.services.vectorstore_service import VectorStoreService, get_embeddings
 from src.services.llm_service import LLMService
 from src.services.config_service import ConfigService
 
@@ -10,4 +10,5 @@ __all__ = [
     "VectorStoreService",
     "LLMService",
     "ConfigService",
+    "get_embeddings",
 ]
@@ -1,19 +1,30 @@
 """Configuration service for managing server-specific settings."""
 
 import json
+import os
 from pathlib import Path
+import tempfile
+import threading
 from typing import Optional
 
 from src.config import FilterLevel, Settings
 from src.logging_config import BotLogger
 from src.models import ServerConfig
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 class ConfigService:
     """Manages server-specific configurations.
 
     This service handles loading, saving, and querying server
-    configurations with proper validation and defaults.
+    configurations with proper validation and defaults. Loads, refreshes
+    and saves are serialized by a lock, since saves run in worker threads
+    while lookups run on the event loop.
 
     Attributes:
         settings: Application settings
@@ -30,6 +41,9 @@ class ConfigService:
         self.settings = settings
         self.logger = logger
         self._configs: dict[str, ServerConfig] = {}
+        self._filter_levels: dict[Optional[int], FilterLevel] = {}
+        self._mtime_ns: Optional[int] = None
+        self._lock = threading.RLock()
         self._load_configs()
 
     def _get_guild_key(self, guild_id: Optional[int]) -> str:
@@ -43,69 +57,148 @@ class ConfigService:
         """
         return str(guild_id) if guild_id else "dm"
 
-    def _load_configs(self) -> None:
-        """Load configurations from file."""
-        if not self.settings.config_file.exists():
-            self.logger.info(
-                "Config file not found, using defaults",
-                action="INFO",
-            )
-            return
+    def _rebuild_filter_levels(self) -> None:
+        """Rebuild the guild ID -> FilterLevel lookup from the loaded configs.
+
+        Keys are the integer guild IDs (None for DMs), so lookups on the
+        message path need no string conversion or model access.
+        """
+        levels: dict[Optional[int], FilterLevel] = {}
+
+        for guild_key, config in self._configs.items():
+            try:
+                guild_id = None if guild_key == "dm" else int(guild_key)
+                levels[guild_id] = FilterLevel(config.filter_level)
+            except ValueError:
+                self.logger.warning(
+                    f"Invalid filter level for {guild_key}: {config.filter_level}",
+                    action="WARNING",
+                )
 
+        self._filter_levels = levels
+
+    def _stat_mtime_ns(self) -> Optional[int]:
+        """Return the config file mtime in nanoseconds, or None if missing."""
         try:
-            with open(self.settings.config_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            return os.stat(self.settings.config_file).st_mtime_ns
+        except OSError:
+            return None
 
-            # Convert to ServerConfig objects
-            for guild_key, config_data in data.items():
-                try:
-                    self._configs[guild_key] = ServerConfig(
-                        guild_id=guild_key,
-                        **config_data,
-                    )
-                except Exception as e:
-                    self.logger.warning(
-                        f"Failed to load config for {guild_key}",
-                        action="WARNING",
-                        error=str(e),
-                    )
+    def _refresh_if_changed(self) -> None:
+        """Reload configurations if the file changed on disk since last read.
 
-            self.logger.info(
-                "Configurations loaded",
-                action="SUCCESS",
-                count=len(self._configs),
-            )
+        Only a ``stat`` call is made on the hot path; the file is re-read
+        and re-parsed just when its mtime differs from the cached one.
+        """
+        with self._lock:
+            if self._stat_mtime_ns() != self._mtime_ns:
+                self._load_configs()
 
-        except Exception as e:
-            self.logger.error(
-                "Failed to load configurations",
-                action="ERROR",
-                exc_info=True,
-            )
+    def _load_configs(self) -> None:
+        """Load configurations from file."""
+        with self._lock:
+            self._mtime_ns = self._stat_mtime_ns()
+
+            if self._mtime_ns is None:
+                self.logger.info(
+                    "Config file not found, using defaults",
+                    action="INFO",
+                )
+                return
+
+            try:
+                with open(self.settings.config_file, "rb") as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+                configs: dict[str, ServerConfig] = {}
+
+                # Convert to ServerConfig objects
+                for guild_key, config_data in data.items():
+                    try:
+                        configs[guild_key] = ServerConfig(
+                            guild_id=guild_key,
+                            **config_data,
+                        )
+                    except Exception as e:
+                        self.logger.warning(
+                            f"Failed to load config for {guild_key}",
+                            action="WARNING",
+                            error=str(e),
+                        )
+
+                # Swap in the complete dict so unlocked readers never see
+                # a partially rebuilt one
+                self._configs = configs
+                self._rebuild_filter_levels()
+
+                self.logger.info(
+                    "Configurations loaded",
+                    action="SUCCESS",
+                    count=len(self._configs),
+                )
+
+            except Exception as e:
+                self.logger.error(
+                    "Failed to load configurations",
+                    action="ERROR",
+                    exc_info=True,
+                )
 
     def _save_configs(self) -> None:
-        """Save configurations to file."""
-        try:
-            # Convert to dict for JSON serialization
-            data = {
-                guild_key: config.model_dump(exclude={"guild_id"})
-                for guild_key, config in self._configs.items()
-            }
-
-            with open(self.settings.config_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
-
-            self.logger.debug(
-                "Configurations saved",
-                count=len(self._configs),
-            )
-
-        except Exception as e:
-            self.logger.error(
-                "Failed to save configurations",
-                action="ERROR",
-                exc_info=True,
-            )
+        """Save configurations to file.
+
+        The payload is written to a temporary file in the same directory and
+        moved over the config file with ``os.replace``, so readers never see
+        a truncated file.
+        """
+        with self._lock:
+            self._rebuild_filter_levels()
+
+            try:
+                # Convert to dict for JSON serialization
+                data = {
+                    guild_key: config.model_dump(exclude={"guild_id"})
+                    for guild_key, config in self._configs.items()
+                }
+
+                if HAS_ORJSON:
+                    payload = orjson.dumps(
+                        data, option=orjson.OPT_INDENT_2, default=str
+                    )
+                else:
+                    payload = json.dumps(
+                        data, indent=2, ensure_ascii=False, default=str
+                    ).encode("utf-8")
+
+                config_file = Path(self.settings.config_file)
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=config_file.parent, prefix=f".{config_file.name}."
+                )
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(payload)
+                    # mkstemp creates the file as 0600; keep the usual mode
+                    os.chmod(tmp_path, 0o644)
+                    os.replace(tmp_path, config_file)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+
+                # In-memory configs already match the file; just track its mtime
+                self._mtime_ns = self._stat_mtime_ns()
+
+                self.logger.debug(
+                    "Configurations saved",
+                    count=len(self._configs),
+                )
+
+            except Exception as e:
+                self.logger.error(
+                    "Failed to save configurations",
+                    action="ERROR",
+                    exc_info=True,
+                )
 
     def get_filter_level(
         self,
@@ -119,20 +212,11 @@ class ConfigService:
         Returns:
             Filter level for the guild
         """
-        guild_key = self._get_guild_key(guild_id)
+        self._refresh_if_changed()
 
-        if guild_key in self._configs:
-            level_str = self._configs[guild_key].filter_level
-            try:
-                return FilterLevel(level_str)
-            except ValueError:
-                self.logger.warning(
-                    f"Invalid filter level for {guild_key}: {level_str}",
-                    action="WARNING",
-                )
-
-        # Return default
-        return self.settings.default_filter_level
+        return self._filter_levels.get(
+            guild_id or None, self.settings.default_filter_level
+        )
 
     def set_filter_level(
         self,
@@ -147,17 +231,18 @@ class ConfigService:
         """
         guild_key = self._get_guild_key(guild_id)
 
-        # Update or create config
-        if guild_key in self._configs:
-            self._configs[guild_key].filter_level = filter_level.value
-        else:
-            self._configs[guild_key] = ServerConfig(
-                guild_id=guild_key,
-                filter_level=filter_level.value,
-            )
+        with self._lock:
+            # Update or create config
+            if guild_key in self._configs:
+                self._configs[guild_key].filter_level = filter_level.value
+            else:
+                self._configs[guild_key] = ServerConfig(
+                    guild_id=guild_key,
+                    filter_level=filter_level.value,
+                )
 
-        # Save to disk
-        self._save_configs()
+            # Save to disk
+            self._save_configs()
 
         self.logger.info(
             "Filter level updated",
@@ -178,6 +263,7 @@ class ConfigService:
         Returns:
             Server configuration
         """
+        self._refresh_if_changed()
         guild_key = self._get_guild_key(guild_id)
 
         if guild_key in self._configs:
@@ -200,18 +286,18 @@ class ConfigService:
         """
         guild_key = self._get_guild_key(guild_id)
 
-        if guild_key in self._configs:
+        with self._lock:
+            if guild_key not in self._configs:
+                return False
             del self._configs[guild_key]
             self._save_configs()
 
-            self.logger.info(
-                "Configuration deleted",
-                action="CONFIG",
-                guild_id=guild_key,
-            )
-            return True
-
-        return False
+        self.logger.info(
+            "Configuration deleted",
+            action="CONFIG",
+            guild_id=guild_key,
+        )
+        return True
 
     def get_all_configs(self) -> dict[str, ServerConfig]:
         """Get all server configurations.
@@ -219,4 +305,5 @@ class ConfigService:
         Returns:
             Dictionary mapping guild keys to configs
         """
+        self._refresh_if_changed()
         return self._configs.copy()
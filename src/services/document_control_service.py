@@ -9,6 +9,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+from postgrest import ReturnMethod
 from supabase import Client
 
 from src.config import Settings
@@ -354,6 +355,39 @@ class DocumentControlService:
                 original_error=e,
             ) from e
 
+    def delete_chunks(self, source_id: int) -> None:
+        """Remove the chunks of a source without deactivating it.
+
+        Used before (re)indexing a source so that rows left behind by an
+        earlier failed attempt with the same source ID are not duplicated.
+
+        Args:
+            source_id: Source ID whose chunks are removed
+
+        Raises:
+            SupabaseError: If database operation fails
+        """
+        try:
+            (
+                self.client.table(self.settings.supabase_table_name)
+                .delete(returning=ReturnMethod.minimal)
+                .eq("source_id", source_id)
+                .execute()
+            )
+
+        except Exception as e:
+            self.logger.error(
+                "Failed to delete source chunks",
+                action="ERROR",
+                source_id=source_id,
+                exc_info=True,
+            )
+            raise SupabaseError(
+                "Failed to delete source chunks",
+                operation="delete_chunks",
+                original_error=e,
+            ) from e
+
     def get_knowledge_base_stats(self) -> dict[str, Any]:
         """Get knowledge base statistics.
 
@@ -429,6 +463,44 @@ class DocumentControlService:
                 original_error=e,
             ) from e
 
+    def get_active_source_ids(self, file_path: Path) -> list[int]:
+        """Get IDs of the active, completed versions of a file.
+
+        Args:
+            file_path: Path to file (as registered in start_processing)
+
+        Returns:
+            Source IDs, newest first
+
+        Raises:
+            SupabaseError: If database query fails
+        """
+        try:
+            result = (
+                self.client.table("document_sources")
+                .select("id")
+                .eq("file_path", str(file_path))
+                .eq("is_active", True)
+                .eq("status", "completed")
+                .order("processed_at", desc=True)
+                .execute()
+            )
+
+            return [row["id"] for row in result.data or []]
+
+        except Exception as e:
+            self.logger.error(
+                "Failed to get active sources for file",
+                action="ERROR",
+                file_name=file_path.name,
+                exc_info=True,
+            )
+            raise SupabaseError(
+                "Failed to get active sources for file",
+                operation="get_active_source_ids",
+                original_error=e,
+            ) from e
+
     def should_process_file(self, file_path: Path) -> tuple[bool, Optional[str]]:
         """Check if file should be processed.
 
@@ -0,0 +1,115 @@
+"""Micro-batching of query embeddings across concurrent requests."""
+
+import asyncio
+from typing import Optional
+
+from langchain_core.embeddings import Embeddings
+
+
+class EmbeddingBatcher:
+    """Groups concurrent query embeddings into a single embeddings request.
+
+    Queries that arrive within ``max_wait`` seconds of the first one in a
+    batch (up to ``max_batch_size`` of them) are embedded together with one
+    ``aembed_documents`` call, and each caller gets back its own vector.
+
+    Attributes:
+        embeddings: Embeddings model used for the batched requests
+        max_batch_size: Maximum number of queries per request
+        max_wait: Seconds to wait for more queries after the first one
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_batch_size: int = 16,
+        max_wait: float = 0.01,
+    ) -> None:
+        """Initialize the batcher.
+
+        Args:
+            embeddings: Embeddings model used for the batched requests
+            max_batch_size: Maximum number of queries per request
+            max_wait: Seconds to wait for more queries after the first one
+        """
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def embed_query(self, text: str) -> list[float]:
+        """Embed one query, batched with any other queries in flight.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector for the query
+
+        Raises:
+            Exception: Whatever the embeddings request raised for the batch
+        """
+        loop = asyncio.get_running_loop()
+        self._ensure_worker(loop)
+
+        future: asyncio.Future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def aclose(self) -> None:
+        """Stop the background worker."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def _ensure_worker(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start the worker on the running loop if it is not running there."""
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _collect_batch(self) -> list[tuple[str, asyncio.Future]]:
+        """Wait for one query, then gather more until the window closes."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # Callers that gave up while waiting do not need a vector
+        return [(text, future) for text, future in batch if not future.done()]
+
+    async def _run(self) -> None:
+        """Embed queued queries batch by batch and resolve their futures."""
+        while True:
+            batch = await self._collect_batch()
+            if not batch:
+                continue
+
+            try:
+                vectors = await self.embeddings.aembed_documents(
+                    [text for text, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
@@ -2,11 +2,7 @@
 
 from typing import Optional
 
-from langchain_classic.chains import create_retrieval_chain
-from langchain_classic.chains.combine_documents import (
-    create_stuff_documents_chain,
-)
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
 from src.cache import cached
@@ -85,24 +81,30 @@ class LLMService:
 
         return llm
 
-    def _get_prompt_template(
+    def _build_messages(
         self,
+        question: str,
+        context: str,
         filter_level: FilterLevel,
-    ) -> ChatPromptTemplate:
-        """Get prompt template for given filter level.
+    ) -> list[SystemMessage | HumanMessage]:
+        """Build the chat messages for a RAG query.
 
         Args:
-            filter_level: Content filter level
+            question: User question
+            context: Retrieved documents joined into a single string
+            filter_level: Content filter level for the system prompt
 
         Returns:
-            Configured prompt template
+            System and human messages ready for the LLM
         """
-        system_prompt = PromptTemplates.get_template(filter_level)
+        system_prompt = PromptTemplates.get_template(filter_level).format(
+            context=context,
+        )
 
-        return ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("human", "{input}"),
-        ])
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=question),
+        ]
 
     @cached(ttl=3600, key_prefix="query")
     async def process_query(
@@ -154,26 +156,14 @@ class LLMService:
                 filter_level=filter_level.value,
             )
 
-            # Get prompt template
-            prompt = self._get_prompt_template(filter_level)
-
-            # Create chains
-            question_answer_chain = create_stuff_documents_chain(
-                self.llm,
-                prompt,
-            )
+            # Retrieve, stuff the documents into the prompt, generate
+            context_docs = await self.vectorstore_service.retrieve(request.question)
+            context = "\n\n".join(doc.page_content for doc in context_docs)
 
-            qa_chain = create_retrieval_chain(
-                self.vectorstore_service.retriever,
-                question_answer_chain,
+            response = await self.llm.ainvoke(
+                self._build_messages(request.question, context, filter_level)
             )
-
-            # Execute query
-            result = await qa_chain.ainvoke({"input": request.question})
-
-            # Extract results
-            answer = result["answer"]
-            context_docs = result.get("context", [])
+            answer = response.content
 
             # Convert to our Document model
             sources = [
@@ -1,5 +1,6 @@
 """Supabase client management service with connection pooling."""
 
+from functools import lru_cache
 from typing import Optional
 
 from supabase import Client, create_client
@@ -9,6 +10,23 @@ from src.exceptions import SupabaseError
 from src.logging_config import BotLogger
 
 
+@lru_cache(maxsize=None)
+def get_supabase_client(url: str, api_key: str) -> Client:
+    """Return the process-wide Supabase client for these credentials.
+
+    Every ``SupabaseService`` (bot, admin cogs, API, CLI) shares one client
+    and therefore one HTTP connection pool instead of building its own.
+
+    Args:
+        url: Supabase project URL
+        api_key: Supabase API key
+
+    Returns:
+        Cached Supabase client
+    """
+    return create_client(url, api_key)
+
+
 class SupabaseService:
     """Manages Supabase client lifecycle and operations.
 
@@ -46,7 +64,7 @@ class SupabaseService:
         return self._client
 
     def _create_client(self) -> Client:
-        """Create a new Supabase client.
+        """Get the shared Supabase client (created on first use).
 
         Returns:
             Configured Supabase client
@@ -61,7 +79,7 @@ class SupabaseService:
                 url=self.settings.supabase_url,
             )
 
-            client = create_client(
+            client = get_supabase_client(
                 self.settings.supabase_url,
                 self.settings.supabase_api_key,
             )
@@ -119,6 +137,10 @@ class SupabaseService:
             ) from e
 
     def reset(self) -> None:
-        """Reset the client (useful for reconnection)."""
+        """Reset the client (useful for reconnection).
+
+        Drops the shared client as well, so the next access reconnects.
+        """
+        get_supabase_client.cache_clear()
         self._client = None
         self.logger.info("Supabase client reset", action="INFO")
@@ -1,5 +1,7 @@
 """Vector store service for document retrieval and embedding."""
 
+import asyncio
+from functools import lru_cache
 from typing import Optional
 
 from langchain_community.vectorstores import SupabaseVectorStore
@@ -11,9 +13,36 @@ from src.config import Settings
 from src.exceptions import VectorStoreError, VectorStoreNotLoadedError
 from src.logging_config import BotLogger
 from src.models import Document
+from src.services.embedding_batcher import EmbeddingBatcher
 from src.services.supabase_service import SupabaseService
 
 
+@lru_cache(maxsize=4)
+def get_embeddings(
+    model: str,
+    api_key: str,
+    dimensions: Optional[int] = None,
+) -> OpenAIEmbeddings:
+    """Return the process-wide embeddings client for this model.
+
+    Callers asking for the same model share one ``OpenAIEmbeddings`` and with
+    it the underlying OpenAI HTTP connection pools and tokenizer state.
+
+    Args:
+        model: Embedding model name
+        api_key: OpenAI API key
+        dimensions: Optional output dimensions for the model
+
+    Returns:
+        Cached embeddings client
+    """
+    return OpenAIEmbeddings(
+        model=model,
+        dimensions=dimensions,
+        openai_api_key=api_key,
+    )
+
+
 class VectorStoreService:
     """Manages vector store operations for document retrieval.
 
@@ -43,6 +72,7 @@ class VectorStoreService:
         self.logger = logger
         self.supabase_service = supabase_service
         self._embeddings: Optional[OpenAIEmbeddings] = None
+        self._query_batcher: Optional[EmbeddingBatcher] = None
         self._vectorstore: Optional[SupabaseVectorStore] = None
         self._retriever: Optional[VectorStoreRetriever] = None
         self._loaded = False
@@ -58,6 +88,21 @@ class VectorStoreService:
             self._embeddings = self._create_embeddings()
         return self._embeddings
 
+    @property
+    def query_batcher(self) -> EmbeddingBatcher:
+        """Get or create the query embedding batcher (lazy initialization).
+
+        Returns:
+            Batcher shared by all concurrent retrievals
+        """
+        if self._query_batcher is None:
+            self._query_batcher = EmbeddingBatcher(
+                self.embeddings,
+                max_batch_size=self.settings.query_batch_size,
+                max_wait=self.settings.query_batch_wait_ms / 1000,
+            )
+        return self._query_batcher
+
     @property
     def vectorstore(self) -> SupabaseVectorStore:
         """Get vector store instance.
@@ -105,11 +150,13 @@ class VectorStoreService:
             "Creating embeddings model",
             action="LOADING",
             model=self.settings.embedding_model,
+            dimensions=self.settings.embedding_dimensions,
         )
 
-        embeddings = OpenAIEmbeddings(
-            model=self.settings.embedding_model,
-            openai_api_key=self.settings.openai_api_key,
+        embeddings = get_embeddings(
+            self.settings.embedding_model,
+            self.settings.openai_api_key,
+            self.settings.embedding_dimensions,
         )
 
         self.logger.info(
@@ -119,6 +166,19 @@ class VectorStoreService:
 
         return embeddings
 
+    def _create_vectorstore(self) -> SupabaseVectorStore:
+        """Create the Supabase vector store.
+
+        Returns:
+            Vector store backed by the shared Supabase client
+        """
+        return SupabaseVectorStore(
+            client=self.supabase_service.client,
+            embedding=self.embeddings,
+            table_name=self.settings.supabase_table_name,
+            query_name=self.settings.supabase_query_name,
+        )
+
     async def load(self) -> None:
         """Load vector store from Supabase.
 
@@ -132,13 +192,8 @@ class VectorStoreService:
                 table=self.settings.supabase_table_name,
             )
 
-            # Initialize vector store
-            self._vectorstore = SupabaseVectorStore(
-                client=self.supabase_service.client,
-                embedding=self.embeddings,
-                table_name=self.settings.supabase_table_name,
-                query_name=self.settings.supabase_query_name,
-            )
+            # Client setup is synchronous (HTTP pools, auth), keep it off the loop
+            self._vectorstore = await asyncio.to_thread(self._create_vectorstore)
 
             # Create retriever
             self._retriever = self._vectorstore.as_retriever(
@@ -153,6 +208,9 @@ class VectorStoreService:
                 k_docs=self.settings.k_documents,
             )
 
+            if self.settings.vectorstore_warmup:
+                await self._warm_up()
+
         except Exception as e:
             self._loaded = False
             self.logger.error(
@@ -166,6 +224,49 @@ class VectorStoreService:
                 original_error=e,
             ) from e
 
+    async def _warm_up(self) -> None:
+        """Run one retrieval so the first real query starts warm.
+
+        Opens the embeddings and Supabase HTTP connections and pulls the
+        vector index pages into the database cache. Failures are logged
+        and otherwise ignored.
+        """
+        try:
+            await self.retrieve("warmup")
+            self.logger.debug("Vector store warm-up completed")
+        except Exception as e:
+            self.logger.warning(
+                "Vector store warm-up failed",
+                action="WARNING",
+                error=str(e),
+            )
+
+    async def retrieve(
+        self,
+        query: str,
+        k: Optional[int] = None,
+    ) -> list[LangChainDocument]:
+        """Retrieve the documents most similar to a query.
+
+        The query embedding goes through ``query_batcher``, so concurrent
+        retrievals share one embeddings request.
+
+        Args:
+            query: Search query
+            k: Number of results (uses default if None)
+
+        Returns:
+            List of LangChain documents, most similar first
+
+        Raises:
+            VectorStoreNotLoadedError: If vector store not loaded
+        """
+        vectorstore = self.vectorstore
+        vector = await self.query_batcher.embed_query(query)
+        return await vectorstore.asimilarity_search_by_vector(
+            vector, k=k or self.settings.k_documents
+        )
+
     async def similarity_search(
         self,
         query: str,
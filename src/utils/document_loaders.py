@@ -10,6 +10,18 @@ from typing import Iterator
 import pandas as pd
 from langchain_core.documents import Document
 
+try:
+    import pymupdf
+    HAS_PYMUPDF = True
+except ImportError:
+    HAS_PYMUPDF = False
+
+try:
+    import pypdfium2
+    HAS_PYPDFIUM2 = True
+except ImportError:
+    HAS_PYPDFIUM2 = False
+
 
 class CSVLoader:
     """Carregador para arquivos CSV que converte dados tabulares em documentos de texto.
@@ -388,3 +400,114 @@ class MultiSheetExcelLoader:
                         "columns": list(df.columns),
                     },
                 )
+
+
+class PyMuPDFLoader:
+    """Carregador de PDF baseado no PyMuPDF (parser em C, bem mais rápido que o pypdf).
+
+    Gera um documento por página, com os mesmos metadados do PyPDFLoader
+    (``source`` e ``page`` a partir de 0). Requer o pacote opcional ``pymupdf``.
+
+    Attributes:
+        file_path: Caminho para o arquivo PDF
+    """
+
+    def __init__(self, file_path: str | Path) -> None:
+        """Inicializa o carregador de PDF.
+
+        Args:
+            file_path: Caminho para o arquivo PDF
+        """
+        self.file_path = Path(file_path)
+
+    def load(self) -> list[Document]:
+        """Carrega o texto de todas as páginas do PDF.
+
+        Returns:
+            Lista de objetos Document, um por página
+
+        Raises:
+            ImportError: Se o pymupdf não estiver instalado
+        """
+        return list(self.lazy_load())
+
+    def lazy_load(self) -> Iterator[Document]:
+        """Carrega as páginas de forma lazy, uma de cada vez.
+
+        Yields:
+            Objetos Document um de cada vez
+
+        Raises:
+            ImportError: Se o pymupdf não estiver instalado
+        """
+        if not HAS_PYMUPDF:
+            raise ImportError("pymupdf não está instalado (pip install pymupdf)")
+
+        source = str(self.file_path)
+        with pymupdf.open(source) as pdf:
+            for page_number, page in enumerate(pdf):
+                yield Document(
+                    page_content=page.get_text("text"),
+                    metadata={"source": source, "page": page_number},
+                )
+
+
+class PyPDFium2Loader:
+    """Carregador de PDF baseado no pypdfium2 (PDFium, em C; licença Apache/BSD).
+
+    Alternativa ao PyMuPDF sem AGPL, também bem mais rápida que o pypdf.
+    Gera um documento por página, com os mesmos metadados do PyPDFLoader
+    (``source`` e ``page`` a partir de 0). Requer o pacote opcional ``pypdfium2``.
+
+    Attributes:
+        file_path: Caminho para o arquivo PDF
+    """
+
+    def __init__(self, file_path: str | Path) -> None:
+        """Inicializa o carregador de PDF.
+
+        Args:
+            file_path: Caminho para o arquivo PDF
+        """
+        self.file_path = Path(file_path)
+
+    def load(self) -> list[Document]:
+        """Carrega o texto de todas as páginas do PDF.
+
+        Returns:
+            Lista de objetos Document, um por página
+
+        Raises:
+            ImportError: Se o pypdfium2 não estiver instalado
+        """
+        return list(self.lazy_load())
+
+    def lazy_load(self) -> Iterator[Document]:
+        """Carrega as páginas de forma lazy, uma de cada vez.
+
+        Yields:
+            Objetos Document um de cada vez
+
+        Raises:
+            ImportError: Se o pypdfium2 não estiver instalado
+        """
+        if not HAS_PYPDFIUM2:
+            raise ImportError("pypdfium2 não está instalado (pip install pypdfium2)")
+
+        source = str(self.file_path)
+        pdf = pypdfium2.PdfDocument(source)
+        try:
+            for page_number in range(len(pdf)):
+                page = pdf[page_number]
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+                yield Document(
+                    page_content=text,
+                    metadata={"source": source, "page": page_number},
+                )
+        finally:
+            pdf.close()
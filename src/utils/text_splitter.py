@@ -0,0 +1,222 @@
+"""Divisor de texto em chunks por separadores, sem recursão.
+
+Alternativa ao ``RecursiveCharacterTextSplitter`` do LangChain para o
+pipeline de indexação: em vez de dividir o documento inteiro por cada
+separador e remontar os pedaços em Python, cada chunk é delimitado com
+buscas em C (``str.rfind`` e uma regex pré-compilada) dentro da janela
+de ``chunk_size`` caracteres.
+"""
+
+from functools import lru_cache
+import re
+from typing import Iterable, Iterator
+
+from langchain_core.documents import Document
+import tiktoken
+
+try:
+    from semantic_text_splitter import TextSplitter as _RustTextSplitter
+
+    HAS_SEMANTIC_TEXT_SPLITTER = True
+except ImportError:
+    HAS_SEMANTIC_TEXT_SPLITTER = False
+
+# Modelo cujo tokenizer mede os chunks do TokenTextSplitter
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Separadores em ordem de preferência para o fim de um chunk
+DEFAULT_SEPARATORS: tuple[str, ...] = ("\n\n", "\n", " ")
+
+# Início de palavra: o overlap começa depois do primeiro espaço em branco
+_WHITESPACE = re.compile(r"\s+")
+
+
+class FastTextSplitter:
+    """Divide textos em chunks de até ``chunk_size`` caracteres com overlap.
+
+    Cada chunk termina no último separador da janela, respeitando a ordem de
+    ``separators`` (parágrafo, linha, palavra); um separador só é aceito se
+    estiver na segunda metade da janela, para não gerar chunks minúsculos.
+    Sem separador utilizável, o corte é feito no limite da janela. O chunk
+    seguinte recomeça até ``chunk_overlap`` caracteres antes, no início de
+    uma palavra.
+
+    Attributes:
+        chunk_size: Tamanho máximo de cada chunk em caracteres
+        chunk_overlap: Caracteres repetidos entre chunks consecutivos
+        separators: Separadores em ordem de preferência
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        chunk_overlap: int = 0,
+        separators: Iterable[str] = DEFAULT_SEPARATORS,
+    ) -> None:
+        """Inicializa o divisor.
+
+        Raises:
+            ValueError: Se chunk_overlap >= chunk_size
+        """
+        if chunk_overlap >= chunk_size:
+            raise ValueError(
+                f"chunk_overlap ({chunk_overlap}) deve ser menor que chunk_size ({chunk_size})"
+            )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = tuple(separators)
+
+    def _find_break(self, text: str, start: int, end: int) -> int:
+        """Posição (exclusiva) onde o chunk iniciado em ``start`` deve terminar."""
+        min_break = start + self.chunk_size // 2
+        for separator in self.separators:
+            pos = text.rfind(separator, min_break, end)
+            if pos != -1:
+                return pos + len(separator)
+        return end
+
+    def iter_split_text(self, text: str) -> Iterator[str]:
+        """Gera os chunks de ``text`` (sem espaços nas pontas, nunca vazios)."""
+        start = 0
+        length = len(text)
+
+        while start < length:
+            end = start + self.chunk_size
+            if end >= length:
+                chunk = text[start:].strip()
+                if chunk:
+                    yield chunk
+                return
+
+            brk = self._find_break(text, start, end)
+            chunk = text[start:brk].strip()
+            if chunk:
+                yield chunk
+
+            next_start = brk
+            if self.chunk_overlap:
+                overlap_start = max(brk - self.chunk_overlap, start + 1)
+                match = _WHITESPACE.search(text, overlap_start, brk)
+                if match and match.end() < brk:
+                    next_start = match.end()
+            start = next_start
+
+    def split_text(self, text: str) -> list[str]:
+        """Divide ``text`` em chunks."""
+        return list(self.iter_split_text(text))
+
+    def split_documents(self, documents: Iterable[Document]) -> list[Document]:
+        """Divide documentos, copiando os metadados da origem em cada chunk."""
+        return [
+            Document(page_content=chunk, metadata=dict(document.metadata))
+            for document in documents
+            for chunk in self.iter_split_text(document.page_content)
+        ]
+
+
+class RustTextSplitter(FastTextSplitter):
+    """Mesma interface do ``FastTextSplitter``, dividindo com o
+    ``semantic-text-splitter`` (Rust): os chunks terminam no maior limite
+    semântico (parágrafo, frase, palavra) que cabe em ``chunk_size``.
+
+    Requer o pacote opcional ``semantic-text-splitter``.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        chunk_overlap: int = 0,
+        separators: Iterable[str] = DEFAULT_SEPARATORS,
+    ) -> None:
+        """Inicializa o divisor.
+
+        Raises:
+            ValueError: Se chunk_overlap >= chunk_size
+        """
+        super().__init__(chunk_size, chunk_overlap, separators)
+        self._splitter = _RustTextSplitter(chunk_size, overlap=chunk_overlap)
+
+    def __reduce__(self) -> tuple:
+        """Permite enviar o divisor a processos (o objeto Rust não é picklable)."""
+        return type(self), (self.chunk_size, self.chunk_overlap, self.separators)
+
+    def iter_split_text(self, text: str) -> Iterator[str]:
+        """Gera os chunks de ``text`` (sem espaços nas pontas, nunca vazios)."""
+        for chunk in self._splitter.chunks(text):
+            chunk = chunk.strip()
+            if chunk:
+                yield chunk
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> tiktoken.Encoding:
+    """Retorna o tokenizer do modelo (carregado uma vez por processo)."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+class TokenTextSplitter(FastTextSplitter):
+    """Divide textos em janelas de ``chunk_size`` tokens do modelo de embedding.
+
+    O texto é tokenizado uma única vez e todas as janelas são decodificadas
+    em lote (``decode_batch``), sem medir cada pedaço candidato.
+    ``chunk_size`` e ``chunk_overlap`` são contados em tokens.
+
+    Attributes:
+        model: Modelo cujo tokenizer é usado
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        chunk_overlap: int = 0,
+        model: str = DEFAULT_EMBEDDING_MODEL,
+    ) -> None:
+        """Inicializa o divisor.
+
+        Raises:
+            ValueError: Se chunk_overlap >= chunk_size
+        """
+        super().__init__(chunk_size, chunk_overlap)
+        self.model = model
+        self._encoding = get_encoding(model)
+
+    def __reduce__(self) -> tuple:
+        """Permite enviar o divisor a processos (recarrega o tokenizer lá)."""
+        return type(self), (self.chunk_size, self.chunk_overlap, self.model)
+
+    def iter_split_text(self, text: str) -> Iterator[str]:
+        """Gera os chunks de ``text`` (sem espaços nas pontas, nunca vazios)."""
+        tokens = self._encoding.encode_ordinary(text)
+        step = self.chunk_size - self.chunk_overlap
+        windows = []
+        for start in range(0, len(tokens), step):
+            windows.append(tokens[start:start + self.chunk_size])
+            if start + self.chunk_size >= len(tokens):
+                break
+
+        for chunk in self._encoding.decode_batch(windows):
+            chunk = chunk.strip()
+            if chunk:
+                yield chunk
+
+
+def create_text_splitter(
+    chunk_size: int,
+    chunk_overlap: int = 0,
+    by_tokens: bool = False,
+    model: str = DEFAULT_EMBEDDING_MODEL,
+) -> FastTextSplitter:
+    """Cria o divisor mais rápido disponível.
+
+    Com ``by_tokens``, tamanhos são contados em tokens de ``model``
+    (``TokenTextSplitter``). Senão, usa o ``RustTextSplitter`` se o
+    ``semantic-text-splitter`` estiver instalado, ou o ``FastTextSplitter``.
+    """
+    if by_tokens:
+        return TokenTextSplitter(chunk_size, chunk_overlap, model)
+    if HAS_SEMANTIC_TEXT_SPLITTER:
+        return RustTextSplitter(chunk_size, chunk_overlap)
+    return FastTextSplitter(chunk_size, chunk_overlap)
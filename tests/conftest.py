@@ -4,8 +4,10 @@ This module provides fixtures for testing with proper mocking
 and isolation.
 """
 
+import importlib
 import pytest
 from pathlib import Path
+from types import ModuleType
 from unittest.mock import MagicMock, AsyncMock, patch
 
 from src.config import Settings, reset_settings
@@ -123,3 +125,33 @@ def sample_pdf(temp_data_dir: Path) -> Path:
     pdf_content = b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n%%EOF"
     pdf_path.write_bytes(pdf_content)
     return pdf_path
+
+
+@pytest.fixture(scope="session")
+def ingest_pdf_module() -> ModuleType:
+    """Import the root ingest_pdf script with placeholder credentials.
+
+    The script creates its OpenAI and Supabase clients at import time; the
+    tests never call them, but they need well-formed settings to be built.
+
+    Returns:
+        The ingest_pdf module
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("OPENAI_API_KEY", "test_openai_key")
+        mp.setenv("SUPABASE_URL", "https://test.supabase.co")
+        mp.setenv("SUPABASE_SERVICE_ROLE_KEY", "eyJhbGciOiJIUzI1NiJ9.e30.test")
+        return importlib.import_module("ingest_pdf")
+
+
+@pytest.fixture(scope="session")
+def batch_ingest_module(ingest_pdf_module: ModuleType) -> ModuleType:
+    """Import the root batch_ingest script (see ingest_pdf_module).
+
+    Args:
+        ingest_pdf_module: Imported ingest_pdf script
+
+    Returns:
+        The batch_ingest module
+    """
+    return importlib.import_module("batch_ingest")
@@ -0,0 +1,88 @@
+"""Tests for the batch ingestion report of the batch_ingest script."""
+
+import json
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import pytest
+
+
+def fill_report(report: Any, count: int) -> None:
+    """Add ``count`` records of each kind to the report."""
+    for i in range(count):
+        report.add_success(
+            file_path=f"/dados/pasta {i}/arquivo_{i}.pdf",
+            document_id=f"{i:08d}-0000-0000-0000-000000000000",
+            chunks=i * 3,
+        )
+        report.add_skipped(file_path=f"/dados/pulado_{i}.pdf", reason="Já indexado")
+        report.add_failed(
+            file_path=f"/dados/falha_{i}.pdf",
+            error=f'Erro "{i}"\ncom quebra de linha e ç',
+        )
+    report.total_files = 3 * count
+
+
+class TestIngestionReportSaveJson:
+    """Test suite for IngestionReport.save_json."""
+
+    @pytest.mark.parametrize("keep_details", [True, False])
+    @pytest.mark.parametrize("count", [0, 1, 50])
+    def test_round_trip(
+        self,
+        batch_ingest_module: ModuleType,
+        tmp_path: Path,
+        keep_details: bool,
+        count: int,
+    ) -> None:
+        """Test that the streamed JSON parses back to the report contents."""
+        report = batch_ingest_module.IngestionReport(keep_details=keep_details)
+        fill_report(report, count)
+        report.finalize()
+        output = tmp_path / "relatorio.json"
+
+        report.save_json(str(output))
+        data = json.loads(output.read_text(encoding="utf-8"))
+
+        assert data["start_time"] == report.start_time.isoformat()
+        assert data["end_time"] == report.end_time.isoformat()
+        assert data["duration_seconds"] == report.duration_seconds
+        assert data["total_files"] == 3 * count
+        assert data["summary"] == {"successful": count, "skipped": count, "failed": count}
+
+        details = data["details"]
+        assert list(details) == ["successful", "skipped", "failed"]
+        if not keep_details:
+            assert details == {"successful": [], "skipped": [], "failed": []}
+            return
+
+        assert [item["document_id"] for item in details["successful"]] == [
+            record.document_id for record in report.successful
+        ]
+        assert details["successful"][-1:] == [
+            {
+                "file": record.file,
+                "document_id": record.document_id,
+                "chunks": record.chunks,
+                "status": "success",
+                "name": record.name,
+            }
+            for record in report.successful[-1:]
+        ]
+        assert [item["reason"] for item in details["skipped"]] == ["Já indexado"] * count
+        assert [item["error"] for item in details["failed"]] == [
+            f'Erro "{i}"\ncom quebra de linha e ç' for i in range(count)
+        ]
+
+    def test_unfinished_report(self, batch_ingest_module: ModuleType, tmp_path: Path) -> None:
+        """Test that a report saved before finalize has null end time and duration."""
+        report = batch_ingest_module.IngestionReport()
+        output = tmp_path / "relatorio.json"
+
+        report.save_json(str(output))
+        data = json.loads(output.read_text(encoding="utf-8"))
+
+        assert data["end_time"] is None
+        assert data["duration_seconds"] is None
+        assert data["summary"] == {"successful": 0, "skipped": 0, "failed": 0}
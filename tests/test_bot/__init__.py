@@ -0,0 +1 @@
+"""Tests for the Discord bot layer."""
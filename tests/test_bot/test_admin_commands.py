@@ -0,0 +1,51 @@
+"""Tests for the admin command helpers."""
+
+import uuid
+
+import pytest
+
+from src.bot.admin_commands import uuid_prefix_range
+
+
+class TestUuidPrefixRange:
+    """Test suite for uuid_prefix_range."""
+
+    def test_full_uuid_is_its_own_range(self) -> None:
+        """Test that a complete UUID yields a range of exactly itself."""
+        value = "123e4567-e89b-12d3-a456-426614174000"
+
+        assert uuid_prefix_range(value) == (value, value)
+        assert uuid_prefix_range(value.replace("-", "")) == (value, value)
+
+    def test_short_prefix_is_padded(self) -> None:
+        """Test that a short prefix is padded with 0/f and re-hyphenated."""
+        assert uuid_prefix_range("abc") == (
+            "abc00000-0000-0000-0000-000000000000",
+            "abcfffff-ffff-ffff-ffff-ffffffffffff",
+        )
+
+    def test_prefix_with_hyphens(self) -> None:
+        """Test that hyphens in the prefix are ignored and put back in place."""
+        assert uuid_prefix_range("123e4567-e8") == (
+            "123e4567-e800-0000-0000-000000000000",
+            "123e4567-e8ff-ffff-ffff-ffffffffffff",
+        )
+
+    def test_uppercase_is_normalized(self) -> None:
+        """Test that uppercase hex digits are accepted and lowercased."""
+        assert uuid_prefix_range("ABCDEF") == uuid_prefix_range("abcdef")
+
+    def test_range_contains_matching_uuids(self) -> None:
+        """Test that UUIDs starting with the prefix fall inside the range."""
+        low, high = uuid_prefix_range("9f")
+        value = uuid.UUID("9f" + uuid.uuid4().hex[2:])
+
+        assert uuid.UUID(low) <= value <= uuid.UUID(high)
+
+    @pytest.mark.parametrize(
+        "prefix",
+        ["", "-", "xyz", "12g4", "abc 123", "0" * 33, "123e4567-e89b-12d3-a456-4266141740001"],
+    )
+    def test_invalid_prefix_returns_none(self, prefix: str) -> None:
+        """Test that empty, non-hex or too-long input is rejected."""
+        assert uuid_prefix_range(prefix) is None
@@ -0,0 +1,71 @@
+"""Tests for the Discord message handlers."""
+
+import pytest
+
+from src.bot.handlers import iter_message_chunks
+
+
+class TestIterMessageChunks:
+    """Test suite for iter_message_chunks."""
+
+    def test_short_content_is_single_piece(self) -> None:
+        """Test that content within max_length is yielded unchanged."""
+        assert list(iter_message_chunks("hello world", max_length=20)) == ["hello world"]
+        assert list(iter_message_chunks("x" * 20, max_length=20)) == ["x" * 20]
+
+    def test_empty_content_has_no_pieces(self) -> None:
+        """Test that empty content yields nothing."""
+        assert list(iter_message_chunks("", max_length=20)) == []
+
+    def test_cuts_after_newline(self) -> None:
+        """Test that a newline in the second half of the window is preferred."""
+        content = "aaaa bbbb\ncccc dddd eeee"
+
+        pieces = list(iter_message_chunks(content, max_length=16))
+
+        assert pieces == ["aaaa bbbb\n", "cccc dddd eeee"]
+
+    def test_newline_preferred_over_later_space(self) -> None:
+        """Test that a newline wins even when a space comes after it."""
+        content = "aaaaaa\nbb cc dd ee ff"
+
+        pieces = list(iter_message_chunks(content, max_length=12))
+
+        assert pieces[0] == "aaaaaa\n"
+
+    def test_cuts_after_space(self) -> None:
+        """Test that words are not split when there is no newline."""
+        content = "alpha beta gamma delta"
+
+        pieces = list(iter_message_chunks(content, max_length=12))
+
+        assert pieces == ["alpha beta ", "gamma delta"]
+
+    def test_hard_cut_without_whitespace(self) -> None:
+        """Test that content without whitespace is cut at max_length."""
+        content = "x" * 25
+
+        pieces = list(iter_message_chunks(content, max_length=10))
+
+        assert pieces == ["x" * 10, "x" * 10, "x" * 5]
+
+    def test_break_in_first_half_is_ignored(self) -> None:
+        """Test that a break too early in the window forces a hard cut."""
+        content = "ab " + "x" * 20
+
+        pieces = list(iter_message_chunks(content, max_length=10))
+
+        assert pieces[0] == "ab " + "x" * 7
+
+    @pytest.mark.parametrize("max_length", [2, 7, 16, 50, 2000])
+    def test_pieces_fit_and_rebuild_content(self, max_length: int) -> None:
+        """Test that no piece exceeds max_length and nothing is lost."""
+        content = "\n".join(
+            " ".join(f"w{i}x{j}" * (1 + (i + j) % 4) for j in range(i % 9))
+            for i in range(200)
+        ) + "y" * 3000
+
+        pieces = list(iter_message_chunks(content, max_length=max_length))
+
+        assert all(0 < len(piece) <= max_length for piece in pieces)
+        assert "".join(pieces) == content
@@ -0,0 +1,106 @@
+"""Tests for the token chunking of the ingest_pdf script."""
+
+from types import ModuleType
+
+import pytest
+
+from src.utils import text_splitter
+from src.utils.text_splitter import TokenTextSplitter
+
+
+class FakeTokenizer:
+    """Character-level stand-in for a tiktoken encoding.
+
+    Encoding is additive (``encode(a + b) == encode(a) + encode(b)``), so
+    chunking page by page must match chunking the joined text exactly.
+    """
+
+    def encode_ordinary(self, text: str) -> list[int]:
+        return [ord(char) for char in text]
+
+    def decode_batch(self, batch: list[list[int]]) -> list[str]:
+        return ["".join(map(chr, tokens)) for tokens in batch]
+
+
+PAGES = [
+    "Primeira página com algum texto.",
+    "",
+    "Segunda página, um pouco mais longa que a primeira, para cruzar janelas.",
+    "   ",
+    "x",
+    "Terceira página.\nCom duas linhas.",
+]
+
+
+class TestChunkTextStreaming:
+    """Test suite comparing chunk_text_streaming with chunk_text."""
+
+    @pytest.mark.parametrize(
+        ("max_tokens", "overlap_tokens"),
+        [(8, 0), (8, 3), (16, 4), (25, 24), (40, 10), (500, 50)],
+    )
+    @pytest.mark.parametrize("num_pages", [1, 3, len(PAGES)])
+    def test_matches_whole_text_chunking(
+        self,
+        ingest_pdf_module: ModuleType,
+        max_tokens: int,
+        overlap_tokens: int,
+        num_pages: int,
+    ) -> None:
+        """Test that page-by-page chunks equal chunks of the joined text."""
+        pages = PAGES[:num_pages]
+        tokenizer = FakeTokenizer()
+        whole_text = "\n\n".join(page for page in pages if page.strip())
+
+        expected = ingest_pdf_module.chunk_text(
+            whole_text, max_tokens, overlap_tokens, tokenizer=tokenizer
+        )
+        streamed = list(ingest_pdf_module.chunk_text_streaming(
+            pages, max_tokens, overlap_tokens, tokenizer=tokenizer
+        ))
+
+        assert streamed == expected
+
+    def test_empty_pages_have_no_chunks(self, ingest_pdf_module: ModuleType) -> None:
+        """Test that only blank pages yield nothing, like empty text."""
+        tokenizer = FakeTokenizer()
+
+        assert list(ingest_pdf_module.chunk_text_streaming(
+            ["", "  "], 8, 2, tokenizer=tokenizer
+        )) == []
+        assert ingest_pdf_module.chunk_text("", 8, 2, tokenizer=tokenizer) == []
+
+    def test_no_window_made_only_of_overlap(self, ingest_pdf_module: ModuleType) -> None:
+        """Test that chunking stops at the window that reaches the end."""
+        chunks = ingest_pdf_module.chunk_text("abcdefghij", 4, 1, tokenizer=FakeTokenizer())
+
+        assert [chunk["content"] for chunk in chunks] == ["abcd", "defg", "ghij"]
+        assert [chunk["index"] for chunk in chunks] == [0, 1, 2]
+
+
+class TestTokenSplittersAgree:
+    """Test that ingest_pdf and TokenTextSplitter cut the same windows."""
+
+    @pytest.mark.parametrize(
+        ("chunk_size", "chunk_overlap"),
+        [(4, 0), (4, 1), (4, 2), (4, 3), (7, 5), (20, 4)],
+    )
+    @pytest.mark.parametrize("length", [1, 3, 4, 5, 6, 10, 23, 64])
+    def test_same_windows(
+        self,
+        ingest_pdf_module: ModuleType,
+        monkeypatch: pytest.MonkeyPatch,
+        chunk_size: int,
+        chunk_overlap: int,
+        length: int,
+    ) -> None:
+        """Test that both splitters emit the same windows, tail included."""
+        monkeypatch.setattr(text_splitter, "get_encoding", lambda model: FakeTokenizer())
+        text = "".join(chr(ord("a") + i % 26) for i in range(length))
+
+        chunks = ingest_pdf_module.chunk_text(
+            text, chunk_size, chunk_overlap, tokenizer=FakeTokenizer()
+        )
+        splitter = TokenTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+        assert [chunk["content"] for chunk in chunks] == splitter.split_text(text)
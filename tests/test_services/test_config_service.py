@@ -1,5 +1,9 @@
 """Tests for ConfigService."""
 
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from pathlib import Path
 
@@ -108,3 +112,44 @@ class TestConfigService:
         level = service2.get_filter_level(12345)
 
         assert level == FilterLevel.CONSERVATIVE
+
+    def test_reloads_when_file_changes(
+        self,
+        config_service: ConfigService,
+        test_settings: Settings,
+    ) -> None:
+        """Test external edits to the config file are picked up."""
+        config_service.set_filter_level(12345, FilterLevel.CONSERVATIVE)
+
+        test_settings.config_file.write_text(
+            json.dumps({"12345": {"filter_level": FilterLevel.LIBERAL.value}}),
+            encoding="utf-8",
+        )
+        stat = test_settings.config_file.stat()
+        os.utime(
+            test_settings.config_file,
+            ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000),
+        )
+
+        level = config_service.get_filter_level(12345)
+        assert level == FilterLevel.LIBERAL
+
+    def test_concurrent_saves(
+        self,
+        config_service: ConfigService,
+        test_settings: Settings,
+    ) -> None:
+        """Test saves from several threads leave a complete config file."""
+        guild_ids = range(1, 21)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(
+                lambda guild_id: config_service.set_filter_level(
+                    guild_id, FilterLevel.LIBERAL
+                ),
+                guild_ids,
+            ))
+
+        data = json.loads(test_settings.config_file.read_text(encoding="utf-8"))
+        assert set(data) == {str(guild_id) for guild_id in guild_ids}
+        assert list(test_settings.config_file.parent.glob(".*")) == []
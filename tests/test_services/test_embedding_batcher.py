@@ -0,0 +1,73 @@
+"""Tests for EmbeddingBatcher."""
+
+import asyncio
+
+import pytest
+
+from src.services.embedding_batcher import EmbeddingBatcher
+
+
+class FakeEmbeddings:
+    """Embeddings stub that records each batch it is asked to embed."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.calls: list[list[str]] = []
+        self.fail = fail
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("embeddings down")
+        return [[float(len(text))] for text in texts]
+
+
+class TestEmbeddingBatcher:
+    """Test suite for EmbeddingBatcher."""
+
+    async def test_concurrent_queries_share_one_request(self) -> None:
+        """Test that queries arriving together are embedded in one call."""
+        embeddings = FakeEmbeddings()
+        batcher = EmbeddingBatcher(embeddings, max_batch_size=16, max_wait=0.05)
+
+        vectors = await asyncio.gather(
+            *(batcher.embed_query("q" * n) for n in range(1, 6))
+        )
+        await batcher.aclose()
+
+        assert vectors == [[float(n)] for n in range(1, 6)]
+        assert embeddings.calls == [["q", "qq", "qqq", "qqqq", "qqqqq"]]
+
+    async def test_batch_size_is_capped(self) -> None:
+        """Test that a full batch is sent without waiting for the window."""
+        embeddings = FakeEmbeddings()
+        batcher = EmbeddingBatcher(embeddings, max_batch_size=2, max_wait=0.05)
+
+        await asyncio.gather(*(batcher.embed_query(str(n)) for n in range(5)))
+        await batcher.aclose()
+
+        assert [len(call) for call in embeddings.calls] == [2, 2, 1]
+
+    async def test_errors_reach_every_caller(self) -> None:
+        """Test that a failed request fails each query in the batch."""
+        batcher = EmbeddingBatcher(FakeEmbeddings(fail=True), max_wait=0.05)
+
+        results = await asyncio.gather(
+            batcher.embed_query("a"),
+            batcher.embed_query("b"),
+            return_exceptions=True,
+        )
+        await batcher.aclose()
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def test_recovers_after_failure(self) -> None:
+        """Test that the worker keeps serving queries after an error."""
+        embeddings = FakeEmbeddings(fail=True)
+        batcher = EmbeddingBatcher(embeddings, max_wait=0)
+
+        with pytest.raises(RuntimeError):
+            await batcher.embed_query("a")
+
+        embeddings.fail = False
+        assert await batcher.embed_query("bb") == [2.0]
+        await batcher.aclose()
@@ -0,0 +1,112 @@
+"""Tests for the separator-based text splitter."""
+
+from langchain_core.documents import Document
+import pytest
+
+from src.utils import text_splitter
+from src.utils.text_splitter import FastTextSplitter, TokenTextSplitter
+
+
+class TestFastTextSplitter:
+    """Test suite for FastTextSplitter."""
+
+    def test_short_text_is_single_chunk(self) -> None:
+        """Test that text within chunk_size is returned stripped as one chunk."""
+        splitter = FastTextSplitter(chunk_size=100, chunk_overlap=10)
+
+        assert splitter.split_text("  hello world \n") == ["hello world"]
+
+    def test_empty_text_has_no_chunks(self) -> None:
+        """Test that empty or whitespace-only text yields nothing."""
+        splitter = FastTextSplitter(chunk_size=10)
+
+        assert splitter.split_text("") == []
+        assert splitter.split_text(" \n\n ") == []
+
+    def test_prefers_paragraph_breaks(self) -> None:
+        """Test that chunks end at paragraph breaks before line or word breaks."""
+        text = "aaaa bbbb\n\ncccc dddd\neeee ffff"
+        splitter = FastTextSplitter(chunk_size=20)
+
+        assert splitter.split_text(text) == ["aaaa bbbb", "cccc dddd\neeee ffff"]
+
+    def test_chunks_respect_size_and_cover_text(self) -> None:
+        """Test that no chunk exceeds chunk_size and every word is kept."""
+        words = [f"w{i}" for i in range(300)]
+        text = " ".join(words)
+        splitter = FastTextSplitter(chunk_size=50, chunk_overlap=0)
+
+        chunks = splitter.split_text(text)
+
+        assert all(len(chunk) <= 50 for chunk in chunks)
+        assert " ".join(chunks).split() == words
+
+    def test_overlap_starts_at_word_boundary(self) -> None:
+        """Test that consecutive chunks share whole words."""
+        text = " ".join(f"word{i}" for i in range(40))
+        splitter = FastTextSplitter(chunk_size=60, chunk_overlap=20)
+
+        chunks = splitter.split_text(text)
+
+        assert len(chunks) > 1
+        for previous, current in zip(chunks, chunks[1:]):
+            assert current.split()[0] in previous.split()
+
+    def test_hard_cut_without_separators(self) -> None:
+        """Test that text without separators is cut at chunk_size."""
+        splitter = FastTextSplitter(chunk_size=4)
+
+        assert splitter.split_text("abcdefghij") == ["abcd", "efgh", "ij"]
+
+    def test_invalid_overlap_raises(self) -> None:
+        """Test that overlap must be smaller than chunk size."""
+        with pytest.raises(ValueError):
+            FastTextSplitter(chunk_size=10, chunk_overlap=10)
+
+    def test_split_documents_copies_metadata(self) -> None:
+        """Test that each chunk gets its own copy of the source metadata."""
+        document = Document(page_content="one two three four", metadata={"source": "a.pdf"})
+        splitter = FastTextSplitter(chunk_size=10)
+
+        chunks = splitter.split_documents([document])
+
+        assert [chunk.page_content for chunk in chunks] == ["one two", "three four"]
+        assert all(chunk.metadata == {"source": "a.pdf"} for chunk in chunks)
+        assert chunks[0].metadata is not document.metadata
+
+
+class FakeEncoding:
+    """Character-level stand-in for a tiktoken encoding."""
+
+    def encode_ordinary(self, text: str) -> list[int]:
+        return [ord(char) for char in text]
+
+    def decode_batch(self, batch: list[list[int]]) -> list[str]:
+        return ["".join(map(chr, tokens)) for tokens in batch]
+
+
+class TestTokenTextSplitter:
+    """Test suite for TokenTextSplitter."""
+
+    @pytest.fixture(autouse=True)
+    def fake_encoding(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Use a character-level encoding instead of downloading one."""
+        monkeypatch.setattr(text_splitter, "get_encoding", lambda model: FakeEncoding())
+
+    def test_windows_of_chunk_size_tokens(self) -> None:
+        """Test that chunks are token windows stepping by size minus overlap."""
+        splitter = TokenTextSplitter(chunk_size=4, chunk_overlap=1)
+
+        assert splitter.split_text("abcdefghij") == ["abcd", "defg", "ghij"]
+
+    def test_no_redundant_tail_window(self) -> None:
+        """Test that splitting stops at the window that reaches the end."""
+        splitter = TokenTextSplitter(chunk_size=4, chunk_overlap=2)
+
+        assert splitter.split_text("abcdef") == ["abcd", "cdef"]
+
+    def test_empty_text_has_no_chunks(self) -> None:
+        """Test that empty text yields nothing."""
+        splitter = TokenTextSplitter(chunk_size=4)
+
+        assert splitter.split_text("") == []